@@ -2,85 +2,191 @@
 
 """
 Archey main file.
-It loads each entry as a different class coming from the `entries` module.
+It loads each entry declared within the `entries` module registry.
 Logos are stored under the `logos` module.
 """
 
 import argparse
+import os
+import sys
+import time
 
-from enum import Enum
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 
 from archey._version import __version__
-from archey.output import Output
+from archey.cache import Cache
+from archey.output import JSONOutput, Output
 from archey.configuration import Configuration
-from archey.processes import Processes
-from archey.entries.user import User as e_User
-from archey.entries.hostname import Hostname as e_Hostname
-from archey.entries.model import Model as e_Model
-from archey.entries.distro import Distro as e_Distro
-from archey.entries.kernel import Kernel as e_Kernel
-from archey.entries.uptime import Uptime as e_Uptime
-from archey.entries.window_manager import WindowManager as e_WindowManager
-from archey.entries.desktop_environment import DesktopEnvironment as e_DesktopEnvironment
-from archey.entries.shell import Shell as e_Shell
-from archey.entries.terminal import Terminal as e_Terminal
-from archey.entries.packages import Packages as e_Packages
-from archey.entries.temperature import Temperature as e_Temperature
-from archey.entries.cpu import CPU as e_CPU
-from archey.entries.gpu import GPU as e_GPU
-from archey.entries.ram import RAM as e_RAM
-from archey.entries.disk import Disk as e_Disk
-from archey.entries.lan_ip import LanIp as e_LanIp
-from archey.entries.wan_ip import WanIp as e_WanIp
-
-
-class Entries(Enum):
-    """
-    An enumeration to store and declare each one of our entries.
-    The string representation of keys will act as entries names.
-    Values will be set under the `value` attribute of each obtained objects.
-    """
-    User = e_User
-    Hostname = e_Hostname
-    Model = e_Model
-    Distro = e_Distro
-    Kernel = e_Kernel
-    Uptime = e_Uptime
-    WindowManager = e_WindowManager
-    DesktopEnvironment = e_DesktopEnvironment
-    Shell = e_Shell
-    Terminal = e_Terminal
-    Packages = e_Packages
-    Temperature = e_Temperature
-    CPU = e_CPU
-    GPU = e_GPU
-    RAM = e_RAM
-    Disk = e_Disk
-    LAN_IP = e_LanIp
-    WAN_IP = e_WanIp
+from archey.entries import Entries, get_entry_value
+from archey.watch import watch
 
 
 def main():
     """Simple entry point"""
+    args = _parse_args()
+
+    # `Configuration` is a singleton, let's populate the internal object here.
+    configuration = Configuration()
+
+    # The global budget is shared by the whole run.
+    run_expires_at = None
+    global_timeout = configuration.get('timeout', {}).get('global')
+    if global_timeout:
+        run_expires_at = time.monotonic() + global_timeout
+
+    cache = None
+    if not args.no_cache:
+        cache = Cache(
+            configuration.get('cache', {}).get('entries', {}),
+            configuration.get_digest(),
+            refresh=args.refresh_cache
+        )
+
+    output = _get_output(args)
+    enabled_entries = Entries.enabled()
+
+    # In progressive mode, the logo is rendered right away and rows are filled on completion.
+    streaming = (args.watch or args.ndjson or configuration.get('progressive_output')) \
+        and output.begin_streaming([entry.name for entry in enabled_entries])
+    if args.watch and not streaming:
+        print('Watch mode requires a (large enough) terminal.', file=sys.stderr)
+
+    _output_entries(
+        output,
+        enabled_entries,
+        partial(
+            _load_entry,
+            daemon_values=_get_daemon_values(configuration),
+            run_expires_at=run_expires_at,
+            cache=cache
+        ),
+        streaming=streaming,
+        parallel_loading=configuration.get('parallel_loading')
+    )
+
+    if cache is not None:
+        cache.save()
+
+    if args.watch and streaming:
+        try:
+            watch(output, enabled_entries, configuration.get('watch', {}).get('entries', {}))
+        except KeyboardInterrupt:
+            pass
+
+
+def _parse_args():
+    """Parse (and check) command line arguments"""
     parser = argparse.ArgumentParser(prog='archey')
     parser.add_argument(
         '-v', '--version',
         action='version', version=__version__
     )
-    parser.parse_args()
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='neither read nor write cached entries values'
+    )
+    parser.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='recompute every entry, and store fresh values in cache'
+    )
+    parser.add_argument(
+        '-w', '--watch',
+        action='store_true',
+        help='keep running, and refresh entries values in place'
+    )
+    json_group = parser.add_mutually_exclusive_group()
+    json_group.add_argument(
+        '--json',
+        action='store_true',
+        help='print raw entries values as a JSON object, without logo'
+    )
+    json_group.add_argument(
+        '--ndjson',
+        action='store_true',
+        help='print a JSON object per entry as soon as it is computed, without logo'
+    )
+    args = parser.parse_args()
+    if args.watch and args.json:
+        parser.error('--watch is not compatible with --json (but is with --ndjson)')
 
-    # `Processes` is a singleton, let's populate the internal list here.
-    Processes()
+    return args
 
-    # `Configuration` is a singleton, let's populate the internal object here.
-    configuration = Configuration()
 
-    output = Output()
-    for entry in Entries:
-        if configuration.get('entries', {}).get(entry.name, True):
-            output.append(entry.name, entry.value().value)
+def _get_output(args):
+    """Return the output object matching command line arguments"""
+    if args.json or args.ndjson:
+        return JSONOutput(streaming=args.ndjson)
+
+    return Output()
+
+
+def _output_entries(output, entries, load_entry, streaming, parallel_loading):
+    """
+    Load `entries` values (see `_load_entries`), and pass them to `output`.
+    When `streaming`, each value is streamed as soon as it's computed.
+    Otherwise, values are appended (in order) once they are all known, and `output` is printed.
+    """
+    max_workers = 1
+    if parallel_loading:
+        # Entries mostly wait on sub-processes, so let's run them concurrently.
+        # The pool is bounded the same way `ThreadPoolExecutor` does it since Python 3.8.
+        max_workers = min(len(entries), 32, (os.cpu_count() or 1) + 4)
+
+    values = [None] * len(entries)
+    for index, value in _load_entries(entries, load_entry, max_workers):
+        if streaming:
+            output.stream(index, entries[index].name, value)
+        else:
+            values[index] = value
+
+    if not streaming:
+        for entry, value in zip(entries, values):
+            output.append(entry.name, value)
+
+        output.output()
+
+
+def _get_daemon_values(configuration):
+    """
+    When a daemon (`archeyd`) is running, fetch the values it already computed.
+    Its client is only imported when its socket exists.
+    """
+    socket_path = configuration.get('daemon', {}).get('socket_path')
+    if not socket_path or not os.path.exists(socket_path):
+        return {}
+
+    from archey.daemon import fetch_values  # pylint: disable=import-outside-toplevel
+    return fetch_values(socket_path, configuration.get_digest()) or {}
+
+
+def _load_entry(entry, daemon_values, run_expires_at, cache):
+    """Return the value of `entry`, as served by the daemon or freshly computed (or cached)"""
+    if entry.name in daemon_values:
+        return daemon_values[entry.name]
+
+    return get_entry_value(entry, run_expires_at=run_expires_at, cache=cache)
+
+
+def _load_entries(entries, load_entry, max_workers):
+    """
+    Compute `entries` values (with `load_entry`) on (at most) `max_workers` threads.
+    Yields `(index, value)` pairs as soon as each entry completes.
+    """
+    if max_workers <= 1:
+        for index, entry in enumerate(entries):
+            yield index, load_entry(entry)
+        return
 
-    output.output()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(load_entry, entry): index
+            for index, entry in enumerate(entries)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,50 @@
+"""
+Asynchronous entries loading engine.
+It allows Archey to be embedded within an `asyncio` event loop without blocking it.
+Asynchronous generators require Python 3.6 or newer, so this module is never imported by `main`
+  (and its tests are skipped, as well as its linting, on older interpreters).
+"""
+
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+
+from archey.command import clear_cache
+from archey.entries import Entries, get_entry_value
+from archey.processes import Processes
+
+
+# Entries loading is bounded to a small pool, we don't want to burn a thread per entry.
+DEFAULT_MAX_WORKERS = 4
+
+
+async def collect(entries=None, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Asynchronously compute `entries` (defaults to enabled ones) and yield `(name, value)` pairs.
+    Pairs are yielded as soon as each entry completes, NOT in declaration order.
+    Entries are loaded on a bounded pool, so the event loop is never blocked.
+    Each call is a run of its own : commands outputs memoized by a previous one are forgotten.
+    """
+    if entries is None:
+        entries = Entries.enabled()
+
+    clear_cache()
+
+    loop = asyncio.get_event_loop()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        # `Processes` is a singleton, let's populate it before any entry needs it.
+        await loop.run_in_executor(executor, Processes)
+
+        pending = {
+            loop.run_in_executor(executor, get_entry_value, entry): entry
+            for entry in entries
+        }
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                entry = pending.pop(future)
+                yield entry.name, future.result()
+    finally:
+        # Don't wait for abandoned entries (when the consumer stopped iterating early).
+        executor.shutdown(wait=False)
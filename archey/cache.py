@@ -0,0 +1,115 @@
+"""
+Entries values persistent cache.
+Values are stored under `$XDG_CACHE_HOME/archey4/` and expire according to per-entry TTLs.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from threading import Lock
+
+
+class Cache:
+    """
+    A simple on-disk cache of entries values, stored as a JSON file.
+    Each entry has its own TTL (in seconds), `0` meaning it's never cached.
+    The whole cache is invalidated on reboot, as hardware or kernel may have changed meanwhile.
+    It's invalidated as well when the configuration changes (see `Configuration.get_digest`).
+    Values stored along with a fingerprint are kept (regardless of their age) while it matches.
+    """
+    def __init__(self, ttls, configuration_digest, refresh=False):
+        self._ttls = ttls
+        self._configuration_digest = configuration_digest
+        self._path = os.path.join(
+            os.getenv('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+            'archey4', 'entries.json'
+        )
+        self._boot_id = self._get_boot_id()
+
+        # Entries may be stored concurrently, let's guard the internal dictionary.
+        self._lock = Lock()
+        self._entries = {}
+        self._dirty = False
+
+        # When refreshing, previously cached values are simply ignored (and overwritten).
+        if not refresh:
+            self._load()
+
+    def get(self, name, fingerprint=None):
+        """
+        Return the cached value of entry `name`, or raise `KeyError` if missing or expired.
+        When `fingerprint` is passed, the value has to have been stored along with the same one.
+        """
+        ttl = self._get_ttl(name)
+        cached_entry = self._entries[name]
+        if fingerprint is not None:
+            if not ttl or cached_entry.get('fingerprint') != fingerprint:
+                raise KeyError(name)
+        elif time.time() - cached_entry['timestamp'] >= ttl:
+            raise KeyError(name)
+
+        return cached_entry['value']
+
+    def set(self, name, value, fingerprint=None):
+        """Store the value (and `fingerprint`) of entry `name`, unless its TTL forbids it"""
+        if not self._get_ttl(name):
+            return
+
+        with self._lock:
+            self._entries[name] = {
+                'timestamp': time.time(),
+                'fingerprint': fingerprint,
+                'value': value
+            }
+            self._dirty = True
+
+    def save(self):
+        """Atomically write the cache to disk, if anything changed"""
+        if not self._dirty:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                    'w', dir=os.path.dirname(self._path), delete=False) as file:
+                json.dump({
+                    'boot_id': self._boot_id,
+                    'configuration': self._configuration_digest,
+                    'entries': self._entries
+                }, file)
+            os.replace(file.name, self._path)
+        except OSError:
+            # The cache is only an optimization, don't bother the user about it.
+            return
+
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self._path) as file:
+                cache = json.load(file)
+        # For backward compatibility with Python versions prior to 3.5.0
+        #   we use `ValueError` instead of `json.JSONDecodeError`.
+        except (OSError, ValueError):
+            return
+
+        # Values cached during a previous boot (or with another configuration) are discarded.
+        if not isinstance(cache, dict) \
+                or cache.get('boot_id') != self._boot_id \
+                or cache.get('configuration') != self._configuration_digest:
+            return
+
+        self._entries = cache.get('entries', {})
+
+    def _get_ttl(self, name):
+        return self._ttls.get(name, self._ttls.get('default', 0))
+
+    @staticmethod
+    def _get_boot_id():
+        try:
+            with open('/proc/sys/kernel/random/boot_id') as file:
+                return file.read().rstrip()
+        except OSError:
+            return None
@@ -0,0 +1,167 @@
+"""
+Sub-processes execution layer.
+Entries run their commands through `check_output` below, which honors per-entry deadlines.
+Results are memoized for the whole run, so a given command is spawned at most once.
+"""
+
+import copy
+import os
+import signal
+import threading
+import time
+
+from contextlib import contextmanager
+from subprocess import CalledProcessError, PIPE, Popen, TimeoutExpired
+
+
+# Deadlines are attached to the thread computing an entry.
+_LOCAL = threading.local()
+
+# Memoized `(output, error)` results, and events of commands currently running, by command key.
+_RESULTS = {}
+_IN_FLIGHT = {}
+_RESULTS_LOCK = threading.Lock()
+
+
+@contextmanager
+def deadline(expires_at):
+    """
+    Within this context, commands have to complete before `expires_at` (`time.monotonic` based).
+    `None` means no deadline at all.
+    """
+    previous_deadline = getattr(_LOCAL, 'expires_at', None)
+    _LOCAL.expires_at = expires_at
+    try:
+        yield
+    finally:
+        _LOCAL.expires_at = previous_deadline
+
+
+def get_deadline():
+    """Return the current deadline, so it may be propagated to (entries) worker threads"""
+    return getattr(_LOCAL, 'expires_at', None)
+
+
+def check_output(args, stdin=None, stderr=None, **options):
+    """
+    Drop-in replacement of `subprocess.check_output`.
+    Besides `stdin` and `stderr`, only `env`, `timeout` and `universal_newlines` are supported
+      (as keyword arguments).
+    Each child runs within its own process group, so the whole group may be killed on timeout.
+    When the current deadline would expire first, `timeout` is shortened accordingly.
+    Outputs (as well as `CalledProcessError` and `FileNotFoundError`) are memoized by
+      `args` and `env`, and concurrent identical calls share a single child process.
+    """
+    unexpected_options = set(options).difference(('env', 'timeout', 'universal_newlines'))
+    if unexpected_options:
+        raise TypeError(
+            'Unexpected keyword argument(s) : ' + ', '.join(sorted(unexpected_options))
+        )
+    timeout = options.get('timeout')
+    popen_kwargs = {
+        'stdin': stdin,
+        'stderr': stderr,
+        'env': options.get('env'),
+        'universal_newlines': options.get('universal_newlines', False)
+    }
+
+    # A command reading from a given input can't be memoized.
+    if stdin is not None:
+        return _run(args, popen_kwargs, get_timeout(args, timeout))
+
+    key = (
+        tuple(args),
+        stderr,
+        frozenset(popen_kwargs['env'].items()) if popen_kwargs['env'] is not None else None,
+        popen_kwargs['universal_newlines']
+    )
+    while True:
+        with _RESULTS_LOCK:
+            if key in _RESULTS:
+                return _replay(_RESULTS[key])
+
+            running = _IN_FLIGHT.get(key)
+            if running is None:
+                running = _IN_FLIGHT[key] = threading.Event()
+                break
+
+        # Another thread is already running this very command, let's wait for its result.
+        # If it timed out instead, we'll run the command ourselves (on our own deadline).
+        wait_timeout = get_timeout(args, timeout)
+        if not running.wait(wait_timeout):
+            raise TimeoutExpired(args, wait_timeout)
+
+    result = None
+    try:
+        output = _run(args, popen_kwargs, get_timeout(args, timeout))
+        result = (output, None)
+    except (CalledProcessError, FileNotFoundError) as error:
+        result = (None, error)
+        raise
+    finally:
+        # Timed out commands are not memoized, as they may complete on a later attempt.
+        with _RESULTS_LOCK:
+            if result is not None:
+                _RESULTS[key] = result
+            del _IN_FLIGHT[key]
+        running.set()
+
+    return output
+
+
+def clear_cache():
+    """Forget memoized commands results (i.e. when entries have to be re-computed)"""
+    with _RESULTS_LOCK:
+        _RESULTS.clear()
+
+
+def get_timeout(args, timeout):
+    """
+    Shorten `timeout` to the current deadline, or raise `TimeoutExpired` if it has passed.
+    Blocking calls which don't spawn any process (e.g. `urlopen`) have to be bounded with it,
+      `args` then describes the operation.
+    """
+    expires_at = get_deadline()
+    if expires_at is None:
+        return timeout
+
+    remaining = expires_at - time.monotonic()
+    if remaining <= 0:
+        # Don't even bother spawning a process.
+        raise TimeoutExpired(args, 0)
+
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def _run(args, popen_kwargs, timeout):
+    """Run `args` (`popen_kwargs` being passed to `Popen`), within its own process group"""
+    with Popen(args, stdout=PIPE, start_new_session=True, **popen_kwargs) as process:
+        try:
+            output, _ = process.communicate(timeout=timeout)
+        except TimeoutExpired:
+            _kill_process_group(process)
+            process.communicate()
+            raise
+
+        if process.returncode:
+            raise CalledProcessError(process.returncode, args, output)
+
+    return output
+
+
+def _replay(result):
+    """Return a memoized output, or raise (a copy of) the memoized error"""
+    output, error = result
+    if error is not None:
+        raise copy.copy(error)
+
+    return output
+
+
+def _kill_process_group(process):
+    """Kill `process` and any of its (grand-)children"""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # The whole group is already gone.
+        pass
@@ -4,6 +4,8 @@ import os
 import sys
 import json
 
+from hashlib import sha1
+
 from archey.singleton import Singleton
 
 
@@ -15,10 +17,27 @@ class Configuration(metaclass=Singleton):
     """
     def __init__(self):
         self._config = {
+            'parallel_loading': True,
+            'progressive_output': False,
+            'cache': {
+                'entries': {
+                    'default': 0,
+                    'Model': 21600,
+                    'Distro': 21600,
+                    'Kernel': 21600,
+                    'Packages': 300,
+                    'CPU': 21600,
+                    'GPU': 21600
+                }
+            },
             'colors_palette': {
                 'use_unicode': False,
                 'honor_ansi_color': True
             },
+            'daemon': {
+                'socket_path': '/run/archey4/archeyd.sock',
+                'refresh_interval': 60
+            },
             'default_strings': {
                 'no_address': 'No Address',
                 'not_detected': 'Not detected',
@@ -39,12 +58,28 @@ class Configuration(metaclass=Singleton):
                     'danger': 75
                 }
             },
+            'packages': {
+                'combine_managers': False
+            },
             'temperature': {
                 'char_before_unit': ' ',
                 'sensors_chipsets': [],
                 'use_fahrenheit': False
             },
+            'watch': {
+                'entries': {
+                    'default': 0,
+                    'Uptime': 60,
+                    'Temperature': 1,
+                    'RAM': 1,
+                    'Disk': 60
+                }
+            },
             'timeout': {
+                'global': 10,
+                'entries': {
+                    'default': 5
+                },
                 'ipv4_detection': 1,
                 'ipv6_detection': 1
             }
@@ -64,6 +99,13 @@ class Configuration(metaclass=Singleton):
         """
         return self._config.get(key, default)
 
+    def get_digest(self):
+        """
+        Return a digest of the whole (loaded) configuration.
+        It allows `archey` to check that `archeyd` values were computed with the very same one.
+        """
+        return sha1(json.dumps(self._config, sort_keys=True).encode()).hexdigest()
+
     def load_configuration(self, path):
         """
         A method handling configuration loading from a JSON file.
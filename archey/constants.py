@@ -1,7 +1,5 @@
 """Logos colors and distributions / logos matching"""
 
-import archey.logos as logos
-
 from archey.colors import Colors
 from archey.distributions import Distributions
 
@@ -35,24 +33,25 @@ COLOR_DICT = {
 }
 
 
-# This dictionary contains which logo should be used for each supported distribution.
+# This dictionary contains which logo module (see `archey.logos`)
+#   should be used for each supported distribution.
 LOGOS_DICT = {
-    Distributions.ALPINE_LINUX: logos.ALPINE_LINUX,
-    Distributions.ARCH_LINUX: logos.ARCH_LINUX,
-    Distributions.BUNSENLABS: logos.BUNSENLABS,
-    Distributions.CENTOS: logos.CENTOS,
-    Distributions.CRUNCHBANG: logos.CRUNCHBANG,
-    Distributions.DEBIAN: logos.DEBIAN,
-    Distributions.FEDORA: logos.FEDORA,
-    Distributions.GENTOO: logos.GENTOO,
-    Distributions.KALI_LINUX: logos.KALI_LINUX,
-    Distributions.MANJARO_LINUX: logos.MANJARO,
-    Distributions.LINUX: logos.LINUX,
-    Distributions.LINUX_MINT: logos.LINUX_MINT,
-    Distributions.OPENSUSE: logos.OPENSUSE,
-    Distributions.RASPBIAN: logos.DEBIAN,  # Force the Debian logo for Raspbian.
-    Distributions.RED_HAT: logos.RED_HAT,
-    Distributions.SLACKWARE: logos.SLACKWARE,
-    Distributions.UBUNTU: logos.UBUNTU,
-    Distributions.WINDOWS: logos.WINDOWS
+    Distributions.ALPINE_LINUX: 'alpine_linux',
+    Distributions.ARCH_LINUX: 'arch_linux',
+    Distributions.BUNSENLABS: 'bunsenlabs',
+    Distributions.CENTOS: 'centos',
+    Distributions.CRUNCHBANG: 'crunchbang',
+    Distributions.DEBIAN: 'debian',
+    Distributions.FEDORA: 'fedora',
+    Distributions.GENTOO: 'gentoo',
+    Distributions.KALI_LINUX: 'kali_linux',
+    Distributions.MANJARO_LINUX: 'manjaro',
+    Distributions.LINUX: 'linux',
+    Distributions.LINUX_MINT: 'linux_mint',
+    Distributions.OPENSUSE: 'opensuse',
+    Distributions.RASPBIAN: 'debian',  # Force the Debian logo for Raspbian.
+    Distributions.RED_HAT: 'red_hat',
+    Distributions.SLACKWARE: 'slackware',
+    Distributions.UBUNTU: 'ubuntu',
+    Distributions.WINDOWS: 'windows'
 }
@@ -0,0 +1,145 @@
+"""
+Archey daemon (`archeyd`).
+It keeps host-wide entries values warm, and serves them to `archey` over a Unix domain socket.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import threading
+
+from archey._version import __version__
+from archey.command import clear_cache
+from archey.configuration import Configuration
+from archey.entries import Entries, get_entry_value
+from archey.facts import Facts
+
+
+# These entries depend on the user session (or have to be exact), clients always compute them.
+CLIENT_SIDE_ENTRIES = ('User', 'Uptime', 'WindowManager', 'DesktopEnvironment', 'Shell', 'Terminal')
+
+
+class Daemon:
+    """
+    Periodically computes host-wide entries values (every `refresh_interval` seconds).
+    The latest values are written (as a JSON object) to each client connecting to `socket_path`,
+      along with the digest of the configuration they have been computed with.
+    These values are not specific to any user session, so any local user may connect.
+    """
+    def __init__(self, socket_path, refresh_interval):
+        self._socket_path = socket_path
+        self._refresh_interval = refresh_interval
+
+        self.payload = b'{}'
+        self._stopping = threading.Event()
+        self._server = None
+
+    def refresh(self):
+        """Recompute each enabled host-wide entry, and atomically publish the new values"""
+        # Neither commands outputs nor system facts (e.g. hostname) may be served from memory.
+        clear_cache()
+        Facts().clear()
+        self.payload = json.dumps({
+            'configuration': Configuration().get_digest(),
+            'entries': {
+                entry.name: get_entry_value(entry)
+                for entry in Entries.enabled()
+                if entry.name not in CLIENT_SIDE_ENTRIES
+            }
+        }).encode()
+
+    def serve_forever(self):
+        """Compute values a first time, then serve them until `shutdown` is called"""
+        self.refresh()
+
+        # A stale socket file may have been left there by a previous instance.
+        try:
+            os.unlink(self._socket_path)
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(self._socket_path), mode=0o755, exist_ok=True)
+
+        self._server = socketserver.UnixStreamServer(self._socket_path, _RequestHandler)
+        self._server.archey_daemon = self
+        # Clients (of any user) only have to check values match their own configuration.
+        os.chmod(self._socket_path, 0o666)
+
+        refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+        refresher.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stopping.set()
+            self._server.server_close()
+            os.unlink(self._socket_path)
+
+    def shutdown(self):
+        """Stop serving (to be called from another thread)"""
+        self._stopping.set()
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _refresh_loop(self):
+        while not self._stopping.wait(self._refresh_interval):
+            self.refresh()
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Write the latest entries values to the client, and hang up"""
+    def handle(self):
+        self.request.sendall(self.server.archey_daemon.payload)
+
+
+def fetch_values(socket_path, configuration_digest, timeout=0.5):
+    """
+    Client side : ask the daemon listening on `socket_path` for the current entries values.
+    Returns `None` when no daemon could be reached, or when its values have been computed with
+      another configuration than ours (see `Configuration.get_digest`).
+    """
+    chunks = []
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(socket_path)
+            while True:
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+
+        payload = json.loads(b''.join(chunks).decode())
+    # For backward compatibility with Python versions prior to 3.5.0
+    #   we use `ValueError` instead of `json.JSONDecodeError`.
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(payload, dict) or payload.get('configuration') != configuration_digest:
+        return None
+
+    return payload.get('entries')
+
+
+def main():
+    """`archeyd` entry point"""
+    parser = argparse.ArgumentParser(prog='archeyd')
+    parser.add_argument(
+        '-v', '--version',
+        action='version', version=__version__
+    )
+    parser.parse_args()
+
+    daemon_settings = Configuration().get('daemon')
+
+    try:
+        Daemon(
+            daemon_settings['socket_path'],
+            daemon_settings['refresh_interval']
+        ).serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Entries registry.
+Each entry is a different class coming from a module of this package.
+Modules are only imported once their entry actually has to be computed.
+"""
+
+import time
+
+from enum import Enum
+from importlib import import_module
+from subprocess import TimeoutExpired
+
+from archey.command import deadline
+from archey.configuration import Configuration
+
+
+class _LazyEntry:
+    """
+    A lazy reference to an entry class, which is only imported when instantiated.
+    This way, disabled entries (and their dependencies) don't cost anything at startup.
+    When `fingerprinted`, the entry class exposes a (cheap) `fingerprint` static method,
+      returning a JSON-serializable value which changes whenever the entry value may change.
+    """
+    def __init__(self, module_name, class_name, fingerprinted=False):
+        self._module_name = module_name
+        self._class_name = class_name
+        self._fingerprinted = fingerprinted
+
+    def __call__(self, *args, **kwargs):
+        return self._get_class()(*args, **kwargs)
+
+    def fingerprint(self):
+        """Return the current fingerprint of the entry value, or `None` if not fingerprinted"""
+        if not self._fingerprinted:
+            return None
+
+        return self._get_class().fingerprint()
+
+    def _get_class(self):
+        module = import_module('archey.entries.' + self._module_name)
+        return getattr(module, self._class_name)
+
+
+class Entries(Enum):
+    """
+    An enumeration to store and declare each one of our entries.
+    The string representation of keys will act as entries names.
+    Members values are (lazy) entry classes, their `value` attribute is set once instantiated.
+    """
+    User = _LazyEntry('user', 'User')
+    Hostname = _LazyEntry('hostname', 'Hostname')
+    Model = _LazyEntry('model', 'Model')
+    Distro = _LazyEntry('distro', 'Distro')
+    Kernel = _LazyEntry('kernel', 'Kernel')
+    Uptime = _LazyEntry('uptime', 'Uptime')
+    WindowManager = _LazyEntry('window_manager', 'WindowManager')
+    DesktopEnvironment = _LazyEntry('desktop_environment', 'DesktopEnvironment')
+    Shell = _LazyEntry('shell', 'Shell')
+    Terminal = _LazyEntry('terminal', 'Terminal')
+    Packages = _LazyEntry('packages', 'Packages', fingerprinted=True)
+    Temperature = _LazyEntry('temperature', 'Temperature')
+    CPU = _LazyEntry('cpu', 'CPU')
+    GPU = _LazyEntry('gpu', 'GPU')
+    RAM = _LazyEntry('ram', 'RAM')
+    Disk = _LazyEntry('disk', 'Disk')
+    LAN_IP = _LazyEntry('lan_ip', 'LanIp')
+    WAN_IP = _LazyEntry('wan_ip', 'WanIp')
+
+    @classmethod
+    def enabled(cls):
+        """Return the list of entries which have not been disabled in configuration"""
+        entries_settings = Configuration().get('entries', {})
+        return [entry for entry in cls if entries_settings.get(entry.name, True)]
+
+
+def get_entry_value(entry, run_expires_at=None, cache=None):
+    """
+    Instantiate the class behind `entry` and return its computed value.
+    The entry has to complete before its own timeout and before `run_expires_at` (global budget).
+    When it misses its deadline, its sub-processes are killed and `not_detected` is returned.
+    If a `cache` is passed, a fresh cached value is returned instead (and new values are stored).
+    """
+    fingerprint = None
+    if cache is not None:
+        fingerprint = entry.value.fingerprint()
+        try:
+            return cache.get(entry.name, fingerprint=fingerprint)
+        except KeyError:
+            pass
+
+    configuration = Configuration()
+
+    entries_timeouts = configuration.get('timeout', {}).get('entries', {})
+    entry_timeout = entries_timeouts.get(entry.name, entries_timeouts.get('default'))
+
+    expires_at = run_expires_at
+    if entry_timeout:
+        expires_at = time.monotonic() + entry_timeout
+        if run_expires_at is not None:
+            expires_at = min(expires_at, run_expires_at)
+
+    with deadline(expires_at):
+        try:
+            value = entry.value().value
+        except TimeoutExpired:
+            # Don't cache this one, it's not an actual value.
+            return configuration.get('default_strings')['not_detected']
+
+    if cache is not None:
+        cache.set(entry.name, value, fingerprint=fingerprint)
+
+    return value
@@ -1,35 +1,277 @@
 """CPU information detection class"""
 
+import os
 import re
 
-from subprocess import check_output
+from subprocess import CalledProcessError, DEVNULL
+
+from archey.command import check_output
+from archey.configuration import Configuration
+from archey.facts import Facts
+
+
+# Logical CPUs are exposed there.
+CPU_SYSFS_PATH = '/sys/devices/system/cpu'
+
+CPU_DIR_REGEX = re.compile(r'^cpu\d+$')
+
+# ARM CPU implementers (and their known parts), as identified by `MIDR` register fields.
+# See <https://github.com/util-linux/util-linux/blob/master/sys-utils/lscpu-arm.c>.
+ARM_IMPLEMENTERS = {
+    0x41: ('ARM', {
+        0x810: 'ARM810',
+        0x920: 'ARM920',
+        0x922: 'ARM922',
+        0x926: 'ARM926',
+        0x940: 'ARM940',
+        0x946: 'ARM946',
+        0x966: 'ARM966',
+        0xa20: 'ARM1020',
+        0xa22: 'ARM1022',
+        0xa26: 'ARM1026',
+        0xb02: 'ARM11 MPCore',
+        0xb36: 'ARM1136',
+        0xb56: 'ARM1156',
+        0xb76: 'ARM1176',
+        0xc05: 'Cortex-A5',
+        0xc07: 'Cortex-A7',
+        0xc08: 'Cortex-A8',
+        0xc09: 'Cortex-A9',
+        0xc0d: 'Cortex-A12',
+        0xc0f: 'Cortex-A15',
+        0xc0e: 'Cortex-A17',
+        0xc14: 'Cortex-R4',
+        0xc15: 'Cortex-R5',
+        0xc17: 'Cortex-R7',
+        0xc18: 'Cortex-R8',
+        0xc20: 'Cortex-M0',
+        0xc21: 'Cortex-M1',
+        0xc23: 'Cortex-M3',
+        0xc24: 'Cortex-M4',
+        0xc27: 'Cortex-M7',
+        0xc60: 'Cortex-M0+',
+        0xd01: 'Cortex-A32',
+        0xd03: 'Cortex-A53',
+        0xd04: 'Cortex-A35',
+        0xd05: 'Cortex-A55',
+        0xd06: 'Cortex-A65',
+        0xd07: 'Cortex-A57',
+        0xd08: 'Cortex-A72',
+        0xd09: 'Cortex-A73',
+        0xd0a: 'Cortex-A75',
+        0xd0b: 'Cortex-A76',
+        0xd0c: 'Neoverse-N1',
+        0xd0d: 'Cortex-A77',
+        0xd0e: 'Cortex-A76AE',
+        0xd13: 'Cortex-R52',
+        0xd20: 'Cortex-M23',
+        0xd21: 'Cortex-M33',
+        0xd40: 'Neoverse-V1',
+        0xd41: 'Cortex-A78',
+        0xd42: 'Cortex-A78AE',
+        0xd44: 'Cortex-X1',
+        0xd46: 'Cortex-A510',
+        0xd47: 'Cortex-A710',
+        0xd48: 'Cortex-X2',
+        0xd49: 'Neoverse-N2',
+        0xd4a: 'Neoverse-E1',
+        0xd4b: 'Cortex-A78C',
+        0xd4d: 'Cortex-A715',
+        0xd4e: 'Cortex-X3',
+        0xd4f: 'Neoverse-V2',
+        0xd80: 'Cortex-A520',
+        0xd81: 'Cortex-A720',
+        0xd82: 'Cortex-X4'
+    }),
+    0x42: ('Broadcom', {
+        0x00f: 'Brahma-B15',
+        0x100: 'Brahma-B53',
+        0x516: 'ThunderX2'
+    }),
+    0x43: ('Cavium', {
+        0x0a0: 'ThunderX',
+        0x0a1: 'ThunderX-88XX',
+        0x0a2: 'ThunderX-81XX',
+        0x0a3: 'ThunderX-83XX',
+        0x0af: 'ThunderX2-99xx'
+    }),
+    0x44: ('DEC', {
+        0xa10: 'SA110',
+        0xa11: 'SA1100'
+    }),
+    0x46: ('Fujitsu', {
+        0x001: 'A64FX'
+    }),
+    0x48: ('HiSilicon', {
+        0xd01: 'Kunpeng-920'
+    }),
+    0x4e: ('NVIDIA', {
+        0x000: 'Denver',
+        0x003: 'Denver 2',
+        0x004: 'Carmel'
+    }),
+    0x50: ('APM', {
+        0x000: 'X-Gene'
+    }),
+    0x51: ('Qualcomm', {
+        0x00f: 'Scorpion',
+        0x02d: 'Scorpion',
+        0x04d: 'Krait',
+        0x06f: 'Krait',
+        0x201: 'Kryo',
+        0x205: 'Kryo',
+        0x211: 'Kryo',
+        0x800: 'Falkor V1/Kryo',
+        0x801: 'Kryo V2',
+        0x802: 'Kryo 3XX Gold',
+        0x803: 'Kryo 3XX Silver',
+        0x804: 'Kryo 4XX Gold',
+        0x805: 'Kryo 4XX Silver',
+        0xc00: 'Falkor',
+        0xc01: 'Saphira'
+    }),
+    0x53: ('Samsung', {
+        0x001: 'Exynos-M1'
+    }),
+    0x56: ('Marvell', {
+        0x131: 'Feroceon 88FR131',
+        0x581: 'PJ4/PJ4b',
+        0x584: 'PJ4B-MP'
+    }),
+    0x61: ('Apple', {
+        0x020: 'Icestorm',
+        0x021: 'Firestorm',
+        0x022: 'Icestorm',
+        0x023: 'Firestorm'
+    }),
+    0x66: ('Faraday', {
+        0x526: 'FA526',
+        0x626: 'FA626'
+    }),
+    0x69: ('Intel', {
+        0x200: 'i80200',
+        0x210: 'PXA250A',
+        0x212: 'PXA210A',
+        0x242: 'i80321-400',
+        0x243: 'i80321-600',
+        0x290: 'PXA250B/PXA26x',
+        0x292: 'PXA210B',
+        0x2c2: 'i80321-400-B0',
+        0x2c3: 'i80321-600-B0',
+        0x2d0: 'PXA250C/PXA255/PXA26x',
+        0x2d2: 'PXA210C',
+        0x411: 'PXA27x',
+        0x41c: 'IPX425-533',
+        0x41d: 'IPX425-400',
+        0x41f: 'IPX425-266',
+        0x682: 'PXA32x',
+        0x683: 'PXA930/PXA935',
+        0x688: 'PXA30x',
+        0x689: 'PXA31x',
+        0xb11: 'SA1110',
+        0xc12: 'IPX1200'
+    }),
+    0xc0: ('Ampere', {
+        0xac3: 'Ampere-1',
+        0xac4: 'Ampere-1a'
+    })
+}
 
 
 class CPU:
     """
-    Parse `/proc/cpuinfo` file to retrieve the model name.
-    If no information could be retrieved, calls `lscpu`.
+    Stream `/proc/cpuinfo` file to retrieve the model name.
+    If not present (some ARM architectures, see #29), it's resolved from the `MIDR` register.
+    `lscpu` is only called as a last resort (i.e. on architectures without `MIDR`).
+    Sockets, cores and threads counts are then computed from `sysfs` CPU topology.
     """
     def __init__(self):
-        model_name_regex = re.compile(
-            r'^model name\s*:\s*(.*)$',
-            flags=re.IGNORECASE | re.MULTILINE
-        )
-
-        with open('/proc/cpuinfo') as file:
-            cpuinfo = re.search(model_name_regex, file.read())
-
-        # This test case has been built for some ARM architectures (see #29).
-        # Sometimes, `model name` info is not present within `/proc/cpuinfo`.
-        # We use the output of `lscpu` program (util-linux-ng) to retrieve it.
-        if not cpuinfo:
-            cpuinfo = re.search(
-                model_name_regex,
-                check_output(
-                    ['lscpu'],
-                    env={'LANG': 'C'}, universal_newlines=True
-                )
-            )
+        model_name = Facts().get_cpuinfo_field('model name') \
+            or self._get_arm_model_name() \
+            or self._get_lscpu_model_name()
+        if not model_name:
+            self.value = Configuration().get('default_strings')['not_detected']
+            return
 
         # Sometimes CPU model name contains extra ugly white-spaces.
-        self.value = re.sub(r'\s+', ' ', cpuinfo.group(1))
+        self.value = re.sub(r'\s+', ' ', model_name)
+
+        topology = self._get_topology()
+        if topology:
+            sockets, cores, threads = topology
+            self.value += ' ({0}{1}C/{2}T)'.format(
+                ('{0}S/'.format(sockets) if sockets > 1 else ''),
+                cores,
+                threads
+            )
+
+    @staticmethod
+    def _get_arm_model_name():
+        """Resolve an ARM CPU model name from its implementer and part numbers"""
+        try:
+            # `MIDR_EL1` is exposed by 64-bit kernels.
+            with open(os.path.join(
+                    CPU_SYSFS_PATH, 'cpu0', 'regs', 'identification', 'midr_el1')) as file:
+                midr = int(file.read(), 16)
+            implementer, part = (midr >> 24) & 0xff, (midr >> 4) & 0xfff
+        except (OSError, ValueError):
+            # `/proc/cpuinfo` provides these fields anyway.
+            facts = Facts()
+            try:
+                implementer = int(facts.get_cpuinfo_field('CPU implementer'), 16)
+                part = int(facts.get_cpuinfo_field('CPU part'), 16)
+            except (TypeError, ValueError):
+                return None
+
+        try:
+            vendor, parts = ARM_IMPLEMENTERS[implementer]
+        except KeyError:
+            return None
+
+        return '{0} {1}'.format(vendor, parts.get(part, 'Unknown (0x{0:03x})'.format(part)))
+
+    @staticmethod
+    def _get_lscpu_model_name():
+        """Retrieve the model name from `lscpu` (util-linux) output, or `None`"""
+        try:
+            lscpu_output = check_output(
+                ['lscpu'],
+                env={'LANG': 'C'}, universal_newlines=True, stderr=DEVNULL
+            )
+        except (FileNotFoundError, CalledProcessError):
+            return None
+
+        model_name = re.search(r'^Model name\s*:\s*(.+)$', lscpu_output, flags=re.MULTILINE)
+        return model_name.group(1) if model_name else None
+
+    @staticmethod
+    def _get_topology():
+        """Return `(sockets, cores, threads)` counts of online CPUs, or `None`"""
+        try:
+            cpus = os.listdir(CPU_SYSFS_PATH)
+        except OSError:
+            return None
+
+        packages, cores, threads = set(), set(), 0
+        for cpu in cpus:
+            if not CPU_DIR_REGEX.match(cpu):
+                continue
+
+            topology_path = os.path.join(CPU_SYSFS_PATH, cpu, 'topology')
+            try:
+                with open(os.path.join(topology_path, 'physical_package_id')) as file:
+                    package_id = int(file.read())
+                with open(os.path.join(topology_path, 'core_id')) as file:
+                    core_id = int(file.read())
+            except (OSError, ValueError):
+                # Offline CPUs don't expose their topology.
+                continue
+
+            packages.add(package_id)
+            cores.add((package_id, core_id))
+            threads += 1
+
+        if not threads:
+            return None
+
+        return len(packages), len(cores), threads
@@ -22,18 +22,16 @@ DE_DICT = {
 
 class DesktopEnvironment:
     """
-    Just iterate over running processes to find a known-entry.
+    Just look running processes up for a known-entry (in `DE_DICT` order).
     If not, rely on the `XDG_CURRENT_DESKTOP` environment variable.
     """
     def __init__(self):
-        processes = Processes().get()
-        for key, value in DE_DICT.items():
-            if key in processes:
-                desktop_environment = value
-                break
+        running_desktop_environment = Processes().match(DE_DICT)
+        if running_desktop_environment is not None:
+            desktop_environment = DE_DICT[running_desktop_environment]
 
         else:
-            # Let's rely on an environment var if the loop above didn't `break`
+            # Let's rely on an environment var if no known process is running
             desktop_environment = os.getenv(
                 'XDG_CURRENT_DESKTOP',
                 Configuration().get('default_strings')['not_detected']
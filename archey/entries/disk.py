@@ -1,15 +1,50 @@
 """Disk usage detection class"""
 
+import os
 import re
 
-from subprocess import check_output, CalledProcessError, DEVNULL
+from subprocess import CalledProcessError, DEVNULL
 
 from archey.colors import Colors
+from archey.command import check_output
 from archey.configuration import Configuration
 
 
+# File-systems taken into account (others are either virtual, remote or handled separately).
+DISK_FS_TYPES = (
+    'ext2', 'ext3', 'ext4',
+    'fat32',
+    'fuseblk',
+    'jfs',
+    'lxfs',
+    'ntfs',
+    'reiserfs',
+    'simfs',
+    'xfs',
+    'zfs'
+)
+
+# Mounted btrfs file-systems are exposed there (one directory per file-system UUID).
+BTRFS_SYSFS_PATH = '/sys/fs/btrfs'
+
+# Ratio between physical and logical spaces, for each btrfs block groups profile.
+# RAID5 and RAID6 ones depend on the number of devices (see `_get_btrfs_profile_ratio`).
+BTRFS_PROFILES_RATIOS = {
+    'single': 1,
+    'dup': 2,
+    'raid0': 1,
+    'raid1': 2,
+    'raid1c3': 3,
+    'raid1c4': 4,
+    'raid10': 2
+}
+
+
 class Disk:
-    """Uses `df` and `btrfs` commands to compute the total disk usage across devices"""
+    """
+    Parses `/proc/self/mountinfo` and calls `statvfs` (falling back on `df`),
+      and reads btrfs `sysfs` attributes, to compute the total disk usage across devices.
+    """
     def __init__(self):
         # The configuration object is needed to retrieve some settings below.
         configuration = Configuration()
@@ -20,7 +55,11 @@ class Disk:
             'total': 0.0
         }
 
-        self._run_df_usage()
+        self._mounts = self._get_mounts()
+        if self._mounts is not None:
+            self._run_statvfs_usage()
+        else:
+            self._run_df_usage()
         self._run_btrfs_usage()
 
         # Check whether at least one media could be found.
@@ -44,25 +83,73 @@ class Disk:
             round(self._usage['total'], 1)
         )
 
+    @staticmethod
+    def _get_mounts():
+        """
+        Parse `/proc/self/mountinfo` into a list of `(device, fs_type, mount_point)` tuples.
+        `device` is the `major:minor` identifier of the mounted file-system.
+        Returns `None` if this file could not be read.
+        """
+        try:
+            with open('/proc/self/mountinfo') as file:
+                mountinfo = file.read().splitlines()
+        except OSError:
+            return None
+
+        mounts = []
+        for line in mountinfo:
+            # See `proc(5)` : optional fields are terminated by a single hyphen.
+            fields = line.split()
+            try:
+                separator_index = fields.index('-', 6)
+                fs_type = fields[separator_index + 1]
+            except (ValueError, IndexError):
+                continue
+
+            # Special characters within mount points are escaped as octal sequences.
+            mount_point = re.sub(
+                r'\\([0-7]{3})',
+                lambda match: chr(int(match.group(1), 8)),
+                fields[4]
+            )
+
+            mounts.append((fields[2], fs_type, mount_point))
+
+        return mounts
+
+    def _run_statvfs_usage(self):
+        """
+        Sum usage of each mounted device whose file-system type is in `DISK_FS_TYPES`.
+        As `df` does, a device mounted multiple times (bind mounts, ...) is only counted once.
+        """
+        seen_devices = set()
+        for device, fs_type, mount_point in self._mounts:
+            if fs_type not in DISK_FS_TYPES or device in seen_devices:
+                continue
+
+            try:
+                fs_stats = os.statvfs(mount_point)
+            except OSError:
+                continue
+
+            seen_devices.add(device)
+
+            # Same units as the `df -B MB` fall-back below (MB, then divided by 1024).
+            block_size = fs_stats.f_frsize / 1000 ** 2 / 1024
+            self._usage['used'] += (fs_stats.f_blocks - fs_stats.f_bfree) * block_size
+            self._usage['total'] += fs_stats.f_blocks * block_size
+
     def _run_df_usage(self):
+        fs_types_args = []
+        for fs_type in DISK_FS_TYPES:
+            fs_types_args += ['-t', fs_type]
+
         try:
             df_output = check_output(
-                [
-                    'df', '-l', '-P', '-B', 'MB', '--total',
-                    '-t', 'ext2', '-t', 'ext3', '-t', 'ext4',
-                    '-t', 'fat32',
-                    '-t', 'fuseblk',
-                    '-t', 'jfs',
-                    '-t', 'lxfs',
-                    '-t', 'ntfs',
-                    '-t', 'reiserfs',
-                    '-t', 'simfs',
-                    '-t', 'xfs',
-                    '-t', 'zfs'
-                ],
+                ['df', '-l', '-P', '-B', 'MB', '--total'] + fs_types_args,
                 env={'LANG': 'C'}, universal_newlines=True, stderr=DEVNULL
             ).splitlines()[-1].split()
-        except CalledProcessError:
+        except (FileNotFoundError, CalledProcessError):
             # It looks like there is not any file system matching our types.
             # Known bug : `df` available in BusyBox does not support our flags.
             return
@@ -72,66 +159,75 @@ class Disk:
 
     def _run_btrfs_usage(self):
         """
-        Since btrfs file-systems can span multiple disks, we fetch all mounted
-        btrfs file-systems, retrieve the btrfs partitions associated with each,
-        and remove all mount-points with common partitions, then query file-system
-        usage for each remaining mount-point.
+        Since btrfs file-systems can span multiple disks (and be mounted multiple times, as
+          subvolumes), usage is read once per file-system, from `/sys/fs/btrfs/<UUID>/`.
+        Physical space is then divided by the data profile ratio to get logical space.
         """
         try:
-            # Retrieve all mount-points containing btrfs filesystems.
-            df_btrfs_mounts = check_output(
-                ['df', '-l', '--output=target', '-t', 'btrfs'],
-                env={'LANG': 'C'}, universal_newlines=True, stderr=DEVNULL
-            ).splitlines()[1:]
-        except CalledProcessError:
+            fs_uuids = os.listdir(BTRFS_SYSFS_PATH)
+        except OSError:
             # No btrfs file-systems present.
             return
 
-        # Eliminate duplicate mounts (e.g. different subvolumes).
-        btrfs_unique_mounts = []
-        for mountpoint in df_btrfs_mounts:
+        for fs_uuid in fs_uuids:
+            fs_path = os.path.join(BTRFS_SYSFS_PATH, fs_uuid)
             try:
-                btrfs_mount_output = check_output(
-                    ['btrfs', 'device', 'usage', mountpoint],
-                    env={'LANG': 'C'}, universal_newlines=True, stderr=DEVNULL
-                ).splitlines()
-            except (FileNotFoundError, CalledProcessError):
-                # `btrfs-progs` not available.
-                return
-
-            if btrfs_mount_output not in btrfs_unique_mounts:
-                btrfs_unique_mounts.append(mountpoint)
-
-        # Query all unique mount-points for usage.
-        btrfs_usage_output = check_output(
-            ['btrfs', 'filesystem', 'usage', '--gbytes'] + btrfs_unique_mounts,
-            env={'LANG': 'C'}, universal_newlines=True, stderr=DEVNULL
-        )
-
-        # JSON output support landed very "late" in `btrfs-progs` user-space binaries.
-        # We are parsing it the hard way to increase compatibility...
-        physical_device_used = re.findall(
-            r"Used:\s+(\d+\.\d+)GiB", btrfs_usage_output,
-            flags=re.MULTILINE
-        )
-        physical_device_size = re.findall(
-            r"Device size:\s+(\d+\.\d+)GiB", btrfs_usage_output,
-            flags=re.MULTILINE
-        )
-        data_ratios = re.findall(
-            r"Data ratio:\s+(\d+\.\d+)", btrfs_usage_output,
-            flags=re.MULTILINE
-        )
-
-        # Divide physical space by the corresponding data ratio to get space used for that group.
-        logical_device_used = [
-            float(x) / float(y)
-            for x, y in zip(physical_device_used, data_ratios)
-        ]
-        logical_device_size = [
-            float(x) / float(y)
-            for x, y in zip(physical_device_size, data_ratios)
-        ]
-
-        self._usage['total'] += sum(logical_device_size)
-        self._usage['used'] += sum(logical_device_used)
+                devices = os.listdir(os.path.join(fs_path, 'devices'))
+                # Block devices sizes are expressed in 512-byte sectors.
+                devices_size = sum(
+                    self._read_sysfs_int(os.path.join(fs_path, 'devices', device, 'size')) * 512
+                    for device in devices
+                )
+
+                physical_used, data_logical_total, data_physical_total = \
+                    self._read_btrfs_allocation(fs_path, len(devices))
+            except (OSError, ValueError):
+                # This is not a file-system directory (`features/`), or it has just been unmounted.
+                continue
+
+            data_ratio = (data_physical_total / data_logical_total) if data_logical_total else 1
+
+            self._usage['used'] += physical_used / data_ratio / 1024 ** 3
+            self._usage['total'] += devices_size / data_ratio / 1024 ** 3
+
+    @classmethod
+    def _read_btrfs_allocation(cls, fs_path, devices_count):
+        """
+        Sum `allocation/<type>/<profile>/` sizes of the file-system at `fs_path`.
+        Returns physical space used, along with logical and physical sizes of data block groups.
+        """
+        physical_used = 0
+        data_logical_total = data_physical_total = 0
+        for block_group_type in ('data', 'metadata', 'system'):
+            type_path = os.path.join(fs_path, 'allocation', block_group_type)
+            for profile in os.listdir(type_path):
+                ratio = cls._get_btrfs_profile_ratio(profile, devices_count)
+                if ratio is None:
+                    # Not a profile directory, but a type-wide attribute.
+                    continue
+
+                profile_path = os.path.join(type_path, profile)
+                physical_used += \
+                    cls._read_sysfs_int(os.path.join(profile_path, 'used_bytes')) * ratio
+
+                if block_group_type == 'data':
+                    data_total = cls._read_sysfs_int(os.path.join(profile_path, 'total_bytes'))
+                    data_logical_total += data_total
+                    data_physical_total += data_total * ratio
+
+        return physical_used, data_logical_total, data_physical_total
+
+    @staticmethod
+    def _get_btrfs_profile_ratio(profile, devices_count):
+        """Return physical/logical space ratio of `profile`, or `None` if it's not a profile"""
+        if profile == 'raid5':
+            return devices_count / max(devices_count - 1, 1)
+        if profile == 'raid6':
+            return devices_count / max(devices_count - 2, 1)
+
+        return BTRFS_PROFILES_RATIOS.get(profile)
+
+    @staticmethod
+    def _read_sysfs_int(path):
+        with open(path) as file:
+            return int(file.read())
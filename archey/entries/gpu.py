@@ -2,8 +2,9 @@
 
 import re
 
-from subprocess import check_output, CalledProcessError
+from subprocess import CalledProcessError
 
+from archey.command import check_output
 from archey.configuration import Configuration
 
 
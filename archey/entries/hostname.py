@@ -1,12 +1,9 @@
 """Host name detection class"""
 
-from subprocess import check_output
+from archey.facts import Facts
 
 
 class Hostname:
-    """Simple call to `uname` to retrieve the host name"""
+    """Relies on shared `uname` facts to retrieve the host name"""
     def __init__(self):
-        self.value = check_output(
-            ['uname', '-n'],
-            universal_newlines=True
-        ).rstrip()
+        self.value = Facts().get_uname().nodename
@@ -1,12 +1,9 @@
 """Kernel information detection class"""
 
-from subprocess import check_output
+from archey.facts import Facts
 
 
 class Kernel:
-    """Another call to `uname` to retrieve kernel release information"""
+    """Relies on shared `uname` facts to retrieve kernel release information"""
     def __init__(self):
-        self.value = check_output(
-            ['uname', '-r'],
-            universal_newlines=True
-        ).rstrip()
+        self.value = Facts().get_uname().release
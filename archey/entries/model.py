@@ -1,11 +1,60 @@
 """Hardware model information detection class"""
 
 import os
-import re
-
-from subprocess import CalledProcessError, DEVNULL, check_output
 
 from archey.configuration import Configuration
+from archey.facts import Facts
+
+
+# DMI fields prefixes identifying hypervisors, named as `systemd-detect-virt` does.
+DMI_HYPERVISORS = (
+    ('KVM', 'kvm'),
+    ('OpenStack', 'kvm'),
+    ('KubeVirt', 'kvm'),
+    ('Amazon EC2', 'amazon'),
+    ('QEMU', 'qemu'),
+    ('VMware', 'vmware'),
+    ('VMW', 'vmware'),
+    ('innotek GmbH', 'oracle'),
+    ('VirtualBox', 'oracle'),
+    ('Oracle Corporation', 'oracle'),
+    ('Xen', 'xen'),
+    ('Bochs', 'bochs'),
+    ('Parallels', 'parallels'),
+    ('BHYVE', 'bhyve'),
+    ('Hyper-V', 'microsoft'),
+    ('Apple Virtualization', 'apple'),
+    ('Google Compute Engine', 'google')
+)
+
+# `/sys/class/dmi/id/` attributes, and their SMBIOS `(structure, field)` counterparts.
+DMI_SMBIOS_FIELDS = {
+    'sys_vendor': ('system', 'manufacturer'),
+    'product_name': ('system', 'product_name'),
+    'board_vendor': ('baseboard', 'manufacturer'),
+    'bios_vendor': ('bios', 'vendor')
+}
+
+# Bit of the Xen features set only for the control domain (`XENFEAT_dom0`).
+XENFEAT_DOM0 = 11
+
+# Containers markers paths, checked in order : `(path, host_path, container)`.
+# A marker doesn't count when `host_path` exists too (i.e. on OpenVZ hosts).
+# When `container` is `None`, its name is the marker content (written by systemd, for anyone).
+CONTAINER_MARKERS = (
+    ('/run/systemd/container', None, None),
+    ('/.dockerenv', None, 'docker'),
+    ('/run/.containerenv', None, 'podman'),
+    ('/proc/vz', '/proc/bc', 'openvz')
+)
+
+# Control groups paths fragments identifying container managers.
+CGROUP_CONTAINERS = (
+    ('kubepods', 'kubernetes'),
+    ('docker', 'docker'),
+    ('libpod', 'podman'),
+    ('lxc', 'lxc')
+)
 
 
 class Model:
@@ -32,75 +81,133 @@ class Model:
 
     def _check_virtualization(self):
         """
-        Relying on some system tools, tries to gather some details about hypervisor.
-        When available, relies on systemd.
-        When run as root, `virt-what` and/or `dmidecode` may be called.
+        Without running any program, tries to gather some details about hypervisor.
+        Containers are looked for first, then virtual machines (as `systemd-detect-virt` does).
         """
-        environment, product_name = None, None
-
-        try:
-            environment = check_output(
-                ['systemd-detect-virt'],
-                stderr=DEVNULL, universal_newlines=True
-            ).rstrip()
-        except CalledProcessError:
-            # Not a virtual environment.
-            return
-        except FileNotFoundError:
-            pass
-
-        # When run as root, let's ask `virt-what` and/or `dmidecode`.
-        if os.getuid() == 0:
-            # We couldn't retrieve any information from `systemd-detect-virt`.
-            if not environment:
-                try:
-                    environment = ', '.join(
-                        check_output(
-                            ['virt-what'],
-                            stderr=DEVNULL, universal_newlines=True
-                        ).splitlines()
-                    )
-                except (FileNotFoundError, CalledProcessError):
-                    pass
-
-            try:
-                # Sometimes we may gather info added by hosting service provider this way.
-                product_name = check_output(
-                    ['dmidecode', '-s', 'system-product-name'],
-                    stderr=DEVNULL, universal_newlines=True
-                ).rstrip()
-            except (FileNotFoundError, CalledProcessError):
-                pass
+        environment = self._detect_container() or self._detect_virtual_machine()
 
         # Definitely not a virtual environment.
         if not environment:
             return
 
         # If we reach there, this _should_ be a virtual environment.
+        # Sometimes we may gather info added by hosting service provider this way.
         self.value = "{0} ({1})".format(
-            product_name or self._default_strings['virtual_environment'],
+            self._read_dmi_field('product_name') or
+            self._default_strings['virtual_environment'],
             environment
         )
 
+    def _detect_container(self):
+        """Look for container managers markers, returning a container environment name"""
+        # Set by systemd (and most container managers) for PID 1, but only readable by root.
+        environ = self._read_file('/proc/1/environ') or ''
+        for variable in environ.split('\0'):
+            if variable.startswith('container='):
+                return variable[len('container='):]
+
+        for path, host_path, container in CONTAINER_MARKERS:
+            if container is None:
+                container = self._read_file(path)
+            elif not os.path.exists(path) or (host_path and os.path.exists(host_path)):
+                continue
+
+            if container:
+                return container
+
+        # Windows Subsystem for Linux kernels identify themselves (as `Output` relies upon).
+        if 'microsoft' in Facts().get_uname().release.lower():
+            return 'wsl'
+
+        cgroups = self._read_file('/proc/1/cgroup') or ''
+        for cgroup in cgroups.splitlines():
+            # Format is `hierarchy-ID:controllers:path`.
+            cgroup_path = cgroup.split(':', 2)[-1]
+            for fragment, container in CGROUP_CONTAINERS:
+                if fragment in cgroup_path:
+                    return container
+
+        return None
+
+    def _detect_virtual_machine(self):
+        """Look for hypervisors traces, returning a virtual machine environment name"""
+        # Xen (para-virtualized) guests.
+        hypervisor_type = self._read_file('/sys/hypervisor/type')
+        if hypervisor_type:
+            # As for `systemd-detect-virt`, Xen control domain (dom0) is not a virtual machine.
+            if hypervisor_type == 'xen' and self._is_xen_dom0():
+                return None
+
+            return hypervisor_type
+
+        # Hypervisors usually identify themselves within DMI tables.
+        dmi_fields = {
+            dmi_field: self._read_dmi_field(dmi_field) or ''
+            for dmi_field in DMI_SMBIOS_FIELDS
+        }
+        for dmi_value in dmi_fields.values():
+            for prefix, hypervisor in DMI_HYPERVISORS:
+                if dmi_value.startswith(prefix):
+                    return hypervisor
+
+        if dmi_fields['sys_vendor'] == 'Microsoft Corporation' \
+                and dmi_fields['product_name'] == 'Virtual Machine':
+            return 'microsoft'
+
+        # At last, CPUID "hypervisor" bit is exposed as a CPU flag (x86 only).
+        if 'hypervisor' in (Facts().get_cpuinfo_field('flags') or '').split():
+            return 'vm-other'
+
+        return None
+
+    def _is_xen_dom0(self):
+        """Check whether we run within Xen control domain, from its features (or capabilities)"""
+        features = self._read_file('/sys/hypervisor/properties/features')
+        if features:
+            try:
+                return bool(int(features, 16) & (1 << XENFEAT_DOM0))
+            except ValueError:
+                pass
+
+        # Older kernels only expose `xenfs` capabilities.
+        return 'control_d' in (self._read_file('/proc/xen/capabilities') or '')
+
     def _check_product_name(self):
-        """Tries to open a specific Linux file, looking for machine's product name"""
-        try:
-            with open('/sys/devices/virtual/dmi/id/product_name') as f_product_name:
-                self.value = f_product_name.read().rstrip()
-        except FileNotFoundError:
-            pass
+        """Looks for machine's product name"""
+        self.value = self._read_dmi_field('product_name')
 
     def _check_rasperry_pi(self):
         """Tries to retrieve 'Hardware' and 'Revision IDs' from `/proc/cpuinfo`"""
-        with open('/proc/cpuinfo') as f_cpu_info:
-            cpu_info = f_cpu_info.read()
+        facts = Facts()
 
         # If the output contains 'Hardware' and 'Revision'...
-        hardware = re.search('(?<=Hardware\t: ).*', cpu_info)
-        revision = re.search('(?<=Revision\t: ).*', cpu_info)
+        hardware = facts.get_cpuinfo_field('Hardware')
+        revision = facts.get_cpuinfo_field('Revision')
         if hardware and revision:
             # ... let's set a pretty info string with these data
-            self.value = 'Raspberry Pi {0} (Rev. {1})'.format(
-                hardware.group(0),
-                revision.group(0)
-            )
+            self.value = 'Raspberry Pi {0} (Rev. {1})'.format(hardware, revision)
+
+    def _read_dmi_field(self, dmi_field):
+        """
+        Return `/sys/class/dmi/id/<dmi_field>` content.
+        When not exposed there, fall back on decoded SMBIOS tables (only readable by root).
+        """
+        value = self._read_file('/sys/class/dmi/id/' + dmi_field)
+        if value:
+            return value
+
+        smbios = Facts().get_smbios()
+        if not smbios:
+            return None
+
+        structure, field = DMI_SMBIOS_FIELDS[dmi_field]
+        return smbios[structure].get(field)
+
+    @staticmethod
+    def _read_file(path):
+        """Return the (stripped) content of `path`, or `None` if it can't be read"""
+        try:
+            with open(path) as file:
+                return file.read().strip()
+        except (OSError, UnicodeDecodeError):
+            return None
@@ -1,60 +1,306 @@
 """Number of installed packages detection class"""
 
 import os
+import site
+import sqlite3
+import struct
 
-from subprocess import check_output, DEVNULL, CalledProcessError
+from concurrent.futures import ThreadPoolExecutor
+from subprocess import DEVNULL, CalledProcessError, TimeoutExpired
 
+from archey.command import check_output, deadline, get_deadline
 from archey.configuration import Configuration
 
 
-PACKAGES_TOOLS = (
-    {'cmd': ['apk', 'list', '--installed']},
-    # As of 2020, `apt` is _very_ slow compared to `dpkg` on Debian-based distributions.
-    # Additional note : `apt`'s CLI is currently not "stable" in Debian terms.
-    #{'cmd': ['apt', 'list', '-qq', '--installed']},
-    {'cmd': ['dnf', 'list', 'installed'], 'skew': 1},
-    {'cmd': ['dpkg', '--get-selections']},
-    {'cmd': ['emerge', '-ep', 'world'], 'skew': 5},
-    {'cmd': ['pacman', '-Q']},
-    {'cmd': ['rpm', '-qa']},
-    {'cmd': ['yum', 'list', 'installed'], 'skew': 2},
-    {'cmd': ['zypper', 'search', '-i'], 'skew': 5}
-)
+# Packages databases, as maintained by each packages manager.
+APK_INSTALLED_PATH = '/lib/apk/db/installed'
+DPKG_STATUS_PATH = '/var/lib/dpkg/status'
+PACMAN_LOCAL_PATH = '/var/lib/pacman/local'
+PORTAGE_DB_PATH = '/var/db/pkg'
+RPM_DB_PATH = '/var/lib/rpm'
+# RPM database files which may be (directly) updated by a transaction.
+RPM_DB_FILES = ('rpmdb.sqlite', 'rpmdb.sqlite-wal', 'Packages')
+SNAPD_SNAPS_PATH = '/var/lib/snapd/snaps'
+# System-wide Flatpak installation, which `.changed` file is touched on each modification.
+FLATPAK_PATH = '/var/lib/flatpak'
+
+# Berkeley DB (hash access method) on-disk format constants, see `dbinc/db_page.h`.
+BDB_HASH_MAGIC = 0x061561
+BDB_HASH_PAGE_TYPES = (2, 13)  # P_HASH_UNSORTED, P_HASH
+
+# Packages managers, by order of preference. Only the first found system one is usually counted.
+SYSTEM_PACKAGES_MANAGERS = ('apk', 'dpkg', 'portage', 'pacman', 'rpm')
+# These ones may only be counted along with system ones (see `combine_managers` option).
+OTHER_PACKAGES_MANAGERS = ('snap', 'flatpak', 'pip')
 
 
 class Packages:
-    """Relies on the first found packages manager to list the installed packages"""
+    """
+    Reads the database of the first found packages manager to count the installed packages.
+    `dnf`, `yum` and `zypper` all rely on the RPM database, whereas `emerge` relies on Portage's.
+    When `combine_managers` is enabled, every packages manager is concurrently counted instead.
+    """
     def __init__(self):
-        for packages_tool in PACKAGES_TOOLS:
-            try:
-                results = check_output(
-                    packages_tool['cmd'],
-                    stderr=DEVNULL,
-                    env={
-                        'LANG': 'C',
-                        # Alpine Linux: We have to manually propagate `PATH`.
-                        #               `apk` wouldn't be found otherwise.
-                        'PATH': os.getenv('PATH')
-                    },
-                    universal_newlines=True
+        # The configuration object is needed to retrieve some settings below.
+        configuration = Configuration()
+
+        if configuration.get('packages')['combine_managers']:
+            counts = self._count_all()
+            if counts:
+                self.value = ', '.join(
+                    '{0} ({1})'.format(count, manager) for manager, count in counts
                 )
-            except (FileNotFoundError, CalledProcessError):
+                return
+        else:
+            for manager in SYSTEM_PACKAGES_MANAGERS:
+                try:
+                    self.value = getattr(self, '_count_' + manager)()
+                except (OSError, CalledProcessError):
+                    continue
+
+                return
+
+        self.value = configuration.get('default_strings')['not_detected']
+
+    @classmethod
+    def fingerprint(cls):
+        """
+        Return the `[mtime, size, inode]` of each packages database (`None` when missing).
+        Packages managers update them on each (un)installation, so it's all we have to check
+          (Portage bumps `/var/db/pkg` modification time itself when merging a package).
+        """
+        # The displayed value depends on this option too.
+        fingerprint = [Configuration().get('packages')['combine_managers']]
+        for path in [
+                APK_INSTALLED_PATH,
+                DPKG_STATUS_PATH,
+                PORTAGE_DB_PATH,
+                PACMAN_LOCAL_PATH,
+                RPM_DB_PATH,
+                SNAPD_SNAPS_PATH,
+                os.path.join(FLATPAK_PATH, '.changed')
+        ] + [
+            os.path.join(RPM_DB_PATH, rpm_db_file) for rpm_db_file in RPM_DB_FILES
+        ] + cls._get_site_packages():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                fingerprint.append(None)
                 continue
 
-            packages = results.count('\n')
+            fingerprint.append([stat.st_mtime_ns, stat.st_size, stat.st_ino])
 
-            # If any, deduct output skew present due to the packages tool.
-            if 'skew' in packages_tool:
-                packages -= packages_tool['skew']
+        return fingerprint
 
-            # For DPKG only, remove any not purged package.
-            if packages_tool['cmd'][0] == 'dpkg':
-                packages -= results.count('deinstall')
+    @classmethod
+    def _count_all(cls):
+        """
+        Concurrently count packages of each manager, so it takes as long as the slowest one.
+        Returns `(manager, count)` pairs, for managers which have any package installed.
+        """
+        managers = SYSTEM_PACKAGES_MANAGERS + OTHER_PACKAGES_MANAGERS
 
-            # At this step, we may break the loop.
-            break
+        # Worker threads have to honor the entry deadline too.
+        expires_at = get_deadline()
+        with ThreadPoolExecutor(max_workers=len(managers)) as executor:
+            futures = [
+                executor.submit(cls._run_counter, getattr(cls, '_count_' + manager), expires_at)
+                for manager in managers
+            ]
 
-        else:
-            packages = Configuration().get('default_strings')['not_detected']
+        counts = []
+        for manager, future in zip(managers, futures):
+            try:
+                count = future.result()
+            except (OSError, CalledProcessError, TimeoutExpired):
+                continue
+
+            if count:
+                counts.append((manager, count))
+
+        return counts
+
+    @staticmethod
+    def _run_counter(counter, expires_at):
+        with deadline(expires_at):
+            return counter()
+
+    @staticmethod
+    def _count_apk():
+        """Count package records (`P:` lines) of the APK installed database"""
+        with open(APK_INSTALLED_PATH, 'rb') as file:
+            return sum(1 for line in file if line.startswith(b'P:'))
+
+    @staticmethod
+    def _count_dpkg():
+        """Count packages marked as installed (whatever their selection state) by DPKG"""
+        packages = 0
+        with open(DPKG_STATUS_PATH, 'rb') as file:
+            for line in file:
+                # e.g. "Status: install ok installed", or "Status: hold ok installed".
+                if line.startswith(b'Status:') and line.rstrip().endswith(b' installed'):
+                    packages += 1
+
+        return packages
+
+    @staticmethod
+    def _count_portage():
+        """Count `<category>/<package>` directories of the Portage database"""
+        packages = 0
+        for category in os.listdir(PORTAGE_DB_PATH):
+            category_path = os.path.join(PORTAGE_DB_PATH, category)
+            if not os.path.isdir(category_path):
+                continue
+            for package in os.listdir(category_path):
+                # Skip packages being (un)merged at the moment.
+                if not package.startswith('-MERGING-') \
+                        and os.path.isdir(os.path.join(category_path, package)):
+                    packages += 1
+
+        return packages
+
+    @staticmethod
+    def _count_pacman():
+        """Count package directories (holding a `desc` file) of Pacman's local database"""
+        return sum(
+            1 for package in os.listdir(PACMAN_LOCAL_PATH)
+            if os.path.isfile(os.path.join(PACMAN_LOCAL_PATH, package, 'desc'))
+        )
+
+    @classmethod
+    def _count_rpm(cls):
+        """
+        Count RPM packages, from a SQLite (RPM >= 4.16) or a Berkeley DB database.
+        Other backends (e.g. NDB) are not supported, so we fall back on `rpm` itself.
+        """
+        if not os.path.isdir(RPM_DB_PATH):
+            raise FileNotFoundError(RPM_DB_PATH)
+
+        try:
+            return cls._count_rpm_sqlite()
+        except sqlite3.Error:
+            pass
+
+        try:
+            return cls._count_rpm_bdb()
+        except (OSError, ValueError, struct.error):
+            pass
+
+        return check_output(
+            ['rpm', '-qa'],
+            stderr=DEVNULL, env={'LANG': 'C'}, universal_newlines=True
+        ).count('\n')
+
+    @staticmethod
+    def _count_rpm_sqlite():
+        # The database is opened read-only, as a regular user can't lock it.
+        connection = sqlite3.connect(
+            'file:{0}?mode=ro'.format(os.path.join(RPM_DB_PATH, 'rpmdb.sqlite')),
+            uri=True
+        )
+        try:
+            return connection.execute('SELECT count(*) FROM Packages').fetchone()[0]
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _count_rpm_bdb():
+        """
+        Walk the pages of the `Packages` Berkeley DB hash database, counting stored keys.
+        Key/data pairs are not decoded : each hash page header tells us its number of items.
+        Metadata counters are not relied upon, as they are only updated by `DB->stat`.
+        """
+        with open(os.path.join(RPM_DB_PATH, 'Packages'), 'rb') as file:
+            metadata = file.read(512)
+
+            # Metadata page : magic number at offset 12, page size at offset 20.
+            for byte_order in ('<', '>'):
+                magic, _, page_size = struct.unpack_from(byte_order + 'III', metadata, 12)
+                if magic == BDB_HASH_MAGIC:
+                    break
+            else:
+                raise ValueError('Not a Berkeley DB hash database')
+
+            items = 0
+            file.seek(page_size)
+            while True:
+                page = file.read(page_size)
+                if len(page) < 26:
+                    break
+                # Page header : items count at offset 20, page type at offset 25.
+                if page[25] in BDB_HASH_PAGE_TYPES:
+                    items += struct.unpack_from(byte_order + 'H', page, 20)[0]
+
+        # Each package is a key/data pair, and RPM stores its next "instance" number under key 0.
+        return max(items // 2 - 1, 0)
+
+    @staticmethod
+    def _count_snap():
+        """Count snaps (whatever their number of revisions) from `snapd` mounted images"""
+        return len({
+            snap_file.rpartition('_')[0]
+            for snap_file in os.listdir(SNAPD_SNAPS_PATH)
+            if snap_file.endswith('.snap')
+        })
+
+    @staticmethod
+    def _count_flatpak():
+        """Count applications and runtimes refs (`<kind>/<name>/<arch>/<branch>`) of Flatpak"""
+        if not os.path.isdir(FLATPAK_PATH):
+            raise FileNotFoundError(FLATPAK_PATH)
+
+        packages = 0
+        for kind in ('app', 'runtime'):
+            kind_path = os.path.join(FLATPAK_PATH, kind)
+            if not os.path.isdir(kind_path):
+                continue
+            for name in os.listdir(kind_path):
+                name_path = os.path.join(kind_path, name)
+                # Skip `current` symbolic links, pointing to the default `<arch>/<branch>`.
+                for arch in os.listdir(name_path):
+                    arch_path = os.path.join(name_path, arch)
+                    if os.path.islink(arch_path) or not os.path.isdir(arch_path):
+                        continue
+                    packages += sum(
+                        1 for branch in os.listdir(arch_path)
+                        if not os.path.islink(os.path.join(arch_path, branch))
+                    )
+
+        return packages
+
+    @classmethod
+    def _count_pip(cls):
+        """
+        Count distributions installed by `pip` within site-packages of the running interpreter.
+        Distributions installed by system packages managers (which `INSTALLER` differs) are skipped.
+        """
+        packages = 0
+        for site_packages in cls._get_site_packages():
+            try:
+                dist_infos = [
+                    entry for entry in os.listdir(site_packages) if entry.endswith('.dist-info')
+                ]
+            except OSError:
+                continue
+
+            for dist_info in dist_infos:
+                try:
+                    with open(os.path.join(site_packages, dist_info, 'INSTALLER')) as file:
+                        if file.read().strip() == 'pip':
+                            packages += 1
+                except OSError:
+                    continue
+
+        return packages
+
+    @staticmethod
+    def _get_site_packages():
+        """Return (unique) global site-packages directories of the running interpreter"""
+        site_packages = []
+        # `site.getsitepackages` is not available within old `virtualenv` environments.
+        for site_packages_dir in getattr(site, 'getsitepackages', list)():
+            site_packages_dir = os.path.realpath(site_packages_dir)
+            if site_packages_dir not in site_packages:
+                site_packages.append(site_packages_dir)
 
-        self.value = packages
+        return site_packages
@@ -2,51 +2,35 @@
 
 import re
 
-from subprocess import check_output
-
 from archey.colors import Colors
+from archey.command import check_output
 from archey.configuration import Configuration
 
 
+# Fields required to compute RAM usage when `MemAvailable` is not provided (Linux < 3.14).
+LEGACY_MEMINFO_FIELDS = {'MemTotal', 'MemFree', 'Buffers', 'Cached', 'SReclaimable'}
+
+
 class RAM:
     """
-    First tries to use the `free` command to retrieve RAM usage.
-    If not available, falls back on the parsing of `/proc/meminfo` file.
+    First parses `/proc/meminfo` to compute RAM usage (as `free` would do).
+    If not available, falls back on the `free` command itself.
     """
     def __init__(self):
-        # Fetch the user-defined RAM limits from configuration.
-        ram_limits = Configuration().get('limits')['ram']
+        # The configuration object is needed to retrieve some settings below.
+        configuration = Configuration()
 
         try:
-            ram = ''.join(
-                filter(
-                    re.compile('Mem').search,
-                    check_output(
-                        ['free', '-m'],
-                        env={'LANG': 'C'}, universal_newlines=True
-                    ).splitlines()
-                )
-            ).split()
-            used = float(ram[2])
-            total = float(ram[1])
-
-        except (IndexError, FileNotFoundError):
-            # An in-digest one-liner to retrieve memory info into a dictionary
-            with open('/proc/meminfo') as file:
-                ram = {
-                    i.split(':')[0]: float(i.split(':')[1].strip(' kB')) / 1024
-                    for i in filter(None, file.read().splitlines())
-                }
-
-            total = ram['MemTotal']
-            # Here, let's imitate Neofetch's behavior.
-            # See <https://github.com/dylanaraps/neofetch/wiki/Frequently-Asked-Questions>.
-            used = total + ram['Shmem'] - (
-                ram['MemFree'] + ram['Cached'] + ram['SReclaimable'] + ram['Buffers'])
-            # Imitates what `free` does when the obtained value happens to be incorrect.
-            # See <https://gitlab.com/procps-ng/procps/blob/master/proc/sysinfo.c#L790>.
-            if used < 0:
-                used = total - ram['MemFree']
+            used, total = self._read_proc_meminfo()
+        except (OSError, KeyError, ValueError):
+            try:
+                used, total = self._run_free()
+            except (IndexError, FileNotFoundError):
+                self.value = configuration.get('default_strings')['not_detected']
+                return
+
+        # Fetch the user-defined RAM limits from configuration.
+        ram_limits = configuration.get('limits')['ram']
 
         # Based on the RAM percentage usage, select the corresponding level color.
         level_color = Colors.get_level_color(
@@ -60,3 +44,50 @@ class RAM:
             Colors.CLEAR,
             int(total)
         )
+
+    @staticmethod
+    def _read_proc_meminfo():
+        """
+        Stream `/proc/meminfo` (only until required fields have been read).
+        As `free` (procps-ng >= 4.0.1) does, used memory is `MemTotal - MemAvailable`.
+        Without `MemAvailable`, we fall back on the former `free` computation.
+        Returns used and total memory, in MiB.
+        """
+        meminfo = {}
+        with open('/proc/meminfo') as file:
+            for line in file:
+                key, _, value = line.partition(':')
+                if key == 'MemAvailable' or key in LEGACY_MEMINFO_FIELDS:
+                    meminfo[key] = int(value.split()[0])
+                    # `MemTotal` is always the very first line.
+                    if key == 'MemAvailable' or LEGACY_MEMINFO_FIELDS.issubset(meminfo):
+                        break
+
+        total = meminfo['MemTotal']
+        if 'MemAvailable' in meminfo:
+            used = total - meminfo['MemAvailable']
+        else:
+            used = total - (
+                meminfo['MemFree'] + meminfo['Buffers'] +
+                meminfo['Cached'] + meminfo.get('SReclaimable', 0))
+            # Imitates what `free` does when the obtained value happens to be incorrect.
+            # See <https://gitlab.com/procps-ng/procps/blob/master/proc/sysinfo.c#L790>.
+            if used < 0:
+                used = total - meminfo['MemFree']
+
+        return used / 1024, total / 1024
+
+    @staticmethod
+    def _run_free():
+        """Parse `free -m` output, returning used and total memory, in MiB"""
+        ram = ''.join(
+            filter(
+                re.compile('Mem').search,
+                check_output(
+                    ['free', '-m'],
+                    env={'LANG': 'C'}, universal_newlines=True
+                ).splitlines()
+            )
+        ).split()
+
+        return float(ram[2]), float(ram[1])
@@ -2,8 +2,9 @@
 
 import os
 
-from subprocess import CalledProcessError, check_output
+from subprocess import CalledProcessError
 
+from archey.command import check_output
 from archey.configuration import Configuration
 
 
@@ -1,17 +1,28 @@
 """Temperature detection class"""
 
-import json
+import os
 import re
 
 from glob import iglob
-from subprocess import check_output, DEVNULL, CalledProcessError
+from subprocess import DEVNULL, CalledProcessError
 
+from archey.command import check_output
 from archey.configuration import Configuration
 
 
+# Hardware monitoring chips are exposed there.
+# See <https://www.kernel.org/doc/html/latest/hwmon/sysfs-interface.html>.
+HWMON_PATH = '/sys/class/hwmon'
+
+TEMP_INPUT_REGEX = re.compile(r'^temp\d+_input$')
+
+# `temp*_input` files paths, discovered only once per chip-sets white-list.
+_HWMON_INPUTS_CACHE = {}
+
+
 class Temperature:
     """
-    Tries to compute an average temperature from `sensors` (LM-Sensors).
+    Tries to compute an average temperature from hardware monitoring chips (`hwmon`).
     If not available, falls back on system thermal zones files.
     On Raspberry devices, retrieves temperature from the `vcgencmd` binary.
     """
@@ -21,8 +32,8 @@ class Temperature:
 
         self._temps = []
 
-        # Tries `sensors` at first.
-        self._run_sensors(configuration.get('temperature')['sensors_chipsets'])
+        # Tries `hwmon` chips at first.
+        self._read_hwmon(configuration.get('temperature')['sensors_chipsets'])
 
         # On error (list still empty), checks for system thermal zones files.
         if not self._temps:
@@ -60,35 +71,65 @@ class Temperature:
                 'F' if use_fahrenheit else 'C'
             )
 
-    def _run_sensors(self, whitelisted_chips):
-        # Uses the `sensors` program (from LM-Sensors) to interrogate thermal chip-sets.
+    def _read_hwmon(self, whitelisted_chips):
+        # Temperatures are expressed in millidegrees Celsius.
+        for temp_input in self._get_hwmon_inputs(whitelisted_chips):
+            try:
+                with open(temp_input) as file:
+                    temp = float(file.read()) / 1000
+            except (OSError, ValueError):
+                # Some sensors may (temporarily) fail to be read.
+                continue
+
+            # Some chips/adapters might return null temperatures.
+            if temp != 0.0:
+                self._temps.append(temp)
+
+    @staticmethod
+    def _get_hwmon_inputs(whitelisted_chips):
+        """
+        Return the paths of `temp*_input` files of `hwmon` chips, discovered once.
+        When `whitelisted_chips` is not empty, a chip is only considered if its `name` matches
+          an identifier (`coretemp` would match `coretemp-isa-0000`, as LM-Sensors names it).
+        """
+        cache_key = tuple(whitelisted_chips)
         try:
-            sensors_output = check_output(
-                ['sensors', '-A', '-j'] + whitelisted_chips,
-                universal_newlines=True
-            )
-        except (FileNotFoundError, CalledProcessError):
-            return
+            return _HWMON_INPUTS_CACHE[cache_key]
+        except KeyError:
+            pass
 
         try:
-            sensors_data = json.loads(sensors_output)
-        # For backward compatibility with Python versions prior to 3.5.0
-        #   we use `ValueError` instead of `json.JSONDecodeError`.
-        except ValueError:
-            return
+            hwmon_chips = sorted(os.listdir(HWMON_PATH))
+        except OSError:
+            hwmon_chips = []
+
+        temp_inputs = []
+        for hwmon_chip in hwmon_chips:
+            # Against old kernels, attributes may be located under the `device/` directory.
+            for chip_path in (
+                    os.path.join(HWMON_PATH, hwmon_chip),
+                    os.path.join(HWMON_PATH, hwmon_chip, 'device')):
+                try:
+                    with open(os.path.join(chip_path, 'name')) as file:
+                        chip_name = file.read().strip()
+                    attributes = os.listdir(chip_path)
+                except OSError:
+                    continue
+
+                if whitelisted_chips and not any(
+                        chip_id == chip_name or chip_id.startswith(chip_name + '-')
+                        for chip_id in whitelisted_chips):
+                    break
+
+                temp_inputs.extend(
+                    os.path.join(chip_path, attribute)
+                    for attribute in sorted(attributes)
+                    if TEMP_INPUT_REGEX.match(attribute)
+                )
+                break
 
-        # Iterates over the chip-sets outputs to filter interesting values.
-        for features in sensors_data.values():
-            for subfeatures in features.values():
-                for name, value in subfeatures.items():
-                    # These conditions check whether this sub-feature value is a correct
-                    #  temperature, as :
-                    # * It might be an input fan speed (from a control chip) ;
-                    # * Some chips/adapters might return null temperatures.
-                    if value != 0.0 and re.match(r"temp\d_input", name):
-                        self._temps.append(value)
-                        # There is only one `temp*_input` field, let's stop the current iteration.
-                        break
+        _HWMON_INPUTS_CACHE[cache_key] = temp_inputs
+        return temp_inputs
 
     def _poll_thermal_zones(self):
         # We just check for values within files present in the path below.
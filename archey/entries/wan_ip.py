@@ -1,10 +1,11 @@
 """Public IP address detection class"""
 
 from socket import timeout as SocketTimeoutError
-from subprocess import check_output, DEVNULL, TimeoutExpired, CalledProcessError
+from subprocess import DEVNULL, TimeoutExpired, CalledProcessError
 from urllib.error import URLError
 from urllib.request import urlopen
 
+from archey.command import check_output, get_timeout
 from archey.configuration import Configuration
 
 
@@ -28,9 +29,12 @@ class WanIp:
 
             except (FileNotFoundError, TimeoutExpired, CalledProcessError):
                 try:
+                    # `urlopen` doesn't spawn any process, let's bound it to our deadline too.
                     ipv6_addr = urlopen(
                         'https://v6.ident.me/',
-                        timeout=configuration.get('timeout')['ipv6_detection']
+                        timeout=get_timeout(
+                            'urlopen', configuration.get('timeout')['ipv6_detection']
+                        )
                     )
                     if ipv6_addr and ipv6_addr.getcode() == 200:
                         ipv6_addr = ipv6_addr.read().decode().strip()
@@ -58,7 +62,7 @@ class WanIp:
             try:
                 ipv4_addr = urlopen(
                     'https://v4.ident.me/',
-                    timeout=configuration.get('timeout')['ipv4_detection']
+                    timeout=get_timeout('urlopen', configuration.get('timeout')['ipv4_detection'])
                 )
                 if ipv4_addr and ipv4_addr.getcode() == 200:
                     ipv4_addr = ipv4_addr.read().decode().strip()
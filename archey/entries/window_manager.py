@@ -2,8 +2,9 @@
 
 import re
 
-from subprocess import check_output, DEVNULL, CalledProcessError
+from subprocess import DEVNULL, CalledProcessError
 
+from archey.command import check_output
 from archey.configuration import Configuration
 from archey.processes import Processes
 
@@ -46,7 +47,7 @@ WM_DICT = {
 class WindowManager:
     """
     Uses `wmctrl` to retrieve some information about the window manager.
-    If not available, fall back on a simple iteration over the processes.
+    If not available, fall back on a look-up of running processes (in `WM_DICT` order).
     """
     def __init__(self):
         try:
@@ -59,12 +60,9 @@ class WindowManager:
             ).group(0)
 
         except (FileNotFoundError, CalledProcessError):
-            processes = Processes().get()
-            for key, value in WM_DICT.items():
-                if key in processes:
-                    window_manager = value
-                    break
-
+            running_window_manager = Processes().match(WM_DICT)
+            if running_window_manager is not None:
+                window_manager = WM_DICT[running_window_manager]
             else:
                 window_manager = Configuration().get('default_strings')['not_detected']
 
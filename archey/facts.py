@@ -0,0 +1,84 @@
+"""Simple class (acting as a singleton) to share memoized system facts across entries"""
+
+import os
+
+from contextlib import closing
+from threading import Lock
+
+from archey.singleton import Singleton
+from archey.smbios import read_smbios
+
+
+class Facts(metaclass=Singleton):
+    """
+    Instantiate this class to access system facts, each one being retrieved at most once.
+    `uname` information comes from a single `uname(2)` system call, no process is spawned.
+    """
+    def __init__(self):
+        self._uname = os.uname()
+
+        # Entries may be loaded concurrently, let's read files only once.
+        self._lock = Lock()
+        self._cpuinfo_fields = {}
+        self._cpuinfo_read = False
+        self._smbios = None
+        self._smbios_read = False
+
+    def clear(self):
+        """Forget memoized facts (i.e. when entries are re-computed by a long-running process)"""
+        with self._lock:
+            self._uname = os.uname()
+            self._cpuinfo_fields = {}
+            self._cpuinfo_read = False
+            self._smbios = None
+            self._smbios_read = False
+
+    def get_uname(self):
+        """Simple getter to retrieve the `os.uname()` result (`sysname`, `release`, ...)"""
+        return self._uname
+
+    def get_cpuinfo_field(self, field):
+        """
+        Return the (first) value of `field` (case-insensitive) from `/proc/cpuinfo`, or `None`.
+        This file is only streamed as far as needed (and closed right away), parsed fields are
+          memoized.
+        """
+        field = field.lower()
+        with self._lock:
+            if field not in self._cpuinfo_fields and not self._cpuinfo_read:
+                with closing(self._read_cpuinfo()) as lines:
+                    for line in lines:
+                        key, separator, value = line.partition(':')
+                        if not separator:
+                            continue
+
+                        key = key.strip().lower()
+                        self._cpuinfo_fields.setdefault(key, value.strip())
+                        if key == field:
+                            break
+                    else:
+                        # Every field is known now, the file won't be read again.
+                        self._cpuinfo_read = True
+
+        return self._cpuinfo_fields.get(field)
+
+    def get_smbios(self):
+        """
+        Return (and memoize) decoded SMBIOS tables (see `archey.smbios.parse_tables`).
+        `None` is returned when they are not readable (i.e. when not running as root).
+        """
+        with self._lock:
+            if not self._smbios_read:
+                self._smbios = read_smbios()
+                self._smbios_read = True
+
+        return self._smbios
+
+    @staticmethod
+    def _read_cpuinfo():
+        """Generator yielding `/proc/cpuinfo` lines, as they are read"""
+        try:
+            with open('/proc/cpuinfo') as file:
+                yield from file
+        except OSError:
+            pass
@@ -1,19 +1,14 @@
-"""Simple `__init__` file for the `logos` module, to load each distribution logo"""
+"""
+Simple `__init__` file for the `logos` module.
+Each distribution logo is stored within its own module, only imported on demand.
+"""
 
-from archey.logos.alpine_linux import ALPINE_LINUX
-from archey.logos.arch_linux import ARCH_LINUX
-from archey.logos.bunsenlabs import BUNSENLABS
-from archey.logos.centos import CENTOS
-from archey.logos.crunchbang import CRUNCHBANG
-from archey.logos.debian import DEBIAN
-from archey.logos.fedora import FEDORA
-from archey.logos.gentoo import GENTOO
-from archey.logos.kali_linux import KALI_LINUX
-from archey.logos.manjaro import MANJARO
-from archey.logos.linux import LINUX
-from archey.logos.linux_mint import LINUX_MINT
-from archey.logos.opensuse import OPENSUSE
-from archey.logos.red_hat import RED_HAT
-from archey.logos.slackware import SLACKWARE
-from archey.logos.ubuntu import UBUNTU
-from archey.logos.windows import WINDOWS
+from importlib import import_module
+
+
+def get_logo(logo_name):
+    """
+    Import the `logo_name` module and return the logo it contains.
+    By convention, this module declares its logo as the upper-cased `logo_name` constant.
+    """
+    return getattr(import_module('archey.logos.' + logo_name), logo_name.upper())
@@ -1,16 +1,31 @@
 """
 Output class file.
 It supports entries lazy-insertion, logo detection, and final printing.
+Entries may also be streamed, filling the logo rows in place as they complete.
+A machine-readable (JSON) output is available as well.
 """
 
+import json
+import re
+import shutil
 import sys
-from subprocess import check_output
+
+from collections import OrderedDict
 
 import distro
 
 from archey.constants import COLOR_DICT, LOGOS_DICT, Colors
 from archey.configuration import Configuration
 from archey.distributions import Distributions
+from archey.facts import Facts
+from archey.logos import get_logo
+
+
+# Value displayed in place of entries still being computed (when streaming).
+PLACEHOLDER = '...'
+
+# Matches ANSI/ECMA-48 display attributes escape codes (which are not printed).
+ANSI_ESCAPE_REGEX = re.compile(r'\x1b\[[0-9;]*m')
 
 
 class Output:
@@ -20,7 +35,7 @@ class Output:
     """
     def __init__(self):
         # First we check whether the Kernel has been compiled as a WSL.
-        if 'microsoft' in check_output(['uname', '-r'], universal_newlines=True).lower():
+        if 'microsoft' in Facts().get_uname().release.lower():
             self._distribution = Distributions.WINDOWS
         else:
             try:
@@ -51,29 +66,26 @@ class Output:
         # Each class output will be added in the list below afterwards
         self._results = []
 
+        # When streaming, these attributes locate each result slot on the screen.
+        self._offset = 0
+        self._rows = {}
+        self._lines_count = 0
+        self._columns = 0
+
     def append(self, key, value):
         """Append a pre-formatted entry to the final output content"""
-        self._results.append(
-            '{color}{key}:{clear} {value}'.format(
-                color=self._colors_palette[0],
-                key=key,
-                clear=Colors.CLEAR,
-                value=value
-            )
-        )
+        self._results.append(self._format_entry(key, value))
 
     def output(self):
         """
         Finally render the output entries.
         It handles text centering additionally to value and colors replacing.
         """
-        # Let's center the entries according to the logo (handles odd numbers)
-        self._results[0:0] = [''] * ((18 - len(self._results)) // 2)
-        self._results.extend([''] * (18 - len(self._results)))
+        self._center_results()
 
         try:
             print(
-                LOGOS_DICT[self._distribution].format(
+                get_logo(LOGOS_DICT[self._distribution]).format(
                     c=self._colors_palette,
                     r=self._results
                 ) + str(Colors.CLEAR)
@@ -84,3 +96,137 @@ class Output:
                 'Please disable Unicode within your configuration file.',
                 file=sys.stderr
             )
+
+    def begin_streaming(self, keys):
+        """
+        Render right away the logo, with a placeholder row for each one of `keys`.
+        Rows will then be filled in place (see `stream`) as soon as their values are known.
+        Returns `False` (and prints nothing) when the terminal can't be addressed this way.
+        """
+        logo_lines = get_logo(LOGOS_DICT[self._distribution]).format(
+            c=self._colors_palette,
+            r=['\x00{0}\x00'.format(i) for i in range(18)]
+        ).split('\n')
+
+        # The whole logo has to fit on screen for the cursor to reach its first lines.
+        # Its lines must not wrap either, or rows would be shifted down.
+        terminal_size = shutil.get_terminal_size()
+        logo_width = max(
+            len(ANSI_ESCAPE_REGEX.sub('', line.partition('\x00')[0])) for line in logo_lines
+        )
+        if not sys.stdout.isatty() \
+                or len(logo_lines) >= terminal_size.lines \
+                or logo_width >= terminal_size.columns:
+            return False
+
+        # Locate the row and the (1-based) column of each result slot.
+        for line_index, line in enumerate(logo_lines):
+            if '\x00' in line:
+                prefix, slot, _ = line.split('\x00')
+                self._rows[int(slot)] = (line_index, len(ANSI_ESCAPE_REGEX.sub('', prefix)) + 1)
+        self._lines_count = len(logo_lines)
+        self._columns = terminal_size.columns
+
+        self._offset = (18 - len(keys)) // 2
+        for index, key in enumerate(keys):
+            self._results.append(
+                self._fit_row(self._offset + index, self._format_entry(key, PLACEHOLDER))
+            )
+
+        self.output()
+        return True
+
+    def stream(self, index, key, value):
+        """
+        Replace in place the row of the `index`-th entry by its new value.
+        The previous frame is remembered, so only the result segment of a changed row is rewritten.
+        """
+        slot = self._offset + index
+        result = self._fit_row(slot, self._format_entry(key, value))
+        if result == self._results[slot]:
+            return
+
+        self._results[slot] = result
+
+        line_index, column = self._rows[slot]
+        lines_up = self._lines_count - line_index
+
+        # Move the cursor up to the result segment, rewrite it, clear its tail and move back down.
+        try:
+            print(
+                '\x1b[{0}A\x1b[{1}G{2}{3}\x1b[K\x1b[{0}B\r'.format(
+                    lines_up,
+                    column,
+                    result,
+                    Colors.CLEAR
+                ),
+                end='', flush=True
+            )
+        except UnicodeError:
+            # This has already been reported when the logo has been rendered.
+            pass
+
+    def _center_results(self):
+        """Let's center the entries according to the logo (handles odd numbers)"""
+        self._results[0:0] = [''] * ((18 - len(self._results)) // 2)
+        self._results.extend([''] * (18 - len(self._results)))
+
+    def _fit_row(self, slot, result):
+        """
+        Truncate `result` to the visible width left to `slot` on the terminal.
+        A wrapped row would overwrite the next logo line, and shift cursor moves.
+        """
+        width = self._columns - self._rows[slot][1] + 1
+
+        truncated, position = '', 0
+        for match in ANSI_ESCAPE_REGEX.finditer(result):
+            # Escape codes are kept, but don't count as visible characters.
+            visible = result[position:match.start()][:max(width, 0)]
+            truncated += visible + match.group()
+            width -= len(visible)
+            position = match.end()
+
+        return truncated + result[position:][:max(width, 0)]
+
+    def _format_entry(self, key, value):
+        """Return the colored `key: value` row of an entry"""
+        return '{color}{key}:{clear} {value}'.format(
+            color=self._colors_palette[0],
+            key=key,
+            clear=Colors.CLEAR,
+            value=value
+        )
+
+
+class JSONOutput:
+    """
+    Machine-readable output, with the same interface as `Output`.
+    Raw entries values (without colors) are printed as a JSON object keyed by entries names.
+    With `streaming`, a JSON object (NDJSON) is printed per entry as soon as it completes.
+    """
+    def __init__(self, streaming=False):
+        self._streaming = streaming
+        self._results = OrderedDict()
+
+    def append(self, key, value):
+        """Append an entry value to the final JSON object"""
+        self._results[key] = self._strip_colors(value)
+
+    def output(self):
+        """Print the final JSON object"""
+        print(json.dumps(self._results))
+
+    def begin_streaming(self, _):
+        """Only NDJSON output can be streamed (nothing has to be printed beforehand)"""
+        return self._streaming
+
+    def stream(self, _, key, value):
+        """Print a JSON object (on its own line) for this entry"""
+        print(json.dumps({key: self._strip_colors(value)}), flush=True)
+
+    @staticmethod
+    def _strip_colors(value):
+        if isinstance(value, str):
+            return ANSI_ESCAPE_REGEX.sub('', value)
+
+        return value
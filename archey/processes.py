@@ -1,40 +1,114 @@
 """Simple class (acting as a singleton) to handle processes listing"""
 
 import os
-import sys
 
-from subprocess import CalledProcessError, DEVNULL, check_output
+from collections import Counter
+from threading import Lock
 
 from archey.singleton import Singleton
 
 
 class Processes(metaclass=Singleton):
-    """At startup, instantiate this class to populate a list of running processes"""
+    """
+    Instantiate this class to (lazily) list running processes names, straight from `/proc`.
+    As `ps` does, only processes of the current (effective) user are listed, unless run as root.
+    """
     def __init__(self):
-        try:
-            self._processes = check_output(
-                [
-                    'ps',
-                    (('-u' + str(os.getuid())) if os.getuid() != 0 else '-ax'),
-                    '-o', 'comm',
-                    '--no-headers'
-                ],
-                universal_newlines=True, stderr=DEVNULL
-            ).splitlines()
-        except CalledProcessError:
-            # The available `ps` implementation may not support passed parameters (hello BusyBox).
-            # Let's fall-back on a much simpler approach.
-            self._processes = check_output(
-                ['ps', '-o', 'comm'],
-                universal_newlines=True
-            ).splitlines()[1:]
-        except FileNotFoundError:
-            print(
-                "Please, install first `procps` on your distribution.",
-                file=sys.stderr
-            )
-            sys.exit(1)
+        self._uid = os.geteuid()
+
+        # Scanning may be shared by concurrently loaded entries, but has to run only once.
+        self._lock = Lock()
+        self._processes = []
+        # Running processes names, along with their number of occurrences.
+        self._index = Counter()
+        self._scanner = self._scan()
 
     def get(self):
-        """Simple getter to retrieve the processes list"""
+        """Simple getter to retrieve the (complete) processes list"""
+        self._scan_all()
         return self._processes
+
+    def get_index(self):
+        """Return the (complete) processes names index, counting their occurrences"""
+        self._scan_all()
+        return self._index
+
+    def match(self, names):
+        """
+        Return the first of (ordered) `names` currently running, or `None`.
+        All candidates are resolved within a single `/proc` sweep, using a hashed lookup.
+        Scanning stops as soon as the first candidate has been found (nothing could beat it).
+        """
+        names = list(names)
+        priorities = {name: rank for rank, name in enumerate(names)}
+
+        with self._lock:
+            best_rank = min(
+                (rank for name, rank in priorities.items() if name in self._index),
+                default=None
+            )
+            if best_rank != 0:
+                for process_name in self._scanner:
+                    self._add(process_name)
+                    rank = priorities.get(process_name)
+                    if rank is not None and (best_rank is None or rank < best_rank):
+                        best_rank = rank
+                        if best_rank == 0:
+                            break
+
+        return names[best_rank] if best_rank is not None else None
+
+    def _scan_all(self):
+        with self._lock:
+            for process_name in self._scanner:
+                self._add(process_name)
+
+    def _add(self, process_name):
+        self._processes.append(process_name)
+        self._index[process_name] += 1
+
+    def _scan(self):
+        """Generator yielding running processes names, as `/proc` is walked through"""
+        # For backward compatibility with Python versions prior to 3.5.0, fall back on `listdir`.
+        list_dir = getattr(os, 'scandir', os.listdir)
+        try:
+            proc_entries = list_dir('/proc')
+        except OSError:
+            return
+
+        # `scandir` iterators hold a directory file descriptor, which may be released (on exit)
+        #   through their context manager since Python 3.6 only.
+        if hasattr(proc_entries, '__exit__'):
+            with proc_entries:
+                yield from self._read_proc_entries(proc_entries)
+        else:
+            yield from self._read_proc_entries(proc_entries)
+
+    def _read_proc_entries(self, proc_entries):
+        for proc_entry in proc_entries:
+            pid = getattr(proc_entry, 'name', proc_entry)
+            if not pid.isdigit():
+                continue
+
+            try:
+                if self._uid != 0 and self._get_process_uid(pid) != self._uid:
+                    continue
+
+                with open('/proc/{0}/comm'.format(pid)) as comm_file:
+                    process_name = comm_file.read().rstrip('\n')
+            except OSError:
+                # This process has exited meanwhile.
+                continue
+
+            yield process_name
+
+    @staticmethod
+    def _get_process_uid(pid):
+        """Return the effective UID of process `pid`, as stated in its `status` file"""
+        with open('/proc/{0}/status'.format(pid)) as status_file:
+            for line in status_file:
+                if line.startswith('Uid:'):
+                    # Fields are : real, effective, saved set and file-system UIDs.
+                    return int(line.split()[2])
+
+        return None
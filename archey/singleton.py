@@ -2,6 +2,7 @@
 
 
 from abc import ABCMeta as AbstractBaseMetaClass
+from threading import RLock
 
 
 class Singleton(AbstractBaseMetaClass):
@@ -11,9 +12,14 @@ class Singleton(AbstractBaseMetaClass):
     This way, we are able to import `Configuration` in multiple modules, ...
     ... whereas it is effectively loaded only once.
     You cannot instantiate this meta-class directly.
+    Instantiation is guarded by a (re-entrant) lock, as entries may be loaded concurrently.
     """
     _instances = {}
+    _lock = RLock()
     def __call__(cls, *args, **kwargs):
         if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
+            with cls._lock:
+                # Another thread may have won the race while we were waiting for the lock.
+                if cls not in cls._instances:
+                    cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
         return cls._instances[cls]
@@ -0,0 +1,264 @@
+"""
+Minimal SMBIOS (DMI) tables parser, a pure-Python alternative to `dmidecode`.
+See <https://www.dmtf.org/standards/smbios> (DSP0134) for the specification.
+"""
+
+import os
+import struct
+
+
+# The kernel exposes raw firmware tables there (only readable by root).
+SMBIOS_TABLES_PATH = '/sys/firmware/dmi/tables'
+
+# Structures types we decode.
+BIOS_TYPE = 0
+SYSTEM_TYPE = 1
+BASEBOARD_TYPE = 2
+CHASSIS_TYPE = 3
+MEMORY_DEVICE_TYPE = 17
+END_OF_TABLE_TYPE = 127
+
+CHASSIS_TYPES = {
+    0x01: 'Other',
+    0x02: 'Unknown',
+    0x03: 'Desktop',
+    0x04: 'Low Profile Desktop',
+    0x05: 'Pizza Box',
+    0x06: 'Mini Tower',
+    0x07: 'Tower',
+    0x08: 'Portable',
+    0x09: 'Laptop',
+    0x0a: 'Notebook',
+    0x0b: 'Hand Held',
+    0x0c: 'Docking Station',
+    0x0d: 'All In One',
+    0x0e: 'Sub Notebook',
+    0x0f: 'Space-saving',
+    0x10: 'Lunch Box',
+    0x11: 'Main Server Chassis',
+    0x12: 'Expansion Chassis',
+    0x13: 'Sub Chassis',
+    0x14: 'Bus Expansion Chassis',
+    0x15: 'Peripheral Chassis',
+    0x16: 'RAID Chassis',
+    0x17: 'Rack Mount Chassis',
+    0x18: 'Sealed-case PC',
+    0x19: 'Multi-system',
+    0x1a: 'CompactPCI',
+    0x1b: 'AdvancedTCA',
+    0x1c: 'Blade',
+    0x1d: 'Blade Enclosure',
+    0x1e: 'Tablet',
+    0x1f: 'Convertible',
+    0x20: 'Detachable',
+    0x21: 'IoT Gateway',
+    0x22: 'Embedded PC',
+    0x23: 'Mini PC',
+    0x24: 'Stick PC'
+}
+
+MEMORY_TYPES = {
+    0x01: 'Other',
+    0x02: 'Unknown',
+    0x03: 'DRAM',
+    0x07: 'RAM',
+    0x0f: 'SDRAM',
+    0x11: 'RDRAM',
+    0x12: 'DDR',
+    0x13: 'DDR2',
+    0x14: 'DDR2 FB-DIMM',
+    0x18: 'DDR3',
+    0x1a: 'DDR4',
+    0x1b: 'LPDDR',
+    0x1c: 'LPDDR2',
+    0x1d: 'LPDDR3',
+    0x1e: 'LPDDR4',
+    0x1f: 'Logical non-volatile device',
+    0x20: 'HBM',
+    0x21: 'HBM2',
+    0x22: 'DDR5',
+    0x23: 'LPDDR5',
+    0x24: 'HBM3'
+}
+
+
+def read_smbios(tables_path=SMBIOS_TABLES_PATH):
+    """
+    Read and decode firmware tables from `tables_path`.
+    Returns `None` when they are not available (or not readable, as a regular user).
+    """
+    try:
+        with open(os.path.join(tables_path, 'smbios_entry_point'), 'rb') as file:
+            entry_point = file.read()
+        with open(os.path.join(tables_path, 'DMI'), 'rb') as file:
+            tables = file.read()
+    except OSError:
+        return None
+
+    smbios = parse_tables(tables)
+    smbios['version'] = parse_entry_point(entry_point)
+    return smbios
+
+
+def parse_entry_point(entry_point):
+    """Return the SMBIOS `(major, minor)` version announced by `entry_point`, or `None`"""
+    if entry_point[:5] == b'_SM3_' and len(entry_point) >= 0x09:
+        return entry_point[0x07], entry_point[0x08]
+    if entry_point[:4] == b'_SM_' and len(entry_point) >= 0x08:
+        return entry_point[0x06], entry_point[0x07]
+
+    return None
+
+
+def parse_tables(tables):
+    """
+    Decode BIOS, system, baseboard, chassis and memory devices structures from raw `tables`.
+    Structures are walked through only once, fields absent from (older) structures are skipped.
+    """
+    smbios = {
+        'bios': {},
+        'system': {},
+        'baseboard': {},
+        'chassis': {},
+        'memory_devices': []
+    }
+
+    offset = 0
+    while offset + 4 <= len(tables):
+        structure_type, length = tables[offset], tables[offset + 1]
+        if length < 4:
+            # Corrupted table, let's not go any further.
+            break
+
+        formatted = tables[offset:offset + length]
+
+        # The formatted area is followed by a set of strings, terminated by a double null byte.
+        strings_end = tables.find(b'\0\0', offset + length)
+        if strings_end == -1:
+            break
+        strings = tables[offset + length:strings_end].split(b'\0')
+
+        if structure_type == END_OF_TABLE_TYPE:
+            break
+
+        if structure_type in _DECODERS:
+            key, decoder = _DECODERS[structure_type]
+            decoded = decoder(_Structure(formatted, strings))
+            if key == 'memory_devices':
+                smbios[key].append(decoded)
+            # Only the first structure of other types is relevant.
+            elif not smbios[key]:
+                smbios[key] = decoded
+
+        offset = strings_end + 2
+
+    return smbios
+
+
+class _Structure:
+    """Helper giving access to fields of a structure, according to its actual length"""
+    def __init__(self, formatted, strings):
+        self._formatted = formatted
+        self._strings = strings
+
+    def byte(self, offset):
+        """Return the byte at `offset`, or `None` if the structure is too short"""
+        if offset + 1 > len(self._formatted):
+            return None
+        return self._formatted[offset]
+
+    def word(self, offset):
+        """Return the (little-endian) word at `offset`, or `None` if the structure is too short"""
+        if offset + 2 > len(self._formatted):
+            return None
+        return struct.unpack_from('<H', self._formatted, offset)[0]
+
+    def dword(self, offset):
+        """Return the (little-endian) double word at `offset`, or `None`"""
+        if offset + 4 > len(self._formatted):
+            return None
+        return struct.unpack_from('<I', self._formatted, offset)[0]
+
+    def string(self, offset):
+        """Return the string referenced (1-based) by the byte at `offset`, or `None`"""
+        index = self.byte(offset)
+        if not index or index > len(self._strings):
+            return None
+        return self._strings[index - 1].decode('ascii', errors='replace').strip() or None
+
+
+def _decode_bios(structure):
+    return {
+        'vendor': structure.string(0x04),
+        'version': structure.string(0x05),
+        'release_date': structure.string(0x08)
+    }
+
+
+def _decode_system(structure):
+    return {
+        'manufacturer': structure.string(0x04),
+        'product_name': structure.string(0x05),
+        'version': structure.string(0x06),
+        'serial_number': structure.string(0x07),
+        'sku_number': structure.string(0x19),
+        'family': structure.string(0x1a)
+    }
+
+
+def _decode_baseboard(structure):
+    return {
+        'manufacturer': structure.string(0x04),
+        'product_name': structure.string(0x05),
+        'version': structure.string(0x06),
+        'serial_number': structure.string(0x07)
+    }
+
+
+def _decode_chassis(structure):
+    chassis_type = structure.byte(0x05)
+    return {
+        'manufacturer': structure.string(0x04),
+        # The most significant bit tells whether a chassis lock is present.
+        'type': CHASSIS_TYPES.get(chassis_type & 0x7f) if chassis_type is not None else None,
+        'version': structure.string(0x06),
+        'serial_number': structure.string(0x07)
+    }
+
+
+def _decode_memory_device(structure):
+    # Size is expressed in MiB (or KiB, when the most significant bit is set).
+    size = structure.word(0x0c)
+    if size in (None, 0xffff):
+        size_mib = None
+    elif size == 0x7fff:
+        # Modules of 32 GiB or more are described by the "extended size" field.
+        extended_size = structure.dword(0x1c)
+        size_mib = (extended_size & 0x7fffffff) if extended_size is not None else None
+    elif size & 0x8000:
+        size_mib = (size & 0x7fff) / 1024
+    else:
+        # `0` means that no module is installed in this slot.
+        size_mib = size
+
+    memory_type = structure.byte(0x12)
+    speed = structure.word(0x15)
+    return {
+        'size': size_mib,
+        'locator': structure.string(0x10),
+        'bank_locator': structure.string(0x11),
+        'type': MEMORY_TYPES.get(memory_type) if memory_type is not None else None,
+        'speed': speed or None,
+        'manufacturer': structure.string(0x17),
+        'part_number': structure.string(0x1a)
+    }
+
+
+# Structures types -> (result key, decoding function).
+_DECODERS = {
+    BIOS_TYPE: ('bios', _decode_bios),
+    SYSTEM_TYPE: ('system', _decode_system),
+    BASEBOARD_TYPE: ('baseboard', _decode_baseboard),
+    CHASSIS_TYPE: ('chassis', _decode_chassis),
+    MEMORY_DEVICE_TYPE: ('memory_devices', _decode_memory_device)
+}
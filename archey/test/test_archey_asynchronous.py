@@ -0,0 +1,73 @@
+"""Test module for `archey.asynchronous`"""
+
+import asyncio
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+from enum import Enum
+
+try:
+    from archey.asynchronous import collect
+except SyntaxError:
+    # Asynchronous generators require Python 3.6 or newer (see below).
+    collect = None  # pylint: disable=invalid-name
+
+
+_SLOW_ENTRY_RELEASE = threading.Event()
+
+
+class _SlowEntry:
+    """A fake entry, which only completes once released"""
+    def __init__(self):
+        _SLOW_ENTRY_RELEASE.wait(5)
+        self.value = 'SLOW'
+
+
+class _FastEntry:
+    """A fake entry, which immediately computes its value"""
+    def __init__(self):
+        self.value = 'FAST'
+
+
+class _FakeEntries(Enum):
+    """A fake `Entries` enumeration"""
+    Slow = _SlowEntry
+    Fast = _FastEntry
+
+
+@unittest.skipIf(
+    sys.version_info < (3, 6),
+    'asynchronous generators require Python 3.6 or newer'
+)
+class TestAsynchronousUtil(unittest.TestCase):
+    """
+    Test cases for the asynchronous entries loading engine.
+    This module has to be parsable by Python 3.4, so the generator is driven "by hand".
+    """
+    @patch('archey.asynchronous.clear_cache')
+    @patch('archey.asynchronous.Processes')
+    def test_collect_completion_order(self, _, clear_cache_mock):
+        """Check that entries are yielded as soon as they complete"""
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        generator = collect(_FakeEntries)
+        self.assertTupleEqual(loop.run_until_complete(generator.__anext__()), ('Fast', 'FAST'))
+
+        # Let the slow entry complete only once the fast one has been yielded.
+        _SLOW_ENTRY_RELEASE.set()
+        self.assertTupleEqual(loop.run_until_complete(generator.__anext__()), ('Slow', 'SLOW'))
+
+        self.assertRaises(
+            StopAsyncIteration,  # pylint: disable=undefined-variable
+            loop.run_until_complete, generator.__anext__()
+        )
+
+        # Commands outputs memoized by previous runs have been forgotten first.
+        clear_cache_mock.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Test module for `archey.cache`"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from archey.cache import Cache
+
+
+class TestCacheUtil(unittest.TestCase):
+    """
+    Test cases for the entries values persistent cache.
+    `XDG_CACHE_HOME` is pointed to a temporary directory, and boot ID is mocked.
+    """
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_file = os.path.join(temp_dir.name, 'archey4', 'entries.json')
+
+        for patcher in (
+                patch.dict('os.environ', {'XDG_CACHE_HOME': temp_dir.name}),
+                patch('archey.cache.Cache._get_boot_id', return_value='BOOT_ID')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.ttls = {'default': 0, 'CPU': 3600, 'Packages': 60}
+
+    def test_persistence(self):
+        """Check values are persisted across instances, according to their TTLs"""
+        cache = Cache(self.ttls, 'DIGEST')
+        self.assertRaises(KeyError, cache.get, 'CPU')
+
+        with patch('archey.cache.time.time', return_value=1000000):
+            cache.set('CPU', 'A CPU')
+            cache.set('Packages', 42)
+            cache.set('RAM', 'RAM is never cached')
+            cache.save()
+        self.assertTrue(os.path.isfile(self.cache_file))
+
+        cache = Cache(self.ttls, 'DIGEST')
+        with patch('archey.cache.time.time', return_value=1000000 + 30):
+            self.assertEqual(cache.get('CPU'), 'A CPU')
+            self.assertEqual(cache.get('Packages'), 42)
+            self.assertRaises(KeyError, cache.get, 'RAM')
+
+        # Two minutes later, only `Packages` expired.
+        with patch('archey.cache.time.time', return_value=1000000 + 120):
+            self.assertEqual(cache.get('CPU'), 'A CPU')
+            self.assertRaises(KeyError, cache.get, 'Packages')
+
+    def test_fingerprint(self):
+        """Check that fingerprinted values are kept until their fingerprint changes"""
+        cache = Cache(self.ttls, 'DIGEST')
+        with patch('archey.cache.time.time', return_value=1000000):
+            cache.set('Packages', 42, fingerprint=[[1234, 56, 789]])
+            cache.save()
+
+        cache = Cache(self.ttls, 'DIGEST')
+        # Way after `Packages` TTL, the fingerprint still matches (after a JSON round-trip).
+        with patch('archey.cache.time.time', return_value=1000000 + 3600):
+            self.assertEqual(cache.get('Packages', fingerprint=[[1234, 56, 789]]), 42)
+            self.assertRaises(KeyError, cache.get, 'Packages', fingerprint=[[1235, 56, 789]])
+            # Without any fingerprint, TTL still applies.
+            self.assertRaises(KeyError, cache.get, 'Packages')
+
+    def test_refresh(self):
+        """Check that previous values are ignored when refreshing"""
+        cache = Cache(self.ttls, 'DIGEST')
+        cache.set('CPU', 'A CPU')
+        cache.save()
+
+        self.assertRaises(KeyError, Cache(self.ttls, 'DIGEST', refresh=True).get, 'CPU')
+
+    def test_reboot_invalidation(self):
+        """Check that values cached during a previous boot are discarded"""
+        cache = Cache(self.ttls, 'DIGEST')
+        cache.set('CPU', 'A CPU')
+        cache.save()
+
+        with patch('archey.cache.Cache._get_boot_id', return_value='ANOTHER_BOOT_ID'):
+            self.assertRaises(KeyError, Cache(self.ttls, 'DIGEST').get, 'CPU')
+
+    def test_configuration_invalidation(self):
+        """Check that values cached with another configuration are discarded"""
+        cache = Cache(self.ttls, 'DIGEST')
+        cache.set('CPU', 'A CPU')
+        cache.save()
+
+        self.assertRaises(KeyError, Cache(self.ttls, 'ANOTHER_DIGEST').get, 'CPU')
+
+    def test_corrupted_file(self):
+        """Check that a corrupted cache file is simply ignored"""
+        os.makedirs(os.path.dirname(self.cache_file))
+        with open(self.cache_file, 'w') as file:
+            file.write('{not JSON')
+
+        self.assertRaises(KeyError, Cache(self.ttls, 'DIGEST').get, 'CPU')
+
+
+if __name__ == '__main__':
+    unittest.main()
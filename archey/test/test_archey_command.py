@@ -0,0 +1,189 @@
+"""Test module for `archey.command`"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from subprocess import CalledProcessError, TimeoutExpired
+from unittest.mock import patch
+
+from archey.command import check_output, clear_cache, deadline, get_deadline
+
+
+class TestCommandUtil(unittest.TestCase):
+    """Test cases for our sub-processes execution layer"""
+    def setUp(self):
+        # Don't let memoized results leak between test cases.
+        clear_cache()
+        self.addCleanup(clear_cache)
+
+    def test_check_output(self):
+        """Check `check_output` behaves as its `subprocess` counterpart"""
+        self.assertEqual(
+            check_output(
+                [sys.executable, '-c', 'print("Hello")'],
+                universal_newlines=True
+            ),
+            'Hello\n'
+        )
+        self.assertRaises(
+            CalledProcessError,
+            check_output, [sys.executable, '-c', 'exit(1)']
+        )
+        self.assertRaises(
+            FileNotFoundError,
+            check_output, ['a-binary-which-does-not-exist']
+        )
+        self.assertRaises(
+            TimeoutExpired,
+            check_output, [sys.executable, '-c', 'import time; time.sleep(5)'],
+            timeout=0.1
+        )
+        self.assertRaises(
+            TypeError,
+            check_output, [sys.executable, '-c', 'exit(0)'],
+            cwd='/'
+        )
+
+    def test_deadline(self):
+        """Check that commands are bounded by the current deadline"""
+        with deadline(time.monotonic() + 0.2):
+            start_time = time.monotonic()
+            self.assertRaises(
+                TimeoutExpired,
+                check_output, [sys.executable, '-c', 'import time; time.sleep(5)'],
+                timeout=10
+            )
+            self.assertLess(time.monotonic() - start_time, 2)
+
+            # The deadline has expired, no process should be spawned anymore.
+            self.assertRaises(
+                TimeoutExpired,
+                check_output, ['a-binary-which-does-not-exist']
+            )
+
+        # Out of the context, the deadline is not enforced anymore.
+        self.assertRaises(
+            FileNotFoundError,
+            check_output, ['a-binary-which-does-not-exist']
+        )
+
+    def test_get_deadline(self):
+        """Check the current deadline is exposed, but only to its own thread"""
+        self.assertIsNone(get_deadline())
+        with deadline(42):
+            self.assertEqual(get_deadline(), 42)
+
+            worker_deadlines = []
+            worker = threading.Thread(target=lambda: worker_deadlines.append(get_deadline()))
+            worker.start()
+            worker.join()
+            self.assertListEqual(worker_deadlines, [None])
+
+        self.assertIsNone(get_deadline())
+
+    def test_process_group_kill(self):
+        """Check that grand-children are killed too when a deadline is missed"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pid_file = os.path.join(temp_dir, 'pid')
+
+            with deadline(time.monotonic() + 0.5):
+                self.assertRaises(
+                    TimeoutExpired,
+                    check_output, [
+                        'sh', '-c',
+                        'sleep 5 & echo $! > {0}; wait'.format(pid_file)
+                    ]
+                )
+
+            with open(pid_file) as file:
+                grand_child_pid = int(file.read())
+
+        # The grand-child has been killed (and reaped by `init`, or left as a zombie).
+        for _ in range(50):
+            try:
+                with open('/proc/{0}/stat'.format(grand_child_pid)) as file:
+                    if file.read().split()[2] == 'Z':
+                        break
+            except FileNotFoundError:
+                break
+            time.sleep(0.1)
+        else:
+            self.fail('Grand-child process is still running')
+
+    def test_memoization(self):
+        """Check that a command is only run once per `args` and `env`"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            counter_file = os.path.join(temp_dir, 'counter')
+            command = ['sh', '-c', 'echo "$VALUE" >> {0}; echo "$VALUE"'.format(counter_file)]
+
+            for _ in range(3):
+                self.assertEqual(
+                    check_output(command, env={'VALUE': 'A'}, universal_newlines=True),
+                    'A\n'
+                )
+            self.assertEqual(
+                check_output(command, env={'VALUE': 'B'}, universal_newlines=True),
+                'B\n'
+            )
+
+            with open(counter_file) as file:
+                self.assertEqual(file.read(), 'A\nB\n')
+
+            # Once the cache has been cleared, the command is run again.
+            clear_cache()
+            check_output(command, env={'VALUE': 'A'}, universal_newlines=True)
+            with open(counter_file) as file:
+                self.assertEqual(file.read(), 'A\nB\nA\n')
+
+    def test_errors_memoization(self):
+        """Check that missing binaries and failing commands are not run again"""
+        with patch('archey.command.Popen', side_effect=FileNotFoundError()) as popen_mock:
+            for _ in range(2):
+                self.assertRaises(
+                    FileNotFoundError,
+                    check_output, ['a-binary-which-does-not-exist']
+                )
+            popen_mock.assert_called_once()
+
+        command = [sys.executable, '-c', 'exit(42)']
+        self.assertRaises(CalledProcessError, check_output, command)
+        with patch('archey.command.Popen') as popen_mock:
+            with self.assertRaises(CalledProcessError) as context:
+                check_output(command)
+            self.assertEqual(context.exception.returncode, 42)
+            popen_mock.assert_not_called()
+
+        # Timed out commands are not memoized though.
+        command = [sys.executable, '-c', 'import time; time.sleep(5)']
+        self.assertRaises(TimeoutExpired, check_output, command, timeout=0.1)
+        with patch('archey.command.Popen', side_effect=FileNotFoundError()) as popen_mock:
+            self.assertRaises(FileNotFoundError, check_output, command)
+            popen_mock.assert_called_once()
+
+    def test_in_flight_deduplication(self):
+        """Check that concurrent identical calls share a single child process"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            counter_file = os.path.join(temp_dir, 'counter')
+            command = ['sh', '-c', 'echo run >> {0}; sleep 0.3; echo done'.format(counter_file)]
+
+            outputs = []
+            threads = [
+                threading.Thread(target=lambda: outputs.append(check_output(command)))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertListEqual(outputs, [b'done\n'] * 4)
+            with open(counter_file) as file:
+                self.assertEqual(file.read(), 'run\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
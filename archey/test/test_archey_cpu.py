@@ -1,85 +1,165 @@
 """Test module for Archey's CPU detection module"""
 
+import os
+import tempfile
 import unittest
-from unittest.mock import mock_open, patch
+from unittest.mock import patch
 
 from archey.entries.cpu import CPU
 
 
 class TestCPUEntry(unittest.TestCase):
     """
-    Here, we mock the `open` call on `/proc/cpuinfo` with fake content.
+    Here, we mock `/proc/cpuinfo` lines (read through a fresh `Facts` singleton instance).
+    `sysfs` CPU directory is faked within a temporary directory (empty by default).
     """
-    @patch(
-        'archey.entries.cpu.open',
-        mock_open(
-            read_data="""\
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self._cpu_sysfs_path = temp_dir.name
+
+        for patcher in (
+                patch.dict('archey.singleton.Singleton._instances', clear=True),
+                patch('archey.entries.cpu.CPU_SYSFS_PATH', self._cpu_sysfs_path)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _mock_cpuinfo(self, cpuinfo):
+        patcher = patch(
+            'archey.facts.Facts._read_cpuinfo',
+            side_effect=lambda: (line for line in cpuinfo.splitlines(True))
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _write_sysfs_file(self, path, content):
+        path = os.path.join(self._cpu_sysfs_path, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(content + '\n')
+
+    def test_model_name_match_cpuinfo(self):
+        """Test `/proc/cpuinfo` parsing"""
+        self._mock_cpuinfo("""\
 processor\t: 0
 vendor_id\t: CPU-VENDOR-NAME
 cpu family\t: X
 model\t\t: YY
 model name\t: CPU-MODEL-NAME
-"""),
-        create=True
-    )
-    def test_model_name_match_cpuinfo(self):
-        """Test `/proc/cpuinfo` parsing"""
+""")
         self.assertEqual(CPU().value, 'CPU-MODEL-NAME')
 
-    @patch(
-        'archey.entries.cpu.open',
-        mock_open(
-            read_data="""\
+    def test_model_name_match_midr(self):
+        """
+        Test model name resolution from `MIDR_EL1` register.
+
+        See issue #29 (ARM architectures).
+        `/proc/cpuinfo` will not contain `model name` info.
+        """
+        self._mock_cpuinfo("""\
 processor\t: 0
-vendor_id\t: CPU-VENDOR-NAME
-cpu family\t: X
-model\t\t: YY
-"""),
-        create=True
-    )
+BogoMIPS\t: 108.00
+Features\t: fp asimd evtstrm crc32 cpuid
+CPU implementer\t: 0x41
+CPU architecture: 8
+CPU variant\t: 0x0
+CPU part\t: 0xd08
+CPU revision\t: 3
+""")
+        self._write_sysfs_file('cpu0/regs/identification/midr_el1', '0x00000000410fd083')
+        self.assertEqual(CPU().value, 'ARM Cortex-A72')
+
+    def test_model_name_match_cpuinfo_midr_fields(self):
+        """Test model name resolution from `/proc/cpuinfo` implementer and part fields"""
+        self._mock_cpuinfo("""\
+processor\t: 0
+model name\t:
+BogoMIPS\t: 38.40
+CPU implementer\t: 0x51
+CPU architecture: 7
+CPU variant\t: 0x7
+CPU part\t: 0x805
+CPU revision\t: 14
+""")
+        self.assertEqual(CPU().value, 'Qualcomm Kryo 4XX Silver')
+
     @patch(
         'archey.entries.cpu.check_output',
         return_value="""\
-Architecture:        x86_64
-CPU op-mode(s):      32-bit, 64-bit
+Architecture:        ppc64le
 Byte Order:          Little Endian
 CPU(s):              4
 On-line CPU(s) list: 0-3
-Thread(s) per core:  X
-Core(s) per socket:  Y
-Socket(s):           1
-NUMA node(s):        1
-Vendor ID:           CPU-VENDOR-NAME
-CPU family:          Z
-Model:               \xde\xad\xbe\xef
 Model name:          CPU-MODEL-NAME-WITHOUT-PROC-CPUINFO
-""")
+Model:               2.2 (pvr 004e 1202)
+"""
+    )
     def test_model_name_match_lscpu(self, _):
         """
-        Test model name parsing from `lscpu` output.
+        Test model name parsing from `lscpu` output, as a last resort.
 
-        See issue #29 (ARM architectures).
-        `/proc/cpuinfo` will not contain `model name` info.
-        `lscpu` output will be used instead.
+        `/proc/cpuinfo` contains neither `model name` nor ARM `MIDR` fields.
         """
+        self._mock_cpuinfo("""\
+processor\t: 0
+cpu\t\t: POWER9 (raw), altivec supported
+revision\t: 2.2 (pvr 004e 1202)
+""")
         self.assertEqual(CPU().value, 'CPU-MODEL-NAME-WITHOUT-PROC-CPUINFO')
 
     @patch(
-        'archey.entries.cpu.open',
-        mock_open(
-            read_data="""\
+        'archey.entries.cpu.check_output',
+        side_effect=FileNotFoundError()
+    )
+    @patch(
+        'archey.entries.cpu.Configuration.get',
+        return_value={'not_detected': 'Not detected'}
+    )
+    def test_not_detected(self, _, __):
+        """Test when the model name can't be resolved at all"""
+        self._mock_cpuinfo("""\
+processor\t: 0
+CPU implementer\t: 0x00
+CPU part\t: 0x000
+""")
+        self.assertEqual(CPU().value, 'Not detected')
+
+    def test_spaces_squeezing(self):
+        """Test name sanitizing, needed on some platformd"""
+        self._mock_cpuinfo("""\
 processor\t: 0
 vendor_id\t: CPU-VENDOR-NAME
 cpu family\t: X
 model\t\t: YY
 model name\t: CPU  MODEL\t  NAME
-"""),
-        create=True
-    )
-    def test_spaces_squeezing(self):
-        """Test name sanitizing, needed on some platformd"""
+""")
         self.assertEqual(CPU().value, 'CPU MODEL NAME')
 
+    def test_topology(self):
+        """Test sockets, cores and threads counting from `sysfs`"""
+        self._mock_cpuinfo('model name\t: CPU-MODEL-NAME\n')
+
+        # Two sockets of two cores each, with SMT (but an offline CPU).
+        for cpu, (package_id, core_id) in enumerate([
+                (0, 0), (0, 1), (1, 0), (1, 1),
+                (0, 0), (0, 1), (1, 0), (1, 1)]):
+            topology_path = 'cpu{0}/topology'.format(cpu)
+            self._write_sysfs_file(topology_path + '/physical_package_id', str(package_id))
+            self._write_sysfs_file(topology_path + '/core_id', str(core_id))
+        os.makedirs(os.path.join(self._cpu_sysfs_path, 'cpu8'))
+
+        self.assertEqual(CPU().value, 'CPU-MODEL-NAME (2S/4C/8T)')
+
+    def test_topology_single_socket(self):
+        """Test that sockets count is only displayed when there are many"""
+        self._mock_cpuinfo('model name\t: CPU-MODEL-NAME\n')
+
+        for cpu in range(4):
+            self._write_sysfs_file('cpu{0}/topology/physical_package_id'.format(cpu), '0')
+            self._write_sysfs_file('cpu{0}/topology/core_id'.format(cpu), str(cpu))
+
+        self.assertEqual(CPU().value, 'CPU-MODEL-NAME (4C/4T)')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,71 @@
+"""Test module for `archey.daemon`"""
+
+import os
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from archey.configuration import Configuration
+from archey.daemon import Daemon, fetch_values
+from archey.entries import Entries
+
+
+class TestDaemonUtil(unittest.TestCase):
+    """Test cases for the `archeyd` daemon, and its client"""
+    @patch(
+        'archey.daemon.Entries.enabled',
+        return_value=[Entries.User, Entries.Kernel, Entries.Packages]
+    )
+    @patch(
+        'archey.daemon.get_entry_value',
+        side_effect=lambda entry: 'VALUE_' + entry.name
+    )
+    @patch('archey.daemon.Facts')
+    def test_serve_values(self, facts_mock, get_entry_value_mock, _):
+        """Check that host-wide values are served to clients"""
+        configuration_digest = Configuration().get_digest()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            socket_path = os.path.join(temp_dir, 'run', 'archeyd.sock')
+
+            # No daemon is listening yet.
+            self.assertIsNone(fetch_values(socket_path, configuration_digest))
+
+            daemon = Daemon(socket_path, refresh_interval=0.05)
+            server_thread = threading.Thread(target=daemon.serve_forever)
+            server_thread.start()
+            try:
+                for _ in range(50):
+                    if os.path.exists(socket_path):
+                        break
+                    time.sleep(0.05)
+
+                # Any local user may connect.
+                self.assertEqual(stat.S_IMODE(os.stat(socket_path).st_mode), 0o666)
+
+                # `User` is a client-side entry, it's never computed by the daemon.
+                self.assertDictEqual(
+                    fetch_values(socket_path, configuration_digest),
+                    {'Kernel': 'VALUE_Kernel', 'Packages': 'VALUE_Packages'}
+                )
+                # Values computed with another configuration are ignored.
+                self.assertIsNone(fetch_values(socket_path, 'ANOTHER_DIGEST'))
+
+                # Values are periodically refreshed.
+                time.sleep(0.2)
+                self.assertGreater(get_entry_value_mock.call_count, 2)
+                # ... along with system facts.
+                self.assertGreater(facts_mock.return_value.clear.call_count, 1)
+            finally:
+                daemon.shutdown()
+                server_thread.join()
+
+            # The socket file has been removed on shutdown.
+            self.assertFalse(os.path.exists(socket_path))
+            self.assertIsNone(fetch_values(socket_path, configuration_digest))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,29 +10,35 @@ class TestDesktopEnvironmentEntry(unittest.TestCase):
     """
     With the help of a fake running processes list, we test the DE matching.
     """
+    def setUp(self):
+        # Each test case gets its own (fake) `Processes` singleton instance.
+        patcher = patch.dict('archey.singleton.Singleton._instances', clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     @patch(
-        'archey.entries.desktop_environment.Processes.get',
-        return_value=[  # Fake running processes list
+        'archey.entries.desktop_environment.Processes._scan',
+        return_value=iter([  # Fake running processes list
             'do',
             'you',
             'like',
             'cinnamon',  # Match !
             'tea'
-        ]
+        ])
     )
     def test_match(self, _):
         """Simple list matching"""
         self.assertEqual(DesktopEnvironment().value, 'Cinnamon')
 
     @patch(
-        'archey.entries.desktop_environment.Processes.get',
-        return_value=[  # Fake running processes list
+        'archey.entries.desktop_environment.Processes._scan',
+        return_value=iter([  # Fake running processes list
             'do',
             'you',
             'like',
             'unsweetened',  # Mismatch...
             'coffee'
-        ]
+        ])
     )
     @patch(
         'archey.entries.desktop_environment.os.getenv',
@@ -1,9 +1,11 @@
 """Test module for Archey's disks usage detection module"""
 
+import os
+import tempfile
 from subprocess import CalledProcessError
 
 import unittest
-from unittest.mock import patch
+from unittest.mock import mock_open, patch
 
 from archey.colors import Colors
 from archey.entries.disk import Disk
@@ -11,21 +13,80 @@ from archey.entries.disk import Disk
 
 class TestDiskEntry(unittest.TestCase):
     """
-    Here, we mock `check_output` calls to disk utility tools.
+    Here, we mock `check_output` calls to `df` and `statvfs` calls.
+    By default, `/proc/self/mountinfo` is considered unavailable (`df` is used instead).
+    btrfs `sysfs` tree is faked within a temporary directory (empty by default).
     """
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.btrfs_sysfs_path = temp_dir.name
+
+        get_mounts_patcher = patch('archey.entries.disk.Disk._get_mounts', return_value=None)
+        self._get_mounts_mock = get_mounts_patcher.start()
+        self.addCleanup(get_mounts_patcher.stop)
+
+        sysfs_patcher = patch('archey.entries.disk.BTRFS_SYSFS_PATH', self.btrfs_sysfs_path)
+        sysfs_patcher.start()
+        self.addCleanup(sysfs_patcher.stop)
+
+    def _create_btrfs_fs(self, fs_uuid, devices_sizes, allocation):
+        """
+        Fake `/sys/fs/btrfs/<fs_uuid>/` with devices of `devices_sizes` (GiB).
+        `allocation` maps (type, profile) couples to (logical) `(total, used)` GiB.
+        """
+        def write_attribute(path, value):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as file:
+                file.write('{0}\n'.format(value))
+
+        fs_path = os.path.join(self.btrfs_sysfs_path, fs_uuid)
+        for index, device_size in enumerate(devices_sizes):
+            write_attribute(
+                os.path.join(fs_path, 'devices', 'sd' + chr(ord('a') + index), 'size'),
+                int(device_size * 1024 ** 3 / 512)
+            )
+
+        for (block_group_type, profile), (total, used) in allocation.items():
+            type_path = os.path.join(fs_path, 'allocation', block_group_type)
+            write_attribute(os.path.join(type_path, 'bytes_used'), 0)  # A type-wide attribute.
+            write_attribute(os.path.join(type_path, profile, 'total_bytes'), int(total * 1024 ** 3))
+            write_attribute(os.path.join(type_path, profile, 'used_bytes'), int(used * 1024 ** 3))
+
+    def _create_btrfs_filesystems(self, raid1=False):
+        """Fake two btrfs file-systems, the second one with a single or RAID1 profile"""
+        self._create_btrfs_fs(
+            '01234567-89ab-cdef-0123-456789abcdef',
+            [476.44],
+            {
+                ('data', 'single'): (429.01, 350.85),
+                ('metadata', 'single'): (3.01, 1.28),
+                ('system', 'single'): (0.004, 0.0)
+            }
+        )
+
+        profile = 'raid1' if raid1 else 'single'
+        self._create_btrfs_fs(
+            'fedcba98-7654-3210-fedc-ba9876543210',
+            [3726.02, 3726.02] if raid1 else [3726.02],
+            {
+                ('data', profile): (590.00, 589.95),
+                ('metadata', profile): (2.00, 1.32),
+                ('system', profile): (0.01, 0.0)
+            }
+        )
+        # Let's add some noise too.
+        os.makedirs(os.path.join(self.btrfs_sysfs_path, 'features'))
+
     @patch(
         'archey.entries.disk.check_output',
-        side_effect=[
-            """\
+        return_value="""\
 Filesystem       1000000-blocks    Used Available Capacity Mounted on
 /dev/mapper/root        39101MB 14216MB   22870MB      39% /
 /dev/sda1                 967MB    91MB     810MB      11% /boot
 /dev/mapper/home       265741MB 32700MB  219471MB      13% /home
 total                  305809MB 47006MB  243149MB      17% -
-""",
-            # Second `df` call will fail.
-            CalledProcessError(1, 'df', "df: no file systems processed\n")
-        ]
+"""
     )
     @patch(
         'archey.entries.disk.Configuration.get',
@@ -43,17 +104,13 @@ total                  305809MB 47006MB  243149MB      17% -
 
     @patch(
         'archey.entries.disk.check_output',
-        side_effect=[
-            """\
+        return_value="""\
 Filesystem       1000000-blocks     Used Available Capacity Mounted on
 /dev/mapper/root        39101MB  14216MB   22870MB      39% /
 /dev/sda1                 967MB     91MB     810MB      11% /boot
 /dev/mapper/home       265741MB 243291MB   22450MB      92% /home
 total                  305809MB 257598MB   46130MB      84% -
-""",
-            # Second `df` call will fail.
-            CalledProcessError(1, 'df', "df: no file systems processed\n")
-        ]
+"""
     )
     @patch(
         'archey.entries.disk.Configuration.get',
@@ -71,71 +128,13 @@ total                  305809MB 257598MB   46130MB      84% -
 
     @patch(
         'archey.entries.disk.check_output',
-        side_effect=[
-            """\
+        return_value="""\
 Filesystem       1000000-blocks    Used Available Capacity Mounted on
 /dev/mapper/root        39101MB 14216MB   22870MB      39% /
 /dev/sda1                 967MB    91MB     810MB      11% /boot
 /dev/mapper/home       265741MB 32700MB  219471MB      13% /home
 total                  305809MB 47006MB  243149MB      17% -
-""",
-            """\
-Mounted on
-/
-/vol
-""",
-            """\
-/dev/nvme0n1p1, ID: 1
-   Device size:               0.00B
-   Device slack:              0.00B
-   Unallocated:           476.44GiB
-
-""",
-            """\
-/dev/sda1, ID: 1
-   Device size:               0.00B
-   Device slack:              0.00B
-   Unallocated:             3.64TiB
-
-""",
-            """\
-Overall:
-    Device size:                         476.44GiB
-    Device allocated:                    432.02GiB
-    Device unallocated:                   44.42GiB
-    Device missing:                      476.44GiB
-    Used:                                352.13GiB
-    Free (estimated):                    122.57GiB      (min: 122.57GiB)
-    Data ratio:                               1.00
-    Metadata ratio:                           1.00
-    Global reserve:                        0.43GiB      (used: 0.00GiB)
-
-Data,single: Size:429.01GiB, Used:350.85GiB (81.78%)
-
-Metadata,single: Size:3.01GiB, Used:1.28GiB (42.56%)
-
-System,single: Size:0.00GiB, Used:0.00GiB (1.95%)
-
-
-Overall:
-    Device size:                        3726.02GiB
-    Device allocated:                    592.01GiB
-    Device unallocated:                 3134.02GiB
-    Device missing:                     3726.02GiB
-    Used:                                591.27GiB
-    Free (estimated):                   1567.03GiB      (min: 1567.03GiB)
-    Data ratio:                               1.00
-    Metadata ratio:                           1.00
-    Global reserve:                        0.50GiB      (used: 0.00GiB)
-
-Data,single: Size:590.00GiB, Used:589.95GiB (99.99%)
-
-Metadata,single: Size:2.00GiB, Used:1.32GiB (66.16%)
-
-System,single: Size:0.01GiB, Used:0.00GiB (1.03%)
-
 """
-        ]
     )
     @patch(
         'archey.entries.disk.Configuration.get',
@@ -147,76 +146,15 @@ System,single: Size:0.01GiB, Used:0.00GiB (1.03%)
         }
     )
     def test_df_and_btrfs(self, _, __):
-        """Test computations around `df` and `btrfs` outputs"""
+        """Test computations around `df` output and btrfs `sysfs` attributes"""
+        self._create_btrfs_filesystems()
+
         disk = Disk().value
         self.assertTrue(all(i in disk for i in [str(Colors.GREEN_NORMAL), '989.3', '4501.1']))
 
     @patch(
         'archey.entries.disk.check_output',
-        side_effect=[
-            CalledProcessError(1, 'df', "df: no file systems processed\n"),
-            """\
-Mounted on
-/
-/vol
-""",
-            """\
-/dev/nvme0n1p1, ID: 1
-   Device size:               0.00B
-   Device slack:              0.00B
-   Unallocated:           476.44GiB
-
-""",
-            """\
-/dev/sda1, ID: 1
-   Device size:               0.00B
-   Device slack:              0.00B
-   Unallocated:             3.64TiB
-
-/dev/sdb1, ID: 2
-   Device size:               0.00B
-   Device slack:              0.00B
-   Unallocated:             3.64TiB
-
-""",
-            """\
-Overall:
-    Device size:                         476.44GiB
-    Device allocated:                    432.02GiB
-    Device unallocated:                   44.42GiB
-    Device missing:                      476.44GiB
-    Used:                                352.13GiB
-    Free (estimated):                    122.57GiB      (min: 122.57GiB)
-    Data ratio:                               1.00
-    Metadata ratio:                           1.00
-    Global reserve:                        0.43GiB      (used: 0.00GiB)
-
-Data,single: Size:429.01GiB, Used:350.85GiB (81.78%)
-
-Metadata,single: Size:3.01GiB, Used:1.28GiB (42.56%)
-
-System,single: Size:0.00GiB, Used:0.00GiB (1.95%)
-
-
-Overall:
-    Device size:                        7452.04GiB
-    Device allocated:                   1184.02GiB
-    Device unallocated:                 6268.03GiB
-    Device missing:                     7452.04GiB
-    Used:                               1182.54GiB
-    Free (estimated):                   3134.06GiB      (min: 3134.06GiB)
-    Data ratio:                               2.00
-    Metadata ratio:                           2.00
-    Global reserve:                        0.50GiB      (used: 0.00GiB)
-
-Data,RAID1: Size:590.00GiB, Used:589.95GiB
-
-Metadata,RAID1: Size:2.00GiB, Used:1.32GiB
-
-System,RAID1: Size:0.01GiB, Used:0.00GiB
-
-"""
-        ]
+        side_effect=CalledProcessError(1, 'df', "df: no file systems processed\n")
     )
     @patch(
         'archey.entries.disk.Configuration.get',
@@ -228,16 +166,24 @@ System,RAID1: Size:0.01GiB, Used:0.00GiB
         }
     )
     def test_btrfs_only_with_raid_configuration(self, _, __):
-        """Test computations around `btrfs` outputs with a RAID-1 setup"""
+        """Test computations around btrfs `sysfs` attributes with a RAID-1 setup"""
+        self._create_btrfs_filesystems(raid1=True)
+
         disk = Disk().value
         self.assertTrue(all(i in disk for i in [str(Colors.GREEN_NORMAL), '943.4', '4202.5']))
 
+    def test_btrfs_profile_ratio(self):
+        """Test physical/logical ratios of btrfs profiles"""
+        # pylint: disable=protected-access
+        self.assertEqual(Disk._get_btrfs_profile_ratio('dup', 1), 2)
+        self.assertEqual(Disk._get_btrfs_profile_ratio('raid1c3', 3), 3)
+        self.assertEqual(Disk._get_btrfs_profile_ratio('raid5', 4), 4 / 3)
+        self.assertEqual(Disk._get_btrfs_profile_ratio('raid6', 4), 2)
+        self.assertIsNone(Disk._get_btrfs_profile_ratio('bytes_used', 1))
+
     @patch(
         'archey.entries.disk.check_output',
-        side_effect=[
-            CalledProcessError(1, 'df', "df: unrecognized option: l\n"),
-            CalledProcessError(1, 'df', "df: unrecognized option: l\n")
-        ]
+        side_effect=CalledProcessError(1, 'df', "df: unrecognized option: l\n")
     )
     @patch(
         'archey.entries.disk.Configuration.get',
@@ -249,10 +195,7 @@ System,RAID1: Size:0.01GiB, Used:0.00GiB
 
     @patch(
         'archey.entries.disk.check_output',
-        side_effect=[
-            CalledProcessError(1, 'df', "df: no file systems processed\n"),
-            CalledProcessError(1, 'df', "df: no file systems processed\n")
-        ]
+        side_effect=CalledProcessError(1, 'df', "df: no file systems processed\n")
     )
     @patch(
         'archey.entries.disk.Configuration.get',
@@ -262,6 +205,69 @@ System,RAID1: Size:0.01GiB, Used:0.00GiB
         """Test df failing to detect any valid file-systems"""
         self.assertEqual(Disk().value, 'Not detected')
 
+    @patch('archey.entries.disk.check_output')
+    @patch(
+        'archey.entries.disk.os.statvfs',
+        side_effect=lambda mount_point: {
+            '/': os.statvfs_result((4096, 4096, 9546131, 6075569, 5583545, 0, 0, 0, 0, 255)),
+            '/home': os.statvfs_result((4096, 4096, 64878174, 56894701, 53581617, 0, 0, 0, 0, 255)),
+        }[mount_point]
+    )
+    @patch(
+        'archey.entries.disk.Configuration.get',
+        return_value={
+            'disk': {
+                'warning': 50,
+                'danger': 75
+            }
+        }
+    )
+    def test_statvfs(self, _, statvfs_mock, check_output_mock):
+        """Test usage computations from `statvfs`, and devices de-duplication"""
+        self._get_mounts_mock.return_value = [
+            ('254:1', 'ext4', '/'),
+            ('0:21', 'proc', '/proc'),
+            ('0:45', 'overlay', '/var/lib/docker/overlay2/0123456789/merged'),
+            ('254:2', 'ext4', '/home'),
+            ('254:1', 'ext4', '/srv'),  # Bind mount of `/` sub-directory.
+        ]
+
+        disk = Disk().value
+        self.assertTrue(all(i in disk for i in [str(Colors.GREEN_NORMAL), '45.8', '297.7']))
+        self.assertEqual(statvfs_mock.call_count, 2)
+
+        # Not any process should have been spawned.
+        check_output_mock.assert_not_called()
+
+
+class TestDiskMountsUtil(unittest.TestCase):
+    """Test cases for mounted file-systems listing"""
+    def test_get_mounts(self):
+        """Test `/proc/self/mountinfo` parsing"""
+        with patch(
+                'archey.entries.disk.open',
+                mock_open(read_data="""\
+22 1 254:1 / / rw,relatime shared:1 - ext4 /dev/mapper/root rw
+23 22 0:21 / /proc rw,nosuid,nodev,noexec,relatime shared:5 - proc proc rw
+24 22 8:1 / /boot rw,relatime shared:30 master:2 - vfat /dev/sda1 rw,fmask=0022
+25 22 254:1 /srv /mnt/my\\040data rw,relatime - ext4 /dev/mapper/root rw
+26 22 0:42 / /weird rw - unknown
+"""),
+                create=True):
+            self.assertListEqual(
+                Disk._get_mounts(),  # pylint: disable=protected-access
+                [
+                    ('254:1', 'ext4', '/'),
+                    ('0:21', 'proc', '/proc'),
+                    ('8:1', 'vfat', '/boot'),
+                    ('254:1', 'ext4', '/mnt/my data'),
+                    ('0:42', 'unknown', '/weird')
+                ]
+            )
+
+        with patch('archey.entries.disk.open', side_effect=PermissionError(), create=True):
+            self.assertIsNone(Disk._get_mounts())  # pylint: disable=protected-access
+
 
 if __name__ == '__main__':
     unittest.main()
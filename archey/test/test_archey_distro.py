@@ -1,5 +1,6 @@
 """Test module for Archey's distribution detection module"""
 
+import os
 import unittest
 from unittest.mock import patch
 
@@ -7,19 +8,18 @@ from archey.entries.distro import Distro
 
 
 class TestDistroEntry(unittest.TestCase):
-    """We mock the `distro` vendor module call, as long as the `check_output` one"""
+    """We mock the `distro` vendor module call, as long as the shared `uname` facts"""
     @patch(
         'archey.entries.distro.distro.name',  # `distro.name` output
         return_value="""\
 NAME VERSION (CODENAME)\
 """)
     @patch(
-        'archey.entries.distro.check_output',  # `uname` output
-        return_value="""\
-ARCHITECTURE
-""")
+        'archey.entries.distro.Facts.get_uname',  # `uname` facts
+        return_value=os.uname_result(('Linux', 'HOSTNAME', 'X.Y.Z-R-arch', '#1', 'ARCHITECTURE'))
+    )
     def test_ok(self, _, __):
-        """Test for `distro` and `uname` outputs concatenation"""
+        """Test for `distro` output and `uname` facts concatenation"""
         self.assertEqual(
             Distro().value,
             'NAME VERSION (CODENAME) [ARCHITECTURE]'
@@ -34,12 +34,11 @@ ARCHITECTURE
         return_value={'not_detected': 'Not detected'}
     )
     @patch(
-        'archey.entries.distro.check_output',  # `uname` output
-        return_value="""\
-ARCHITECTURE
-""")
+        'archey.entries.distro.Facts.get_uname',  # `uname` facts
+        return_value=os.uname_result(('Linux', 'HOSTNAME', 'X.Y.Z-R-arch', '#1', 'ARCHITECTURE'))
+    )
     def test_unknown_distro(self, _, __, ___):
-        """Test for `distro` and `uname` outputs concatenation"""
+        """Test for `distro` output and `uname` facts concatenation"""
         self.assertEqual(
             Distro().value,
             'Not detected [ARCHITECTURE]'
@@ -0,0 +1,61 @@
+"""Test module for the `archey.entries` registry"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from archey.entries import Entries, _LazyEntry
+
+
+class TestEntriesRegistry(unittest.TestCase):
+    """Test cases for the entries registry and its lazy references"""
+    @patch('archey.entries.import_module')
+    def test_lazy_entry(self, import_module_mock):
+        """Check that entry modules are only imported on instantiation"""
+        lazy_entry = _LazyEntry('a_module', 'AClass')
+        import_module_mock.assert_not_called()
+
+        import_module_mock.return_value = MagicMock(**{'AClass.return_value': 'INSTANCE'})
+        self.assertEqual(lazy_entry(), 'INSTANCE')
+        import_module_mock.assert_called_once_with('archey.entries.a_module')
+
+    @patch('archey.entries.import_module')
+    def test_lazy_entry_fingerprint(self, import_module_mock):
+        """Check that only fingerprinted entries are asked for their fingerprint"""
+        import_module_mock.return_value = MagicMock(
+            **{'AClass.fingerprint.return_value': 'FINGERPRINT'}
+        )
+
+        self.assertIsNone(_LazyEntry('a_module', 'AClass').fingerprint())
+        import_module_mock.assert_not_called()
+
+        self.assertEqual(
+            _LazyEntry('a_module', 'AClass', fingerprinted=True).fingerprint(),
+            'FINGERPRINT'
+        )
+
+    def test_lazy_entries_resolution(self):
+        """Check that each registry reference resolves to an actual entry class"""
+        for entry in Entries:
+            # pylint: disable=protected-access
+            module = __import__(
+                'archey.entries.' + entry.value._module_name,
+                fromlist=[entry.value._class_name]
+            )
+            self.assertTrue(hasattr(module, entry.value._class_name))
+            if entry.value._fingerprinted:
+                entry_class = getattr(module, entry.value._class_name)
+                self.assertTrue(callable(getattr(entry_class, 'fingerprint', None)))
+
+    @patch('archey.entries.Configuration')
+    def test_enabled(self, configuration_mock):
+        """Check that disabled entries are filtered out"""
+        configuration_mock.return_value.get.return_value = {'Kernel': False, 'RAM': False}
+
+        enabled_entries = Entries.enabled()
+        self.assertNotIn(Entries.Kernel, enabled_entries)
+        self.assertNotIn(Entries.RAM, enabled_entries)
+        self.assertEqual(len(enabled_entries), len(Entries) - 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
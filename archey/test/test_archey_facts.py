@@ -0,0 +1,98 @@
+"""Test module for `archey.facts`"""
+
+import io
+import unittest
+from unittest.mock import patch
+
+from archey.facts import Facts
+
+
+class TestFactsUtil(unittest.TestCase):
+    """
+    Test cases for the `Facts` (singleton) class.
+    To work around the singleton, we reset the internal `_instances` dictionary.
+    """
+    @patch.dict(
+        'archey.singleton.Singleton._instances',
+        clear=True
+    )
+    @patch(
+        'archey.facts.os.uname',
+        return_value='UNAME_RESULT'
+    )
+    def test_uname(self, uname_mock):
+        """Check that `uname(2)` is only called once"""
+        self.assertEqual(Facts().get_uname(), 'UNAME_RESULT')
+        self.assertEqual(Facts().get_uname(), 'UNAME_RESULT')
+        uname_mock.assert_called_once_with()
+
+    @patch.dict(
+        'archey.singleton.Singleton._instances',
+        clear=True
+    )
+    def test_clear(self):
+        """Check that facts are retrieved again once cleared"""
+        with patch('archey.facts.os.uname', side_effect=['UNAME_1', 'UNAME_2']):
+            facts = Facts()
+            self.assertEqual(facts.get_uname(), 'UNAME_1')
+            facts.clear()
+            self.assertEqual(Facts().get_uname(), 'UNAME_2')
+
+        with patch('archey.facts.read_smbios', side_effect=[None, {'bios': {}}]):
+            self.assertIsNone(facts.get_smbios())
+            self.assertIsNone(facts.get_smbios())
+            facts.clear()
+            self.assertDictEqual(facts.get_smbios(), {'bios': {}})
+
+    @patch.dict(
+        'archey.singleton.Singleton._instances',
+        clear=True
+    )
+    def test_cpuinfo_field(self):
+        """Check that `/proc/cpuinfo` is lazily streamed, only as far as needed"""
+        cpuinfo_lines = [
+            'processor\t: 0\n',
+            'model name\t: CPU-MODEL-NAME\n',
+            '\n',
+            'processor\t: 1\n',
+            'model name\t: CPU-MODEL-NAME\n',
+            'Hardware\t: HARDWARE\n',
+        ]
+        read_lines = []
+
+        def _read_cpuinfo():
+            for line in cpuinfo_lines:
+                read_lines.append(line)
+                yield line
+
+        with patch('archey.facts.Facts._read_cpuinfo', side_effect=_read_cpuinfo) as read_mock:
+            facts = Facts()
+            self.assertEqual(facts.get_cpuinfo_field('Model Name'), 'CPU-MODEL-NAME')
+            # Streaming stopped right after the first match.
+            self.assertListEqual(read_lines, cpuinfo_lines[:2])
+
+            # Already parsed fields are not read again.
+            self.assertEqual(Facts().get_cpuinfo_field('processor'), '0')
+            self.assertEqual(read_mock.call_count, 1)
+
+            self.assertEqual(Facts().get_cpuinfo_field('hardware'), 'HARDWARE')
+            self.assertIsNone(Facts().get_cpuinfo_field('Revision'))
+            # The whole file has been parsed, missing fields don't trigger another read.
+            self.assertIsNone(Facts().get_cpuinfo_field('Serial'))
+            self.assertEqual(read_mock.call_count, 3)
+
+    @patch.dict(
+        'archey.singleton.Singleton._instances',
+        clear=True
+    )
+    def test_cpuinfo_closing(self):
+        """Check that `/proc/cpuinfo` is not kept open once a field has been found"""
+        cpuinfo_file = io.StringIO('processor\t: 0\nmodel name\t: CPU-MODEL-NAME\n')
+        with patch('archey.facts.open', create=True, return_value=cpuinfo_file):
+            self.assertEqual(Facts().get_cpuinfo_field('processor'), '0')
+
+        self.assertTrue(cpuinfo_file.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
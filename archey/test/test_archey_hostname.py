@@ -1,5 +1,6 @@
 """Test module for Archey's device host-name detection module"""
 
+import os
 import unittest
 from unittest.mock import patch
 
@@ -8,14 +9,13 @@ from archey.entries.hostname import Hostname
 
 class TestHostnameEntry(unittest.TestCase):
     """
-    Here, we mock the `check_output` call and check afterwards
+    Here, we mock the shared `uname` facts and check afterwards
       that the output is correct.
     """
     @patch(
-        'archey.entries.hostname.check_output',
-        return_value="""\
-MY-COOL-LAPTOP\
-""")
+        'archey.entries.hostname.Facts.get_uname',
+        return_value=os.uname_result(('Linux', 'MY-COOL-LAPTOP', 'X.Y.Z-R-arch', '#1', 'x86_64'))
+    )
     def test(self, _):
         """A simple test, for a simple mock"""
         self.assertEqual(Hostname().value, 'MY-COOL-LAPTOP')
@@ -1,5 +1,6 @@
 """Test module for Archey's kernel information detection module"""
 
+import os
 import unittest
 from unittest.mock import patch
 
@@ -8,14 +9,13 @@ from archey.entries.kernel import Kernel
 
 class TestKernelEntry(unittest.TestCase):
     """
-    Here, we mock the `check_output` call and check afterwards
+    Here, we mock the shared `uname` facts and check afterwards
       that the output is correct.
     """
     @patch(
-        'archey.entries.kernel.check_output',
-        return_value="""\
-X.Y.Z-R-arch
-""")
+        'archey.entries.kernel.Facts.get_uname',
+        return_value=os.uname_result(('Linux', 'HOSTNAME', 'X.Y.Z-R-arch', '#1', 'x86_64'))
+    )
     def test(self, _):
         """A simple test, for a simple mock"""
         self.assertEqual(Kernel().value, 'X.Y.Z-R-arch')
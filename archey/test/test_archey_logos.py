@@ -0,0 +1,37 @@
+"""Test module for `archey.logos`"""
+
+import subprocess
+import sys
+import unittest
+
+from archey.constants import LOGOS_DICT
+from archey.distributions import Distributions
+from archey.logos import get_logo
+
+
+class TestLogosUtil(unittest.TestCase):
+    """Test cases for logos (lazy) loading"""
+    def test_get_logo(self):
+        """Check that each supported distribution resolves to a complete logo"""
+        for distribution in Distributions:
+            logo = get_logo(LOGOS_DICT[distribution])
+            for i in range(18):
+                self.assertIn('{{r[{0}]}}'.format(i), logo)
+
+    def test_get_logo_only_loads_one_module(self):
+        """Check that only the requested logo module gets imported"""
+        loaded_logos = subprocess.check_output(
+            [
+                sys.executable, '-c',
+                'import sys; import archey.output; from archey.logos import get_logo; '
+                'get_logo("debian"); '
+                'print(sorted(m for m in sys.modules if m.startswith("archey.logos.")))'
+            ],
+            universal_newlines=True
+        ).rstrip()
+
+        self.assertEqual(loaded_logos, "['archey.logos.debian']")
+
+
+if __name__ == '__main__':
+    unittest.main()
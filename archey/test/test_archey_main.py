@@ -0,0 +1,225 @@
+"""Test module for `archey.__main__`"""
+
+import sys
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from enum import Enum
+
+from archey.__main__ import _get_daemon_values, main
+from archey.command import check_output
+from archey.entries import Entries
+
+
+class _FakeEntry:
+    """Base class of fake entries, which (as most `_LazyEntry`) are not fingerprinted"""
+    @staticmethod
+    def fingerprint():
+        """See `_LazyEntry.fingerprint`"""
+        return None
+
+
+class _SlowEntry(_FakeEntry):
+    """A fake entry, which takes some time to compute its value"""
+    def __init__(self):
+        time.sleep(0.2)
+        self.value = 'SLOW'
+
+
+class _FastEntry(_FakeEntry):
+    """A fake entry, which immediately computes its value"""
+    def __init__(self):
+        self.value = 'FAST'
+
+
+class _DisabledEntry(_FakeEntry):
+    """A fake entry, which should never be instantiated"""
+    def __init__(self):
+        raise AssertionError('Disabled entries must not be loaded')
+
+
+class _StuckEntry(_FakeEntry):
+    """A fake entry, which waits on a never-ending sub-process"""
+    def __init__(self):
+        self.value = check_output([sys.executable, '-c', 'import time; time.sleep(10)'])
+
+
+class _FakeEntries(Enum):
+    """A fake `Entries` enumeration"""
+    Slow = _SlowEntry
+    Fast = _FastEntry
+    Disabled = _DisabledEntry
+    Stuck = _StuckEntry
+
+    enabled = classmethod(Entries.enabled.__func__)
+
+
+class TestMainUtil(unittest.TestCase):
+    """
+    Test cases for the `main` entry point.
+    We mock `Output`, `Configuration` and `Cache` to only check entries loading.
+    """
+    def setUp(self):
+        self.output_mock = MagicMock()
+        self.cache_mock = MagicMock()
+        # Let's simulate a cold cache.
+        self.cache_mock.return_value.get.side_effect = KeyError
+        self.daemon_values = {}
+        self.configuration = {
+            'default_strings': {'not_detected': 'Not detected'},
+            'entries': {'Disabled': False, 'Stuck': False},
+            'parallel_loading': True,
+            'timeout': {'entries': {}}
+        }
+
+    def _run_main(self, *arguments):
+        """Run `main` (with command line `arguments`) against the fakes above"""
+        with patch('sys.argv', ['archey'] + list(arguments)), \
+                patch('archey.__main__.Entries', _FakeEntries), \
+                patch('archey.__main__.Cache', self.cache_mock), \
+                patch('archey.__main__._get_daemon_values', return_value=self.daemon_values), \
+                patch('archey.__main__.Output', return_value=self.output_mock), \
+                patch('archey.__main__.Configuration') as configuration_mock, \
+                patch('archey.entries.Configuration', configuration_mock):
+            configuration_mock.return_value.get.side_effect = self.configuration.get
+            main()
+
+    def test_parallel_loading(self):
+        """Check that entries are appended in order, even when computed concurrently"""
+        self._run_main()
+
+        self.assertListEqual(
+            [call[0] for call in self.output_mock.append.call_args_list],
+            [('Slow', 'SLOW'), ('Fast', 'FAST')]
+        )
+        self.output_mock.output.assert_called_once_with()
+
+    def test_cache(self):
+        """Check that cached values are used, and fresh ones stored"""
+        self.cache_mock.return_value.get.side_effect = \
+            lambda name, fingerprint=None: 'CACHED' if name == 'Slow' else {}[name]
+
+        self._run_main()
+
+        self.assertListEqual(
+            [call[0] for call in self.output_mock.append.call_args_list],
+            [('Slow', 'CACHED'), ('Fast', 'FAST')]
+        )
+        self.cache_mock.return_value.set.assert_called_once_with(
+            'Fast', 'FAST', fingerprint=None
+        )
+        self.cache_mock.return_value.save.assert_called_once_with()
+
+    def test_sequential_loading(self):
+        """Check entries loading when `parallel_loading` has been disabled"""
+        self.configuration['parallel_loading'] = False
+
+        self._run_main()
+
+        self.assertListEqual(
+            [call[0] for call in self.output_mock.append.call_args_list],
+            [('Slow', 'SLOW'), ('Fast', 'FAST')]
+        )
+
+    def test_progressive_output(self):
+        """Check that rows are streamed as soon as entries complete"""
+        self.configuration['progressive_output'] = True
+        self.output_mock.begin_streaming.return_value = True
+
+        self._run_main()
+
+        self.output_mock.begin_streaming.assert_called_once_with(['Slow', 'Fast'])
+        # `Fast` completed first, and is streamed with its own index.
+        self.assertListEqual(
+            [call[0] for call in self.output_mock.stream.call_args_list],
+            [(1, 'Fast', 'FAST'), (0, 'Slow', 'SLOW')]
+        )
+        self.output_mock.append.assert_not_called()
+        self.output_mock.output.assert_not_called()
+
+    def test_entry_deadline(self):
+        """Check that an entry missing its deadline is rendered as not detected"""
+        self.configuration['entries']['Stuck'] = True
+        self.configuration['timeout'] = {
+            'global': 5,
+            'entries': {'default': False, 'Stuck': 0.2}
+        }
+
+        start_time = time.monotonic()
+        self._run_main()
+        self.assertLess(time.monotonic() - start_time, 2)
+
+        self.assertListEqual(
+            [call[0] for call in self.output_mock.append.call_args_list],
+            [('Slow', 'SLOW'), ('Fast', 'FAST'), ('Stuck', 'Not detected')]
+        )
+
+    def test_global_budget(self):
+        """Check that the global budget is shared by the whole run"""
+        self.configuration['entries']['Stuck'] = True
+        self.configuration['parallel_loading'] = False
+        self.configuration['timeout'] = {'global': 0.1, 'entries': {}}
+
+        self._run_main()
+
+        # `Slow` consumed the whole budget (sequentially), `Stuck` couldn't even start.
+        self.assertListEqual(
+            [call[0] for call in self.output_mock.append.call_args_list],
+            [('Slow', 'SLOW'), ('Fast', 'FAST'), ('Stuck', 'Not detected')]
+        )
+
+    @patch('archey.__main__.watch')
+    def test_watch(self, watch_mock):
+        """Check that the watch mode starts once entries have been streamed"""
+        self.configuration['watch'] = {'entries': {'default': 1}}
+        self.output_mock.begin_streaming.return_value = True
+
+        self._run_main('--watch')
+
+        self.assertEqual(len(self.output_mock.stream.call_args_list), 2)
+        watch_mock.assert_called_once_with(
+            self.output_mock,
+            [_FakeEntries.Slow, _FakeEntries.Fast],
+            {'default': 1}
+        )
+
+    def test_daemon_values(self):
+        """Check that values served by a daemon are not computed again"""
+        self.daemon_values['Slow'] = 'FROM_DAEMON'
+
+        self._run_main()
+
+        self.assertListEqual(
+            [call[0] for call in self.output_mock.append.call_args_list],
+            [('Slow', 'FROM_DAEMON'), ('Fast', 'FAST')]
+        )
+
+    @patch('archey.daemon.fetch_values', return_value={'Slow': 'FROM_DAEMON'})
+    def test_get_daemon_values(self, fetch_values_mock):
+        """Check the daemon is only asked for values when its socket exists"""
+        configuration_mock = MagicMock(**{
+            'get.return_value': {'socket_path': '/run/archey4/archeyd.sock'},
+            'get_digest.return_value': 'DIGEST'
+        })
+
+        with patch('archey.__main__.os.path.exists', return_value=False):
+            self.assertDictEqual(_get_daemon_values(configuration_mock), {})
+        fetch_values_mock.assert_not_called()
+
+        with patch('archey.__main__.os.path.exists', return_value=True):
+            self.assertDictEqual(_get_daemon_values(configuration_mock), {'Slow': 'FROM_DAEMON'})
+        fetch_values_mock.assert_called_once_with(
+            '/run/archey4/archeyd.sock', 'DIGEST'
+        )
+
+    def test_no_cache(self):
+        """Check that `--no-cache` completely bypasses the cache"""
+        self._run_main('--no-cache')
+
+        self.cache_mock.assert_not_called()
+        self.assertEqual(len(self.output_mock.append.call_args_list), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
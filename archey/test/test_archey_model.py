@@ -1,9 +1,8 @@
 """Test module for Archey's device's model detection module"""
 
-from subprocess import CalledProcessError
-
+import os
 import unittest
-from unittest.mock import mock_open, patch
+from unittest.mock import patch
 
 from archey.entries.model import Model
 
@@ -14,168 +13,171 @@ class TestModelEntry(unittest.TestCase):
     * Laptop / Desktop "regular" environments
     * Raspberry Pi
     * Virtual environment (as a VM or a container)
+    Files are faked with the help of the `self._files` dictionary (path -> stripped content).
     """
     def setUp(self):
-        self._return_values = None
-
-    @patch(
-        'archey.entries.model.check_output',
-        side_effect=CalledProcessError(1, 'systemd-detect-virt', "none\n")
-    )
-    @patch(
-        'archey.entries.model.open',
-        mock_open(read_data='MY-LAPTOP-MODEL\n'),
-        create=True
-    )
-    def test_regular(self, _):
+        self._files = {}
+        self._cpuinfo = {}
+        self._smbios = None
+        self._uname = os.uname_result(('Linux', 'HOSTNAME', 'X.Y.Z-R-arch', '#1', 'x86_64'))
+        for patcher in (
+                patch('archey.entries.model.Model._read_file', side_effect=self._files.get),
+                patch(
+                    'archey.entries.model.os.path.exists',
+                    side_effect=lambda path: path in self._files
+                ),
+                patch(
+                    'archey.entries.model.Facts.get_cpuinfo_field',
+                    side_effect=self._cpuinfo.get
+                ),
+                patch(
+                    'archey.entries.model.Facts.get_uname',
+                    side_effect=lambda: self._uname
+                ),
+                patch(
+                    'archey.entries.model.Facts.get_smbios',
+                    side_effect=lambda: self._smbios
+                ),
+                patch(
+                    'archey.entries.model.Configuration.get',
+                    return_value={
+                        'not_detected': 'Not detected',
+                        'virtual_environment': 'Virtual Environment'
+                    }
+                )):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_regular(self):
         """Sometimes, it could be quite simple..."""
+        self._files.update({
+            '/sys/class/dmi/id/sys_vendor': 'LENOVO',
+            '/sys/class/dmi/id/product_name': 'MY-LAPTOP-MODEL'
+        })
+        self._cpuinfo['flags'] = 'fpu vme de pse tsc msr'
+
         self.assertEqual(Model().value, 'MY-LAPTOP-MODEL')
 
-    @patch(
-        'archey.entries.model.check_output',
-        side_effect=CalledProcessError(1, 'systemd-detect-virt', "none\n")
-    )
-    def test_raspberry(self, _):
+    def test_raspberry(self):
         """Test for a typical Raspberry context"""
-        self._return_values = [
-            FileNotFoundError(),  # First `open` call will fail
-            'Hardware\t: HARDWARE\nRevision\t: REVISION\n'
-        ]
-
-        with patch('archey.entries.model.open', mock_open(), create=True) as mock:
-            mock.return_value.read.side_effect = self._special_func_for_mock_open
-            self.assertEqual(
-                Model().value,
-                'Raspberry Pi HARDWARE (Rev. REVISION)'
-            )
-
-    @patch(
-        'archey.entries.model.os.getuid',
-        return_value=0
-    )
-    @patch(
-        'archey.entries.model.check_output',
-        side_effect=[
-            FileNotFoundError(),  # `systemd-detect-virt` is not available
-            'xen\nxen-domU\n',    # `virt-what` example output
-            'MY-LAPTOP-MODEL\n'   # `dmidecode` example output
-        ]
-    )
-    def test_virtual_environment(self, _, __):
-        """Test for virtual machine"""
-        self.assertEqual(
-            Model().value,
-            'MY-LAPTOP-MODEL (xen, xen-domU)'
-        )
-
-    @patch(
-        'archey.entries.model.os.getuid',
-        return_value=0
-    )
-    @patch(
-        'archey.entries.model.check_output',
-        side_effect=[
-            FileNotFoundError(),  # `systemd-detect-virt` is not available
-            'xen\nxen-domU\n',    # `virt-what` example output
-            FileNotFoundError()   # `dmidecode` call will fail
-        ]
-    )
-    @patch(
-        'archey.entries.model.Configuration.get',
-        return_value={
-            'not_detected': 'Not detected',
-            'virtual_environment': 'Virtual Environment'
+        self._cpuinfo.update({
+            'Hardware': 'HARDWARE',
+            'Revision': 'REVISION'
+        })
+
+        self.assertEqual(Model().value, 'Raspberry Pi HARDWARE (Rev. REVISION)')
+
+    def test_virtual_machine_dmi(self):
+        """Test for hypervisors identified from DMI tables"""
+        self._files.update({
+            '/sys/class/dmi/id/sys_vendor': 'QEMU',
+            '/sys/class/dmi/id/product_name': 'Standard PC (Q35 + ICH9, 2009)'
+        })
+        self.assertEqual(Model().value, 'Standard PC (Q35 + ICH9, 2009) (qemu)')
+
+        self._files.update({
+            '/sys/class/dmi/id/sys_vendor': 'Microsoft Corporation',
+            '/sys/class/dmi/id/product_name': 'Virtual Machine'
+        })
+        self.assertEqual(Model().value, 'Virtual Machine (microsoft)')
+
+    def test_virtual_machine_smbios(self):
+        """Test for hypervisors identified from SMBIOS tables (DMI not exposed in `sysfs`)"""
+        self._smbios = {
+            'bios': {'vendor': 'SeaBIOS'},
+            'system': {'manufacturer': 'VMware, Inc.', 'product_name': 'VMware7,1'},
+            'baseboard': {},
+            'chassis': {},
+            'memory_devices': []
         }
-    )
-    def test_virtual_environment_without_dmidecode(self, _, __, ___):
-        """Test for virtual machine (with a failing `dmidecode` call)"""
-        self.assertEqual(
-            Model().value,
-            'Virtual Environment (xen, xen-domU)'
-        )
 
-    @patch(
-        'archey.entries.model.os.getuid',
-        return_value=1000
-    )
-    @patch(
-        'archey.entries.model.check_output',
-        return_value='systemd-nspawn\n'  # `systemd-detect-virt` example output
-    )
-    @patch(
-        'archey.entries.model.Configuration.get',
-        return_value={
-            'not_detected': 'Not detected',
-            'virtual_environment': 'Virtual Environment'
-        }
-    )
-    def test_virtual_environment_systemd_alone(self, _, __, ___):
-        """Test for virtual environments, with systemd tools and `dmidecode`"""
+        self.assertEqual(Model().value, 'VMware7,1 (vmware)')
+
+    def test_virtual_machine_xen(self):
+        """Test for (para-virtualized) Xen guests"""
+        self._files['/sys/hypervisor/type'] = 'xen'
+
+        self.assertEqual(Model().value, 'Virtual Environment (xen)')
+
+        # Unprivileged guests' features don't advertise `XENFEAT_dom0` (bit 11).
+        self._files['/sys/hypervisor/properties/features'] = '000027e1'
+        self.assertEqual(Model().value, 'Virtual Environment (xen)')
+
+    def test_xen_dom0(self):
+        """Test that Xen control domain (dom0), running on physical hardware, is not a guest"""
+        self._files.update({
+            '/sys/hypervisor/type': 'xen',
+            '/sys/hypervisor/properties/features': '00002fe1',
+            '/sys/class/dmi/id/product_name': 'MY-SERVER-MODEL'
+        })
+        # CPUID "hypervisor" bit is set within dom0 too.
+        self._cpuinfo['flags'] = 'fpu vme de pse tsc msr hypervisor lahf_lm'
+        self.assertEqual(Model().value, 'MY-SERVER-MODEL')
+
+        # Without features attribute, `xenfs` capabilities identify dom0 too.
+        del self._files['/sys/hypervisor/properties/features']
+        self._files['/proc/xen/capabilities'] = 'control_d'
+        self.assertEqual(Model().value, 'MY-SERVER-MODEL')
+
+    def test_virtual_machine_cpuid(self):
+        """Test for unknown hypervisors, only detected from the CPUID flag"""
+        self._files['/sys/class/dmi/id/product_name'] = 'SOME-PRODUCT'
+        self._cpuinfo['flags'] = 'fpu vme de pse tsc msr hypervisor lahf_lm'
+
+        self.assertEqual(Model().value, 'SOME-PRODUCT (vm-other)')
+
+    def test_container_environ(self):
+        """Test for containers advertised to PID 1 (or by systemd)"""
+        self._files['/proc/1/environ'] = 'HOME=/\0container=systemd-nspawn\0TERM=xterm'
         self.assertEqual(Model().value, 'Virtual Environment (systemd-nspawn)')
 
-    @patch(
-        'archey.entries.model.os.getuid',
-        return_value=0
-    )
-    @patch(
-        'archey.entries.model.check_output',
-        side_effect=[
-            'systemd-nspawn\n',  # `systemd-detect-virt` example output
-            'MY-LAPTOP-MODEL\n'  # `dmidecode` example output
-        ]
-    )
-    @patch(
-        'archey.entries.model.Configuration.get',
-        return_value={
-            'not_detected': 'Not detected',
-            'virtual_environment': 'Virtual Environment'
-        }
-    )
-    def test_virtual_environment_systemd_and_dmidecode(self, _, __, ___):
-        """Test for virtual environments, with systemd tools and `dmidecode`"""
-        self.assertEqual(Model().value, 'MY-LAPTOP-MODEL (systemd-nspawn)')
-
-    @patch(
-        'archey.entries.model.os.getuid',
-        return_value=1000
-    )
-    @patch(
-        'archey.entries.model.check_output',
-        side_effect=FileNotFoundError()
-    )
-    @patch(
-        'archey.entries.model.Configuration.get',
-        return_value={
-            'not_detected': 'Not detected',
-            'virtual_environment': 'Virtual Environment'
-        }
-    )
-    def test_no_match(self, _, __, ___):
+        del self._files['/proc/1/environ']
+        self._files['/run/systemd/container'] = 'lxc'
+        self.assertEqual(Model().value, 'Virtual Environment (lxc)')
+
+    def test_container_markers(self):
+        """Test for containers identified by their managers markers (or control groups)"""
+        # The host may be a virtual machine itself, but containers take precedence.
+        self._files.update({
+            '/sys/class/dmi/id/sys_vendor': 'Amazon EC2',
+            '/sys/class/dmi/id/product_name': 'm5.large',
+            '/.dockerenv': ''
+        })
+        self.assertEqual(Model().value, 'm5.large (docker)')
+
+        del self._files['/.dockerenv']
+        self._files['/run/.containerenv'] = ''
+        self.assertEqual(Model().value, 'm5.large (podman)')
+
+        del self._files['/run/.containerenv']
+        self._files['/proc/1/cgroup'] = """\
+12:pids:/kubepods/besteffort/pod0123/4567
+0::/kubepods/besteffort/pod0123/4567"""
+        self.assertEqual(Model().value, 'm5.large (kubernetes)')
+
+        self._files['/proc/1/cgroup'] = '0::/'
+        self.assertEqual(Model().value, 'm5.large (amazon)')
+
+    def test_container_openvz(self):
+        """Test for OpenVZ containers, which hosts also expose `/proc/vz`"""
+        self._files['/proc/vz'] = ''
+        self.assertEqual(Model().value, 'Virtual Environment (openvz)')
+
+        self._files['/proc/bc'] = ''
+        self.assertEqual(Model().value, 'Not detected')
+
+    def test_container_wsl(self):
+        """Test for Windows Subsystem for Linux, identified by its kernel release"""
+        self._uname = os.uname_result(
+            ('Linux', 'HOSTNAME', '5.15.90.1-microsoft-standard-WSL2', '#1', 'x86_64')
+        )
+        self.assertEqual(Model().value, 'Virtual Environment (wsl)')
+
+    def test_no_match(self):
         """Test when no information could be retrieved"""
-        self._return_values = [
-            FileNotFoundError(),      # First `open` call will fail
-            'Hardware\t: HARDWARE\n'  # `Revision` entry is not present
-        ]
-
-        with patch('archey.entries.model.open', mock_open(), create=True) as mock:
-            mock.return_value.read.side_effect = self._special_func_for_mock_open
-            self.assertEqual(Model().value, 'Not detected')
-
-    def _special_func_for_mock_open(self):
-        """
-        This method does not belong to the test cases.
-        It's a special method which allows mocking multiple `io.open` calls.
-        You just have to set the values within a list `self._return_values`.
-        And then :
-        `mock.return_value.read.side_effect = self._special_func_for_mock_open`
-        """
-        return_value = self._return_values.pop(0)
-
-        # Either return value or raise any specified exception
-        if issubclass(return_value.__class__, OSError().__class__):
-            raise return_value
-
-        return return_value
+        self._cpuinfo['Hardware'] = 'HARDWARE'  # `Revision` entry is not present
+
+        self.assertEqual(Model().value, 'Not detected')
 
 
 if __name__ == '__main__':
@@ -1,21 +1,27 @@
 """Test module for `archey.output`"""
 
+import os
 import unittest
 from unittest.mock import patch
 
 from archey.colors import Colors
 from archey.constants import COLOR_DICT
-from archey.output import Output
+from archey.output import JSONOutput, Output
 from archey.distributions import Distributions
 
 
+# Fake `os.uname` results, for regular and Windows Subsystem for Linux kernels.
+UNAME_REGULAR = os.uname_result(('Linux', 'HOSTNAME', 'X.Y.Z-R-ARCH', '#1', 'x86_64'))
+UNAME_WSL = os.uname_result(('Linux', 'HOSTNAME', 'X.Y.Z-R-Microsoft', '#1', 'x86_64'))
+
+
 class TestOutputUtil(unittest.TestCase):
     """
     Simple test cases to check the behavior of `Output` main class.
     """
     @patch(
-        'archey.output.check_output',
-        return_value='X.Y.Z-R-ARCH\n'
+        'archey.output.Facts.get_uname',
+        return_value=UNAME_REGULAR
     )
     @patch(
         'archey.output.distro.id',
@@ -35,8 +41,8 @@ class TestOutputUtil(unittest.TestCase):
         )
 
     @patch(
-        'archey.output.check_output',
-        return_value='X.Y.Z-R-ARCH\n'
+        'archey.output.Facts.get_uname',
+        return_value=UNAME_REGULAR
     )
     @patch(
         'archey.output.distro.id',
@@ -60,8 +66,8 @@ class TestOutputUtil(unittest.TestCase):
         )
 
     @patch(
-        'archey.output.check_output',
-        return_value='X.Y.Z-R-ARCH\n'
+        'archey.output.Facts.get_uname',
+        return_value=UNAME_REGULAR
     )
     @patch(
         'archey.output.distro.id',
@@ -85,8 +91,8 @@ class TestOutputUtil(unittest.TestCase):
         )
 
     @patch(
-        'archey.output.check_output',
-        return_value='X.Y.Z-R-ARCH\n'
+        'archey.output.Facts.get_uname',
+        return_value=UNAME_REGULAR
     )
     @patch(
         'archey.output.distro.id',
@@ -110,8 +116,8 @@ class TestOutputUtil(unittest.TestCase):
         )
 
     @patch(
-        'archey.output.check_output',
-        return_value='X.Y.Z-R-ARCH\n'
+        'archey.output.Facts.get_uname',
+        return_value=UNAME_REGULAR
     )
     @patch(
         'archey.output.distro.id',
@@ -135,8 +141,8 @@ class TestOutputUtil(unittest.TestCase):
         )
 
     @patch(
-        'archey.output.check_output',
-        return_value='X.Y.Z-R-ARCH\n'
+        'archey.output.Facts.get_uname',
+        return_value=UNAME_REGULAR
     )
     @patch(
         'archey.output.distro.id',
@@ -160,8 +166,8 @@ class TestOutputUtil(unittest.TestCase):
         )
 
     @patch(
-        'archey.output.check_output',
-        return_value='X.Y.Z-R-Microsoft\n'
+        'archey.output.Facts.get_uname',
+        return_value=UNAME_WSL
     )
     @patch(
         'archey.output.distro.os_release_attr',
@@ -177,8 +183,8 @@ class TestOutputUtil(unittest.TestCase):
         )
 
     @patch(
-        'archey.output.check_output',
-        return_value='X.Y.Z-R-ARCH\n'
+        'archey.output.Facts.get_uname',
+        return_value=UNAME_REGULAR
     )
     @patch(
         'archey.output.distro.id',
@@ -203,8 +209,8 @@ class TestOutputUtil(unittest.TestCase):
         )
 
     @patch(
-        'archey.output.check_output',
-        return_value='X.Y.Z-R-ARCH\n'
+        'archey.output.Facts.get_uname',
+        return_value=UNAME_REGULAR
     )
     @patch(
         'archey.output.distro.id',
@@ -232,8 +238,8 @@ class TestOutputUtil(unittest.TestCase):
         )
 
     @patch(
-        'archey.output.check_output',
-        return_value='X.Y.Z-R-Microsoft\n'  # Make WSL detection pass.
+        'archey.output.Facts.get_uname',
+        return_value=UNAME_WSL  # Make WSL detection pass.
     )
     @patch(
         'archey.output.distro.os_release_attr',
@@ -257,8 +263,8 @@ class TestOutputUtil(unittest.TestCase):
         )
 
     @patch(
-        'archey.output.check_output',
-        return_value='X.Y.Z-R-ARCH\n'
+        'archey.output.Facts.get_uname',
+        return_value=UNAME_REGULAR
     )
     @patch(
         'archey.output.distro.id',
@@ -268,10 +274,9 @@ class TestOutputUtil(unittest.TestCase):
         'archey.output.distro.os_release_attr',
         return_value=''
     )
-    @patch.dict(
-        'archey.output.LOGOS_DICT',
-        {
-            Distributions.DEBIAN: """\
+    @patch(
+        'archey.output.get_logo',
+        return_value="""\
 {c[0]} {r[0]} {c[1]}
 {c[0]} {r[1]} {c[1]}
 {c[0]} {r[2]} {c[1]}
@@ -291,14 +296,13 @@ class TestOutputUtil(unittest.TestCase):
 {c[0]} {r[16]} {c[1]}
 {c[0]} {r[17]} {c[1]}\
 """
-        }
     )
     @patch(
         'archey.output.print',
         return_value=None,  # Let's nastily mute class' outputs.
         create=True
     )
-    def test_centered_output(self, _, __, ___, ____):
+    def test_centered_output(self, _, __, ___, ____, _____):
         """Test how the `output` method handles centering operations"""
         output = Output()
 
@@ -364,6 +368,154 @@ class TestOutputUtil(unittest.TestCase):
             ]
         )
 
+    @patch(
+        'archey.output.Facts.get_uname',
+        return_value=UNAME_REGULAR
+    )
+    @patch(
+        'archey.output.distro.id',
+        return_value='debian'  # Make Debian being selected.
+    )
+    @patch(
+        'archey.output.distro.os_release_attr',
+        return_value=''
+    )
+    @patch(
+        'archey.output.get_logo',
+        return_value="""\
+{c[0]} HEADER\n\
+{c[0]} {r[0]}
+{c[0]} {r[1]}
+{c[0]} {r[2]}
+{c[0]} {r[3]}
+{c[0]} {r[4]}
+{c[0]} {r[5]}
+{c[0]} {r[6]}
+{c[0]} {r[7]}
+{c[0]} {r[8]}
+{c[0]} {r[9]}
+{c[0]} {r[10]}
+{c[0]} {r[11]}
+{c[0]} {r[12]}
+{c[0]} {r[13]}
+{c[0]} {r[14]}
+{c[0]} {r[15]}
+{c[0]} {r[16]}
+{c[0]} {r[17]}\
+"""
+    )
+    @patch.dict(
+        'archey.output.COLOR_DICT',
+        {Distributions.DEBIAN: ['COLOR_0']}
+    )
+    @patch(
+        'archey.output.shutil.get_terminal_size',
+        return_value=os.terminal_size((80, 24))
+    )
+    @patch('archey.output.sys.stdout')
+    @patch(
+        'archey.output.print',
+        return_value=None,  # Let's nastily mute class' outputs.
+        create=True
+    )
+    def test_streaming(self, print_mock, stdout_mock, _, __, ___, ____, _____):
+        """Test the progressive rendering of entries"""
+        output = Output()
+
+        # Output is not a terminal, streaming should not be possible.
+        stdout_mock.isatty.return_value = False
+        self.assertFalse(output.begin_streaming(['KEY_1', 'KEY_2']))
+        print_mock.assert_not_called()
+
+        stdout_mock.isatty.return_value = True
+        self.assertTrue(output.begin_streaming(['KEY_1', 'KEY_2']))
+
+        # The logo has been printed, with placeholders (centered).
+        self.assertIn(
+            'COLOR_0 COLOR_0KEY_2:{clear} ...\n'.format(clear=Colors.CLEAR),
+            print_mock.call_args[0][0]
+        )
+
+        output.stream(1, 'KEY_2', 'VALUE_2')
+
+        # The cursor went up to the tenth row (eleventh line out of 19), after the logo,
+        #   and came back.
+        self.assertEqual(
+            print_mock.call_args[0][0],
+            '\x1b[9A\x1b[9GCOLOR_0KEY_2:{clear} VALUE_2{clear}\x1b[K\x1b[9B\r'.format(
+                clear=Colors.CLEAR
+            )
+        )
+        self.assertEqual(
+            output._results[9],  # pylint: disable=protected-access
+            'COLOR_0KEY_2:{clear} VALUE_2'.format(clear=Colors.CLEAR)
+        )
+
+        # Nothing is printed when the value did not change since the previous frame.
+        print_mock.reset_mock()
+        output.stream(1, 'KEY_2', 'VALUE_2')
+        print_mock.assert_not_called()
+
+        # Rows wider than the terminal are truncated, so they never wrap.
+        # 72 columns are left from the ninth one (`COLOR_0` fake color is visible here).
+        output.stream(1, 'KEY_2', 'V' * 100)
+        self.assertEqual(
+            output._results[9],  # pylint: disable=protected-access
+            'COLOR_0KEY_2:{clear} {value}'.format(clear=Colors.CLEAR, value='V' * 58)
+        )
+
+        # The terminal is too small to contain the whole logo.
+        for terminal_size in ((80, 10), (8, 24)):
+            output = Output()
+            with patch(
+                'archey.output.shutil.get_terminal_size',
+                return_value=os.terminal_size(terminal_size)
+            ):
+                self.assertFalse(output.begin_streaming(['KEY_1', 'KEY_2']))
+
+
+class TestJSONOutputUtil(unittest.TestCase):
+    """Simple test cases to check the behavior of the machine-readable output"""
+    @patch(
+        'archey.output.print',
+        return_value=None,  # Let's nastily mute class' outputs.
+        create=True
+    )
+    def test_json(self, print_mock):
+        """Check raw values are printed as a JSON object, in entries order"""
+        output = JSONOutput()
+        self.assertFalse(output.begin_streaming(['RAM', 'Packages']))
+
+        output.append(
+            'RAM',
+            '{0}1234 MiB{1} / 5678 MiB'.format(Colors.GREEN_NORMAL, Colors.CLEAR)
+        )
+        output.append('Packages', 42)
+        output.output()
+
+        print_mock.assert_called_once_with(
+            '{"RAM": "1234 MiB / 5678 MiB", "Packages": 42}'
+        )
+
+    @patch(
+        'archey.output.print',
+        return_value=None,  # Let's nastily mute class' outputs.
+        create=True
+    )
+    def test_ndjson(self, print_mock):
+        """Check a JSON object is printed per streamed entry"""
+        output = JSONOutput(streaming=True)
+        self.assertTrue(output.begin_streaming(['RAM', 'Packages']))
+        print_mock.assert_not_called()
+
+        output.stream(1, 'Packages', 42)
+        output.stream(0, 'RAM', '{0}1234 MiB{1}'.format(Colors.RED_NORMAL, Colors.CLEAR))
+
+        self.assertListEqual(
+            [call[0][0] for call in print_mock.call_args_list],
+            ['{"Packages": 42}', '{"RAM": "1234 MiB"}']
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
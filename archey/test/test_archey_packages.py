@@ -1,5 +1,9 @@
 """Test module for Archey's installed system packages detection module"""
 
+import os
+import sqlite3
+import struct
+import tempfile
 import unittest
 from unittest.mock import patch
 
@@ -8,207 +12,222 @@ from archey.entries.packages import Packages
 
 class TestPackagesEntry(unittest.TestCase):
     """
-    Here, we mock the `check_output` calls and check afterwards
-      that the outputs are correct.
-    Sorry for the code style, mocking this class is pretty boring.
+    Here, we point packages databases paths to a temporary directory,
+      populate there the database of one packages manager,
+      and check afterwards that the count is correct.
     """
-    @patch(
-        'archey.entries.packages.check_output',
-        return_value="""\
-sqlite-libs-3.30.1-r1 x86_64 {{sqlite}} (Public-Domain) [installed]
-musl-1.1.24-r2 x86_64 {{musl}} (MIT) [installed]
-libbz2-1.0.8-r1 x86_64 {{bzip2}} (bzip2-1.0.6) [installed]
-gdbm-1.13-r1 x86_64 {{gdbm}} (GPL) [installed]
-ncurses-libs-6.1_p20200118-r3 x86_64 {{ncurses}} (MIT) [installed]
-zlib-1.2.11-r3 x86_64 {{zlib}} (Zlib) [installed]
-apk-tools-2.10.4-r3 x86_64 {{apk}-tools} (GPL2) [installed]
-readline-8.0.1-r0 x86_64 {{readline}} (GPL-2.0-or-later) [installed]
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+
+        self.paths = {
+            'APK_INSTALLED_PATH': os.path.join(self.temp_dir, 'apk', 'installed'),
+            'DPKG_STATUS_PATH': os.path.join(self.temp_dir, 'dpkg', 'status'),
+            'PACMAN_LOCAL_PATH': os.path.join(self.temp_dir, 'pacman', 'local'),
+            'PORTAGE_DB_PATH': os.path.join(self.temp_dir, 'pkg'),
+            'RPM_DB_PATH': os.path.join(self.temp_dir, 'rpm'),
+            'SNAPD_SNAPS_PATH': os.path.join(self.temp_dir, 'snapd', 'snaps'),
+            'FLATPAK_PATH': os.path.join(self.temp_dir, 'flatpak')
+        }
+        self.site_packages = os.path.join(self.temp_dir, 'site-packages')
+        self.configuration = {
+            'default_strings': {'not_detected': 'Not detected'},
+            'packages': {'combine_managers': False}
+        }
+        for patcher in (
+                patch.multiple('archey.entries.packages', **self.paths),
+                patch(
+                    'archey.entries.packages.Packages._get_site_packages',
+                    return_value=[self.site_packages]
+                ),
+                patch(
+                    'archey.entries.packages.check_output',
+                    side_effect=FileNotFoundError()
+                ),
+                patch(
+                    'archey.entries.packages.Configuration.get',
+                    side_effect=self.configuration.get
+                )):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _write(path, content, mode='w'):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode) as file:
+            file.write(content)
+
+    def test_apk(self):
+        """Check APK installed database parsing"""
+        self._write(self.paths['APK_INSTALLED_PATH'], """\
+C:Q1Ww3Yo6vgEdyMnh2ezHNiz8DQ+Lo=
+P:musl
+V:1.1.24-r2
+A:x86_64
+
+C:Q1Cdmkw5Zrw+V2PEKZ6l0hJqtcvnM=
+P:busybox
+V:1.31.1-r9
+A:x86_64
+
+C:Q1vgJ8HVp28hnl8AgnnMaWGnSAVDc=
+P:apk-tools
+V:2.10.4-r3
+A:x86_64
+""")
+        self.assertEqual(Packages().value, 3)
+
+    def test_dpkg(self):
+        """Check DPKG status database parsing (removed but not purged packages are skipped)"""
+        self._write(self.paths['DPKG_STATUS_PATH'], """\
+Package: accountsservice
+Status: install ok installed
+Priority: optional
+
+Package: acl
+Status: hold ok installed
+Priority: optional
+
+Package: albatross-gtk-theme
+Status: deinstall ok config-files
+Priority: optional
+
+Package: alien
+Status: install ok installed
+Priority: optional
+Description: convert and install rpm and other packages
+ This line is not a status one, although it ends with installed
 """)
-    def test_match_with_apk(self, _):
-        """Simple test for the APK packages manager"""
-        self.assertEqual(Packages().value, 8)
-
-#     @patch(
-#         'archey.entries.packages.check_output',
-#         side_effect=[
-#             FileNotFoundError(),
-#             """\
-# accountsservice/stable,now 0.6.45-2 amd64 [installed,automatic]
-# acl/stable,now 2.2.53-4 amd64 [installed,automatic]
-# adb/stable,now 1:8.1.0+r23-5 amd64 [installed]
-# adduser/stable,now 3.118 all [installed]
-# adwaita-icon-theme/stable,now 3.30.1-1 all [installed,automatic]
-# albatross-gtk-theme/stable,now 1.7.4-1 all [installed,automatic]
-# alsa-utils/stable,now 1.1.8-2 amd64 [installed,automatic]
-# """])
-#     def test_match_with_apt(self, _):
-#         """Simple test for the APT packages manager"""
-#         self.assertEqual(Packages().value, 7)
+        self.assertEqual(Packages().value, 3)
+
+    def test_portage(self):
+        """Check Portage database walking (packages being merged are skipped)"""
+        for package in (
+                'sys-libs/glibc-2.25-r10',
+                'sys-libs/libcap-2.24-r2',
+                'sys-apps/busybox-1.28.0',
+                'sys-apps/-MERGING-pax-utils-1.2.2-r2'):
+            os.makedirs(os.path.join(self.paths['PORTAGE_DB_PATH'], package))
+        self._write(os.path.join(self.paths['PORTAGE_DB_PATH'], '.keep'), '')
+
+        self.assertEqual(Packages().value, 3)
+
+    def test_pacman(self):
+        """Check Pacman local database walking"""
+        for package in ('acl-2.2.52-4', 'archey4-v4.3.3-1', 'argon2-20171227-3'):
+            self._write(os.path.join(self.paths['PACMAN_LOCAL_PATH'], package, 'desc'), '')
+        self._write(os.path.join(self.paths['PACMAN_LOCAL_PATH'], 'ALPM_DB_VERSION'), '9')
+
+        self.assertEqual(Packages().value, 3)
+
+    def test_rpm_sqlite(self):
+        """Check RPM (>= 4.16) SQLite database querying"""
+        os.makedirs(self.paths['RPM_DB_PATH'])
+        connection = sqlite3.connect(os.path.join(self.paths['RPM_DB_PATH'], 'rpmdb.sqlite'))
+        connection.execute('CREATE TABLE Packages (hnum INTEGER PRIMARY KEY, blob BLOB)')
+        connection.executemany('INSERT INTO Packages (blob) VALUES (?)', [(b'',)] * 4)
+        connection.commit()
+        connection.close()
 
-    @patch(
-        'archey.entries.packages.check_output',
-        side_effect=[
-            FileNotFoundError(),
-            #FileNotFoundError(),  # `apt` is disabled for now.
-            """\
-Installed Packages
-GConf2.x86_64                  3.2.6-17.fc26           @@commandline
-GeoIP.x86_64                   1.6.11-1.fc26           @@commandline
-GeoIP-GeoLite-data.noarch      2017.07-1.fc26          @@commandline
-GraphicsMagick.x86_64          1.3.26-3.fc26           @@commandline
-"""])
-    def test_match_with_dnf(self, _):
-        """Simple test for the DNF packages manager"""
         self.assertEqual(Packages().value, 4)
 
-    @patch(
-        'archey.entries.packages.check_output',
-        side_effect=[
-            FileNotFoundError(),
-            #FileNotFoundError(),  # `apt` is disabled for now.
-            FileNotFoundError(),
-            """\
-accountsservice         install
-acl                     install
-adb                     install
-adduser                 install
-adwaita-icon-theme      install
-albatross-gtk-theme     deinstall
-alien                   install
-"""])
-    def test_match_with_dpkg(self, _):
-        """Simple test for the DPKG packages manager"""
-        self.assertEqual(Packages().value, 6)
+    def test_rpm_bdb(self):
+        """Check RPM Berkeley DB `Packages` hash database walking"""
+        page_size = 512
 
-    @patch(
-        'archey.entries.packages.check_output',
-        side_effect=[
-            FileNotFoundError(),
-            #FileNotFoundError(),  # `apt` is disabled for now.
-            FileNotFoundError(),
-            FileNotFoundError(),
-            """\
-
-These are the packages that would be merged, in order:
-
-Calculating dependencies  ... done!
-[ebuild     U  ] sys-libs/glibc-2.25-r10 [2.25-r9]
-[ebuild   R    ] sys-apps/busybox-1.28.0 \n\
-[ebuild  N     ] sys-libs/libcap-2.24-r2  \
-USE="pam -static-libs" ABI_X86="(64) -32 (-x32)" \n\
-[ebuild     U  ] app-misc/pax-utils-1.2.2-r2 [1.1.7]
-[ebuild   R    ] x11-misc/shared-mime-info-1.9 \n\
-
-"""])
-    def test_match_with_emerge(self, _):
-        """Simple test for the Emerge packages manager"""
-        self.assertEqual(Packages().value, 5)
+        def page(page_type, entries):
+            # LSN, page number, previous and next pages, entries, free area offset, level, type.
+            return struct.pack(
+                '<QIIIHHBB', 0, 0, 0, 0, entries, 0, 0, page_type
+            ).ljust(page_size, b'\0')
+
+        self._write(
+            os.path.join(self.paths['RPM_DB_PATH'], 'Packages'),
+            # Metadata page, then two hash pages (the first one holding key 0), an overflow page.
+            struct.pack('<QIIII', 0, 0, 0x061561, 9, page_size).ljust(page_size, b'\0') +
+            page(13, 6) + page(13, 4) + page(7, 1),
+            mode='wb'
+        )
 
-    @patch(
-        'archey.entries.packages.check_output',
-        side_effect=[
-            FileNotFoundError(),
-            #FileNotFoundError(),  # `apt` is disabled for now.
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            """\
-acl 2.2.52-4
-archey4 v4.3.3-1
-archlinux-keyring 20180108-1
-argon2 20171227-3
-"""])
-    def test_match_with_pacman(self, _):
-        """Simple test for the Pacman packages manager"""
         self.assertEqual(Packages().value, 4)
 
     @patch(
         'archey.entries.packages.check_output',
-        side_effect=[
-            FileNotFoundError(),
-            #FileNotFoundError(),  # `apt` is disabled for now.
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            """\
+        return_value="""\
 cdrecord-2.01-10.7.el5
 bluez-libs-3.7-1.1
-setarch-2.0-1.1
-MySQL-client-3.23.57-1
-"""])
-    def test_match_with_rpm(self, _):
-        """Simple test for the RPM packages manager"""
-        self.assertEqual(Packages().value, 4)
+"""
+    )
+    def test_rpm_fallback(self, check_output_mock):
+        """Check we fall back on `rpm` when its database format is not supported (e.g. NDB)"""
+        self._write(os.path.join(self.paths['RPM_DB_PATH'], 'Packages.db'), 'NDB')
+
+        self.assertEqual(Packages().value, 2)
+        self.assertEqual(check_output_mock.call_args[0][0], ['rpm', '-qa'])
+
+    def test_priority(self):
+        """Check the first packages manager database found is used"""
+        self._write(self.paths['DPKG_STATUS_PATH'], 'Status: install ok installed\n')
+        os.makedirs(os.path.join(self.paths['RPM_DB_PATH']))
+
+        self.assertEqual(Packages().value, 1)
+
+    def test_combine_managers(self):
+        """Check every packages manager is counted, and a per-manager breakdown is displayed"""
+        self.configuration['packages']['combine_managers'] = True
+
+        self._write(self.paths['DPKG_STATUS_PATH'], 'Status: install ok installed\n' * 3)
+        # An empty RPM database (e.g. `rpm` installed on a Debian host) is not displayed.
+        os.makedirs(self.paths['RPM_DB_PATH'])
+        # Two snaps, one of them having two revisions.
+        for snap_file in ('core_9993.snap', 'core_10126.snap', 'lxd_16922.snap'):
+            self._write(os.path.join(self.paths['SNAPD_SNAPS_PATH'], snap_file), '')
+        os.makedirs(os.path.join(self.paths['SNAPD_SNAPS_PATH'], 'partial'))
+        # One application (with its `current` link), along with two runtimes.
+        for ref in (
+                'app/org.gimp.GIMP/x86_64/stable',
+                'runtime/org.gnome.Platform/x86_64/3.36',
+                'runtime/org.gnome.Platform/x86_64/3.38'):
+            os.makedirs(os.path.join(self.paths['FLATPAK_PATH'], ref))
+        os.symlink(
+            'x86_64/stable',
+            os.path.join(self.paths['FLATPAK_PATH'], 'app', 'org.gimp.GIMP', 'current')
+        )
+        # A distribution installed by `pip`, and another one by DPKG.
+        self._write(
+            os.path.join(self.site_packages, 'archey4-4.8.0.dist-info', 'INSTALLER'), 'pip\n'
+        )
+        self._write(
+            os.path.join(self.site_packages, 'distro-1.5.0.dist-info', 'INSTALLER'), 'debian\n'
+        )
+
+        self.assertEqual(Packages().value, '3 (dpkg), 2 (snap), 3 (flatpak), 1 (pip)')
+
+    def test_combine_managers_not_detected(self):
+        """Check the `not_detected` string is displayed when no manager has any package"""
+        self.configuration['packages']['combine_managers'] = True
 
-    @patch(
-        'archey.entries.packages.check_output',
-        side_effect=[
-            FileNotFoundError(),
-            #FileNotFoundError(),  # `apt` is disabled for now.
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            """\
-Loaded plugins: fastestmirror, langpacks
-Installed Packages
-GConf2.x86_64                   3.2.6-8.el7         @base/$releasever
-GeoIP.x86_64                    1.5.0-11.el7        @base            \n\
-ModemManager.x86_64             1.6.0-2.el7         @base            \n\
-ModemManager-glib.x86_64        1.6.0-2.el7         @base            \n\
-"""])
-    def test_match_with_yum(self, _):
-        """Simple test for the Yum packages manager"""
-        self.assertEqual(Packages().value, 4)
+        self.assertEqual(Packages().value, 'Not detected')
 
-    @patch(
-        'archey.entries.packages.check_output',
-        side_effect=[
-            FileNotFoundError(),
-            #FileNotFoundError(),  # `apt` is disabled for now.
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            """\
-Loading repository data...
-Reading installed packages...
-
-S  | Name          | Summary                             | Type       \n\
----+---------------+-------------------------------------+------------
-i+ | 5201          | Recommended update for xdg-utils    | patch      \n\
-i  | GeoIP-data    | Free GeoLite country-data for GeoIP | package    \n\
-i  | make          | GNU make                            | package    \n\
-i  | GNOME Nibbles | Guide a worm around a maze          | application
-i  | at            | A Job Manager                       | package    \n\
-"""])
-    def test_match_with_zypper(self, _):
-        """Simple test for the Zypper packages manager"""
-        self.assertEqual(Packages().value, 5)
+    def test_fingerprint(self):
+        """Check the databases fingerprint changes along with packages (un)installation"""
+        self._write(self.paths['DPKG_STATUS_PATH'], 'Status: install ok installed\n')
+        fingerprint = Packages.fingerprint()
+        self.assertIsNotNone(fingerprint[2])
+        self.assertListEqual(fingerprint, Packages.fingerprint())
 
-    @patch(
-        'archey.entries.packages.check_output',
-        side_effect=[  # No packages manager will be found
-            FileNotFoundError(),
-            #FileNotFoundError(),  # `apt` is disabled for now.
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError(),
-            FileNotFoundError()
-        ]
-    )
-    @patch(
-        'archey.entries.packages.Configuration.get',
-        return_value={'not_detected': 'Not detected'}
-    )
-    def test_no_packages_manager(self, _, __):
+        # DPKG atomically replaces its status file.
+        self._write(self.paths['DPKG_STATUS_PATH'] + '-new', 'Status: install ok installed\n' * 2)
+        os.replace(self.paths['DPKG_STATUS_PATH'] + '-new', self.paths['DPKG_STATUS_PATH'])
+        self.assertNotEqual(fingerprint, Packages.fingerprint())
+
+        # The displayed value also depends on `combine_managers` option.
+        fingerprint = Packages.fingerprint()
+        self.configuration['packages']['combine_managers'] = True
+        self.assertNotEqual(fingerprint, Packages.fingerprint())
+
+    def test_no_packages_manager(self):
         """No packages manager is available at the moment..."""
         self.assertEqual(Packages().value, 'Not detected')
 
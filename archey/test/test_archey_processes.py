@@ -1,87 +1,165 @@
 """Test module for `archey.processes`"""
 
-from subprocess import CalledProcessError
-
 import unittest
 from unittest.mock import patch
 
 from archey.processes import Processes
 
 
+# PID -> (effective UID, `comm` content).
+_PROC = {
+    '1': (0, 'systemd\n'),
+    '42': (1000, 'what\n'),
+    '43': (1000, 'an\n'),
+    '44': (0, 'kworker/0:1\n'),
+    '45': (1000, 'awesome\n'),
+    '46': (1000, 'processes\n'),
+    '47': (1000, 'list\n'),
+}
+
+
+def _list_proc(_):
+    """Plain names are listed, as `os.listdir` would do (against Python < 3.5)"""
+    return list(_PROC) + ['self', 'cpuinfo', '1337']  # `1337` has exited meanwhile.
+
+
+def _open_proc_file(path):
+    _, __, pid, file_name = path.split('/')
+    try:
+        uid, comm = _PROC[pid]
+    except KeyError as error:
+        raise FileNotFoundError(path) from error
+
+    if file_name == 'status':
+        content = 'Name:\t{0}Uid:\t{1}\t{1}\t{1}\t{1}\n'.format(comm, uid)
+    else:
+        content = comm
+
+    return _FakeFile(content)
+
+
+def _get_opened_files(open_mock):
+    return [call[0][0] for call in open_mock.call_args_list]
+
+
+@patch.dict(
+    'archey.singleton.Singleton._instances',
+    clear=True
+)
+@patch('archey.processes.os.scandir', create=True, new=_list_proc)
 class TestProcessesUtil(unittest.TestCase):
     """
     Test cases for the `Processes` (singleton) class.
     To work around the singleton, we reset the internal `_instances` dictionary.
-    This way, `check_output` can be mocked here.
+    `/proc` is faked with the help of the `_PROC` dictionary above.
     """
-    @patch.dict(
-        'archey.singleton.Singleton._instances',
-        clear=True
-    )
-    @patch(
-        'archey.processes.check_output',
-        return_value="""\
-what
-an
-awesome
-processes
-list
-you
-got
-there
-""")
-    def test_ps_ok(self, check_output_mock):
-        """Simple test with a plausible `ps` output"""
-        # We'll create two `Processes` instances.
+    @patch('archey.processes.open', create=True, side_effect=_open_proc_file)
+    @patch('archey.processes.os.geteuid', return_value=1000)
+    def test_user_processes(self, _, open_mock):
+        """Check that only current user's processes are listed (only once)"""
         processes_1 = Processes()
-        _ = Processes()
-
         self.assertListEqual(
             processes_1.get(),
-            ['what', 'an', 'awesome', 'processes', 'list', 'you', 'got', 'there']
+            ['what', 'an', 'awesome', 'processes', 'list']
         )
 
-        # The class has been instantiated twice, but `check_output` has been called only once.
-        # `unittest.mock.Mock.assert_called_once` is not available against Python < 3.6.
-        self.assertEqual(check_output_mock.call_count, 1)
-
-    @patch.dict(
-        'archey.singleton.Singleton._instances',
-        clear=True
-    )
-    @patch(
-        'archey.processes.check_output',
-        side_effect=[
-            CalledProcessError(1, 'ps', "ps: unrecognized option: u\n"),
-            """\
-COMMAND
-sh
-top
-ps
-"""])
-    def test_ps_failed(self, _):
-        """Verifies that the program correctly handles first crashing `ps` call"""
+        # The class has been instantiated twice, but `/proc` has been walked through only once.
+        opened_files_count = open_mock.call_count
+        self.assertListEqual(Processes().get(), processes_1.get())
+        self.assertEqual(open_mock.call_count, opened_files_count)
+
+    @patch('archey.processes.open', create=True, side_effect=_open_proc_file)
+    @patch('archey.processes.os.geteuid', return_value=0)
+    def test_root_processes(self, _, open_mock):
+        """Check that every process is listed as root (without reading `status` files)"""
         self.assertListEqual(
             Processes().get(),
-            ['sh', 'top', 'ps']
+            ['systemd', 'what', 'an', 'kworker/0:1', 'awesome', 'processes', 'list']
         )
+        self.assertFalse(
+            any(path.endswith('/status') for path in _get_opened_files(open_mock))
+        )
+
+    @patch('archey.processes.open', create=True, side_effect=_open_proc_file)
+    @patch('archey.processes.os.geteuid', return_value=0)
+    def test_get_index(self, _, __):
+        """Check that processes names are indexed along with their occurrences"""
+        self.assertEqual(Processes().get_index()['what'], 1)
+        self.assertEqual(Processes().get_index()['kworker/0:1'], 1)
+        self.assertEqual(Processes().get_index()['dwm'], 0)
+        self.assertEqual(sum(Processes().get_index().values()), len(_PROC))
+
+    @patch('archey.processes.open', create=True, side_effect=_open_proc_file)
+    @patch('archey.processes.os.geteuid', return_value=1000)
+    def test_match_priority(self, _, __):
+        """Check that candidates order prevails over processes order"""
+        self.assertEqual(Processes().match(['dwm', 'processes', 'an']), 'processes')
+        self.assertIsNone(Processes().match(['dwm', 'i3']))
+        self.assertIsNone(Processes().match([]))
+
+    @patch('archey.processes.open', create=True, side_effect=_open_proc_file)
+    @patch('archey.processes.os.geteuid', return_value=1000)
+    def test_match_early_termination(self, _, open_mock):
+        """Check that `/proc` scanning stops as soon as the first candidate has been found"""
+        processes = Processes()
+        self.assertEqual(processes.match(['an', 'what']), 'an')
+        self.assertNotIn('/proc/45/comm', _get_opened_files(open_mock))
+
+        # Already indexed names are looked up, then scanning resumes where it has been stopped.
+        self.assertEqual(processes.match(['what', 'awesome']), 'what')
+        self.assertNotIn('/proc/45/comm', _get_opened_files(open_mock))
+        self.assertEqual(processes.match(['awesome', 'what']), 'awesome')
+        self.assertNotIn('/proc/46/comm', _get_opened_files(open_mock))
+
+        self.assertListEqual(
+            processes.get(),
+            ['what', 'an', 'awesome', 'processes', 'list']
+        )
+
+    @patch('archey.processes.open', create=True, side_effect=_open_proc_file)
+    @patch('archey.processes.os.geteuid', return_value=1000)
+    def test_scandir_closing(self, _, __):
+        """Check `scandir` iterator (and its directory descriptor) is closed once walked"""
+        scandir_iterator = _FakeScandirIterator(_list_proc('/proc'))
+        with patch('archey.processes.os.scandir', create=True, return_value=scandir_iterator):
+            self.assertEqual(len(Processes().get()), 5)
+
+        self.assertTrue(scandir_iterator.closed)
+
+
+class _FakeScandirIterator:
+    """Minimal `os.scandir` iterator (Python >= 3.6), yielding plain names"""
+    def __init__(self, names):
+        self._names = iter(names)
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.closed = True
+
+    def __iter__(self):
+        return self._names
+
+
+class _FakeFile:
+    """Minimal file-like object, usable as a context manager and as an iterator"""
+    def __init__(self, content):
+        self._content = content
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def __iter__(self):
+        return iter(self._content.splitlines(keepends=True))
 
-    @patch.dict(
-        'archey.singleton.Singleton._instances',
-        clear=True
-    )
-    @patch(
-        'archey.processes.check_output',
-        side_effect=FileNotFoundError()
-    )
-    @patch(
-        'archey.processes.print',
-        return_value=None,  # Let's nastily mute class' outputs.
-        create=True
-    )
-    def test_ps_not_available(self, _, __):
-        """Verifies that the program stops when `ps` is not available"""
-        self.assertRaises(SystemExit, Processes)
+    def read(self):
+        """Return the whole content"""
+        return self._content
 
 
 if __name__ == '__main__':
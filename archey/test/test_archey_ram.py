@@ -10,8 +10,18 @@ from archey.entries.ram import RAM
 class TestRAMEntry(unittest.TestCase):
     """
     Here, we mock the `check_output` call to `free` using all three levels of available ram.
-    In the last test, mock with `/proc/meminfo` file opening during the manual way.
+    `/proc/meminfo` is considered unavailable then.
+    In the last tests, mock with `/proc/meminfo` file opening during the primary way.
     """
+    def setUp(self):
+        patcher = patch(
+            'archey.entries.ram.open',
+            side_effect=FileNotFoundError(),
+            create=True
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     @patch(
         'archey.entries.ram.check_output',
         return_value="""\
@@ -75,10 +85,55 @@ Swap:          4095         160        3935
         ram = RAM().value
         self.assertTrue(all(i in ram for i in [str(Colors.RED_NORMAL), '12341', '15658']))
 
+    @patch('archey.entries.ram.check_output')
     @patch(
-        'archey.entries.ram.check_output',
-        side_effect=IndexError()  # `free` call will fail
+        'archey.entries.ram.Configuration.get',
+        return_value={
+            'ram': {
+                'warning': 33.3,
+                'danger': 66.7
+            },
+        }
     )
+    @patch(
+        'archey.entries.ram.open',
+        mock_open(
+            read_data="""\
+MemTotal:        7581000 kB
+MemFree:          716668 kB
+MemAvailable:    3632244 kB
+Buffers:          478524 kB
+Cached:          2807032 kB
+SwapCached:        67092 kB
+Active:          3947284 kB
+Inactive:        2447708 kB
+Active(anon):    2268724 kB
+Inactive(anon):  1106220 kB
+Active(file):    1678560 kB
+Inactive(file):  1341488 kB
+Unevictable:         128 kB
+Mlocked:             128 kB
+SwapTotal:       7811068 kB
+SwapFree:        7277708 kB
+Dirty:               144 kB
+Writeback:             0 kB
+AnonPages:       3067204 kB
+Mapped:           852272 kB
+Shmem:            451056 kB
+Slab:             314100 kB
+SReclaimable:     200792 kB
+SUnreclaim:       113308 kB
+"""),  # Some lines have been ignored as they are useless for computations.
+        create=True
+    )
+    def test_proc_meminfo(self, _, check_output_mock):
+        """Test `/proc/meminfo` parsing (`free` is not even called)"""
+        ram = RAM().value
+        self.assertTrue(all(i in ram for i in [str(Colors.YELLOW_NORMAL), '3856', '7403']))
+        check_output_mock.assert_not_called()
+
+
+    @patch('archey.entries.ram.check_output')
     @patch(
         'archey.entries.ram.Configuration.get',
         return_value={
@@ -94,7 +149,6 @@ Swap:          4095         160        3935
             read_data="""\
 MemTotal:        7581000 kB
 MemFree:          716668 kB
-MemAvailable:    3632244 kB
 Buffers:          478524 kB
 Cached:          2807032 kB
 SwapCached:        67092 kB
@@ -119,11 +173,24 @@ SUnreclaim:       113308 kB
 """),  # Some lines have been ignored as they are useless for computations.
         create=True
     )
-    def test_proc_meminfo(self, _, __):
-        """Test `/proc/meminfo` parsing (when `free` is not available)"""
+    def test_proc_meminfo_legacy(self, _, check_output_mock):
+        """Test `/proc/meminfo` parsing when `MemAvailable` is missing (Linux < 3.14)"""
         ram = RAM().value
-        self.assertTrue(all(i in ram for i in [str(Colors.YELLOW_NORMAL), '3739', '7403']))
+        self.assertTrue(all(i in ram for i in [str(Colors.YELLOW_NORMAL), '3298', '7403']))
+        check_output_mock.assert_not_called()
+
 
+    @patch(
+        'archey.entries.ram.check_output',
+        side_effect=FileNotFoundError()  # `free` is not available either
+    )
+    @patch(
+        'archey.entries.ram.Configuration.get',
+        return_value={'not_detected': 'Not detected'}
+    )
+    def test_not_detected(self, _, __):
+        """Test when neither `/proc/meminfo` nor `free` are available"""
+        self.assertEqual(RAM().value, 'Not detected')
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,175 @@
+"""Test module for `archey.smbios`"""
+
+import os
+import struct
+import tempfile
+import unittest
+
+from archey.smbios import parse_entry_point, parse_tables, read_smbios
+
+
+def _structure(structure_type, formatted, strings=()):
+    """Build a raw SMBIOS structure (header, formatted area and strings set)"""
+    header = struct.pack('<BBH', structure_type, 4 + len(formatted), 0x1337)
+    strings_set = b''.join(string + b'\0' for string in strings) or b'\0'
+    return header + formatted + strings_set + b'\0'
+
+
+# Hand-built tables (see `_structure`), modelled after a desktop workstation firmware ones.
+TABLES = b''.join([
+    # BIOS (type 0).
+    _structure(
+        0,
+        bytes([1, 2, 0x00, 0xe8, 3, 0x0f]) + bytes(12),
+        [b'American Megatrends Inc.', b'1.40', b'03/05/2020']
+    ),
+    # System (type 1), SMBIOS 2.4+ layout.
+    _structure(
+        1,
+        bytes([1, 2, 3, 4]) + bytes(16) + bytes([6, 6, 5]),
+        [b'Micro-Star International Co., Ltd.', b'MS-7C37', b'1.0', b'Default string',
+         b'To be filled by O.E.M.', b'SKU']
+    ),
+    # Processor (type 4), not decoded.
+    _structure(4, bytes(0x26), [b'CPU0', b'Advanced Micro Devices, Inc.']),
+    # Baseboard (type 2).
+    _structure(
+        2,
+        bytes([1, 2, 3, 0]) + bytes(11),
+        [b'Micro-Star International Co., Ltd.', b'MPG X570 GAMING PLUS (MS-7C37)', b'1.0']
+    ),
+    # Another system structure, which should be ignored.
+    _structure(1, bytes([1, 1, 0, 0]), [b'IGNORED']),
+    # Chassis (type 3) : a "Desktop", with a lock.
+    _structure(3, bytes([1, 0x83, 0, 0]) + bytes(9), [b'Micro-Star International Co., Ltd.']),
+    # Memory devices (type 17) : a 16 GiB DDR4 module...
+    _structure(
+        17,
+        struct.pack('<HHHHHBBBBBHH', 0x1000, 0xfffe, 64, 64, 16384, 0x09, 0, 1, 2, 0x1a,
+                    0x0080, 3200) +
+        bytes([3, 0, 0, 4]) + bytes(1) + struct.pack('<IH', 0, 3200),
+        [b'DIMM 0', b'P0 CHANNEL A', b'Corsair', b'CMK32GX4M2B3200C16']
+    ),
+    # ... an empty slot...
+    _structure(
+        17,
+        struct.pack('<HHHHHBBBBBHH', 0x1000, 0xfffe, 0xffff, 0xffff, 0, 0x09, 0, 1, 2, 0x02,
+                    0x0004, 0) + bytes([0, 0, 0, 0]),
+        [b'DIMM 1', b'P0 CHANNEL A']
+    ),
+    # ... and a 64 GiB module, using the extended size field (SMBIOS 2.7+).
+    _structure(
+        17,
+        struct.pack('<HHHHHBBBBBHH', 0x1000, 0xfffe, 72, 64, 0x7fff, 0x09, 0, 1, 2, 0x22,
+                    0x0080, 4800) +
+        bytes([0, 0, 0, 0]) + bytes(1) + struct.pack('<IH', 65536, 4800),
+        [b'DIMM 2', b'P0 CHANNEL B']
+    ),
+    # End-of-table (type 127), followed by some garbage.
+    _structure(127, b''),
+    b'\xde\xad\xbe\xef'
+])
+
+SMBIOS3_ENTRY_POINT = b'_SM3_\x00\x18\x03\x03\x00\x01\x00' + bytes(12)
+SMBIOS_ENTRY_POINT = b'_SM_\x00\x1f\x02\x08' + bytes(23)
+
+
+class TestSMBIOSUtil(unittest.TestCase):
+    """Test cases for our SMBIOS tables parser"""
+    def test_parse_entry_point(self):
+        """Check SMBIOS version extraction from both entry point formats"""
+        self.assertTupleEqual(parse_entry_point(SMBIOS3_ENTRY_POINT), (3, 3))
+        self.assertTupleEqual(parse_entry_point(SMBIOS_ENTRY_POINT), (2, 8))
+        self.assertIsNone(parse_entry_point(b'_DMI_'))
+
+    def test_parse_tables(self):
+        """Check structures decoding from a (hand-built) tables blob"""
+        smbios = parse_tables(TABLES)
+
+        self.assertDictEqual(
+            smbios['bios'],
+            {
+                'vendor': 'American Megatrends Inc.',
+                'version': '1.40',
+                'release_date': '03/05/2020'
+            }
+        )
+        self.assertDictEqual(
+            smbios['system'],
+            {
+                'manufacturer': 'Micro-Star International Co., Ltd.',
+                'product_name': 'MS-7C37',
+                'version': '1.0',
+                'serial_number': 'Default string',
+                'sku_number': 'SKU',
+                'family': 'To be filled by O.E.M.'
+            }
+        )
+        self.assertDictEqual(
+            smbios['baseboard'],
+            {
+                'manufacturer': 'Micro-Star International Co., Ltd.',
+                'product_name': 'MPG X570 GAMING PLUS (MS-7C37)',
+                'version': '1.0',
+                'serial_number': None
+            }
+        )
+        self.assertDictEqual(
+            smbios['chassis'],
+            {
+                'manufacturer': 'Micro-Star International Co., Ltd.',
+                'type': 'Desktop',
+                'version': None,
+                'serial_number': None
+            }
+        )
+
+        self.assertEqual(len(smbios['memory_devices']), 3)
+        self.assertDictEqual(
+            smbios['memory_devices'][0],
+            {
+                'size': 16384,
+                'locator': 'DIMM 0',
+                'bank_locator': 'P0 CHANNEL A',
+                'type': 'DDR4',
+                'speed': 3200,
+                'manufacturer': 'Corsair',
+                'part_number': 'CMK32GX4M2B3200C16'
+            }
+        )
+        self.assertEqual(smbios['memory_devices'][1]['size'], 0)
+        self.assertIsNone(smbios['memory_devices'][1]['speed'])
+        self.assertEqual(smbios['memory_devices'][2]['size'], 65536)
+        self.assertEqual(smbios['memory_devices'][2]['type'], 'DDR5')
+
+    def test_parse_old_or_truncated_tables(self):
+        """Check that fields absent from older (shorter) structures are skipped"""
+        smbios = parse_tables(
+            # An SMBIOS 2.0 system structure, without SKU and family fields...
+            _structure(1, bytes([1, 2, 0, 0]), [b'VENDOR', b'PRODUCT']) +
+            # ... and a truncated structure.
+            b'\x02\x0f\x00'
+        )
+
+        self.assertEqual(smbios['system']['product_name'], 'PRODUCT')
+        self.assertIsNone(smbios['system']['sku_number'])
+        self.assertDictEqual(smbios['baseboard'], {})
+
+    def test_read_smbios(self):
+        """Check tables reading (and graceful failure) from `sysfs`"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertIsNone(read_smbios(temp_dir))
+
+            with open(os.path.join(temp_dir, 'smbios_entry_point'), 'wb') as file:
+                file.write(SMBIOS3_ENTRY_POINT)
+            with open(os.path.join(temp_dir, 'DMI'), 'wb') as file:
+                file.write(TABLES)
+
+            smbios = read_smbios(temp_dir)
+
+        self.assertTupleEqual(smbios['version'], (3, 3))
+        self.assertEqual(smbios['system']['product_name'], 'MS-7C37')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,21 +3,28 @@
 import os
 import tempfile
 
-from subprocess import CalledProcessError
-
 import unittest
 from unittest.mock import patch
 
-
 from archey.entries.temperature import Temperature
 
 
 class TestTemperatureEntry(unittest.TestCase):
     """
-    Based on `sensors`, `vcgencmd` and thermal files, this module verifies temperature computations.
+    Based on `hwmon`, `vcgencmd` and thermal files, this module verifies temperature computations.
+    `hwmon` chips are faked within a temporary directory (empty by default).
     """
 
     def setUp(self):
+        hwmon_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(hwmon_dir.cleanup)
+        self._hwmon_path = hwmon_dir.name
+        for patcher in (
+                patch('archey.entries.temperature.HWMON_PATH', self._hwmon_path),
+                patch.dict('archey.entries.temperature._HWMON_INPUTS_CACHE', clear=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
         # We'll store there filenames of some temp files mocking those under
         #  `/sys/class/thermal/thermal_zone*/temp`
         self._temp_files = []
@@ -37,12 +44,22 @@ class TestTemperatureEntry(unittest.TestCase):
             file.close()
             os.remove(file.name)
 
+    def _create_hwmon_chip(self, name, temperatures):
+        """Fake a `hwmon` chip named `name`, exposing `temperatures` (in millidegrees Celsius)"""
+        chip_path = os.path.join(self._hwmon_path, 'hwmon' + str(len(os.listdir(self._hwmon_path))))
+        os.makedirs(chip_path)
+
+        attributes = {'name': name}
+        for index, temperature in enumerate(temperatures, start=1):
+            attributes['temp{0}_input'.format(index)] = temperature
+            attributes['temp{0}_crit'.format(index)] = '128000'
+        for attribute, value in attributes.items():
+            with open(os.path.join(chip_path, attribute), 'w') as file:
+                file.write(value + '\n')
+
     @patch(
         'archey.entries.temperature.check_output',
-        side_effect=[
-            FileNotFoundError(),
-            'temp=42.8\'C\n'
-        ]
+        return_value='temp=42.8\'C\n'
     )
     @patch(
         'archey.entries.temperature.iglob',
@@ -65,10 +82,7 @@ class TestTemperatureEntry(unittest.TestCase):
 
     @patch(
         'archey.entries.temperature.check_output',
-        side_effect=[
-            FileNotFoundError(),
-            'temp=40.0\'C\n'
-        ]
+        return_value='temp=40.0\'C\n'
     )
     @patch('archey.entries.temperature.iglob')
     @patch(
@@ -86,10 +100,7 @@ class TestTemperatureEntry(unittest.TestCase):
 
     @patch(
         'archey.entries.temperature.check_output',
-        side_effect=[
-            FileNotFoundError(),  # No temperature from `sensors` call
-            FileNotFoundError()   # No temperature from `vcgencmd` call
-        ]
+        side_effect=FileNotFoundError()  # No temperature from `vcgencmd` call
     )
     @patch('archey.entries.temperature.iglob')
     @patch(
@@ -110,10 +121,7 @@ class TestTemperatureEntry(unittest.TestCase):
 
     @patch(
         'archey.entries.temperature.check_output',
-        side_effect=[
-            FileNotFoundError(),  # No temperature from `sensors` call.
-            FileNotFoundError()   # No temperature from `vcgencmd` call.
-        ]
+        side_effect=FileNotFoundError()  # No temperature from `vcgencmd` call.
     )
     @patch(
         'archey.entries.temperature.iglob',
@@ -131,65 +139,8 @@ class TestTemperatureEntry(unittest.TestCase):
         self.assertEqual(Temperature().value, 'Not detected')
 
     @patch(
-        'archey.entries.temperature.check_output',  # Mock the `sensors` call.
-        side_effect=[
-            """\
-{
-   "who-cares-about":{
-      "temp1":{
-         "temp1_input": 45.000,
-         "temp1_crit": 128.000
-      },
-      "temp2":{
-         "temp2_input": 0.000,
-         "temp2_crit": 128.000
-      },
-      "temp3":{
-         "temp3_input": 38.000,
-         "temp3_crit": 128.000
-      },
-      "temp4":{
-         "temp4_input": 39.000,
-         "temp4_crit": 128.000
-      },
-      "temp5":{
-         "temp5_input": 0.000,
-         "temp5_crit": 128.000
-      },
-      "temp6":{
-         "temp6_input": 114.000,
-         "temp6_crit": 128.000
-      }
-   },
-   "the-chipsets-names":{
-      "what-are":{
-         "temp1_input": 45.000,
-         "temp1_max": 100.000,
-         "temp1_crit": 100.000,
-         "temp1_crit_alarm": 0.000
-      },
-      "those":{
-         "temp2_input": 43.000,
-         "temp2_max": 100.000,
-         "temp2_crit": 100.000,
-         "temp2_crit_alarm": 0.000
-      },
-      "identifiers":{
-         "temp3_input": 44.000,
-         "temp3_max": 100.000,
-         "temp3_crit": 100.000,
-         "temp3_crit_alarm": 0.000
-      }
-   },
-   "crap-a-fan-chip":{
-      "fan1":{
-         "fan1_input": 3386.000
-      }
-   }
-}
-""",
-            FileNotFoundError()  # No temperature from `vcgencmd` call.
-        ]
+        'archey.entries.temperature.check_output',
+        side_effect=FileNotFoundError()  # No temperature from `vcgencmd` call.
     )
     @patch(
         'archey.entries.temperature.Configuration.get',
@@ -199,8 +150,13 @@ class TestTemperatureEntry(unittest.TestCase):
             {'char_before_unit': ' '}
         ]
     )
-    def test_sensors_only_in_fahrenheit(self, _, __):
-        """Test computations around `sensors` output and Fahrenheit (naive) conversion"""
+    def test_hwmon_only_in_fahrenheit(self, _, __):
+        """Test computations around `hwmon` chips and Fahrenheit (naive) conversion"""
+        self._create_hwmon_chip('nvme', ['45000', '0', '38000', '39000', '0', '114000'])
+        self._create_hwmon_chip('coretemp', ['45000', '43000', '44000'])
+        # A fan control chip.
+        self._create_hwmon_chip('nct6775', [])
+
         self.assertEqual(
             Temperature().value,
             '126.6 F (Max. 237.2 F)'  # 52.6 and 114.0 converted into Fahrenheit.
@@ -208,40 +164,52 @@ class TestTemperatureEntry(unittest.TestCase):
 
     @patch(
         'archey.entries.temperature.check_output',
-        side_effect=[
-            CalledProcessError(1, 'sensors'),  # `sensors` will hard fail.
-            FileNotFoundError()                # No temperature from `vcgencmd` call
-        ]
+        side_effect=FileNotFoundError()  # No temperature from `vcgencmd` call.
     )
-    @patch('archey.entries.temperature.iglob')
     @patch(
         'archey.entries.temperature.Configuration.get',
         side_effect=[
-            {'sensors_chipsets': []},
+            {'sensors_chipsets': ['coretemp-isa-0000', 'acpitz-*']},
             {'use_fahrenheit': False},
-            {'char_before_unit': 'o'}
+            {'char_before_unit': ' '}
         ]
     )
-    def test_sensors_error_1(self, _, iglob_mock, ___):
-        """Test `sensors` (hard) failure handling and polling from files in Celsius"""
-        iglob_mock.return_value = iter([file.name for file in self._temp_files])
-        self.assertEqual(
-            Temperature().value,
-            '46.7oC (Max. 50.0oC)'
-        )
+    def test_hwmon_whitelist(self, _, __):
+        """Test that only white-listed `hwmon` chips are taken into account"""
+        self._create_hwmon_chip('nvme', ['114000'])
+        self._create_hwmon_chip('coretemp', ['45000', '43000'])
+        self._create_hwmon_chip('acpitz', ['50000'])
+        self._create_hwmon_chip('coretemp_', ['100000'])
+
+        self.assertEqual(Temperature().value, '46.0 C (Max. 50.0 C)')
 
     @patch(
         'archey.entries.temperature.check_output',
-        side_effect=[  # JSON decoding from `sensors` will fail..
-            """\
-{
-    "Is this JSON valid ?": [
-        "You", "should", "look", "twice.",
-    ]
-}
-""",
-            FileNotFoundError()  # No temperature from `vcgencmd` call
-        ]
+        side_effect=FileNotFoundError()  # No temperature from `vcgencmd` call.
+    )
+    @patch('archey.entries.temperature.os.listdir', wraps=os.listdir)
+    @patch(
+        'archey.entries.temperature.Configuration.get',
+        return_value={
+            'sensors_chipsets': [],
+            'use_fahrenheit': False,
+            'char_before_unit': ' '
+        }
+    )
+    def test_hwmon_discovery_cache(self, _, listdir_mock, __):
+        """Test that `hwmon` files are only discovered once, but read each time"""
+        self._create_hwmon_chip('coretemp', ['45000'])
+        self.assertEqual(Temperature().value, '45.0 C')
+        listdir_calls_count = listdir_mock.call_count
+
+        with open(os.path.join(self._hwmon_path, 'hwmon0', 'temp1_input'), 'w') as file:
+            file.write('47000\n')
+        self.assertEqual(Temperature().value, '47.0 C')
+        self.assertEqual(listdir_mock.call_count, listdir_calls_count)
+
+    @patch(
+        'archey.entries.temperature.check_output',
+        side_effect=FileNotFoundError()  # No temperature from `vcgencmd` call
     )
     @patch('archey.entries.temperature.iglob')
     @patch(
@@ -252,8 +220,9 @@ class TestTemperatureEntry(unittest.TestCase):
             {'char_before_unit': 'o'}
         ]
     )
-    def test_sensors_error_2(self, _, iglob_mock, ___):
-        """Test `sensors` (hard) failure handling and polling from files in Celsius"""
+    def test_hwmon_error(self, _, iglob_mock, ___):
+        """Test `hwmon` read failure handling and polling from files in Celsius"""
+        self._create_hwmon_chip('acpitz', ['N/A'])
         iglob_mock.return_value = iter([file.name for file in self._temp_files])
         self.assertEqual(
             Temperature().value,
@@ -262,10 +231,7 @@ class TestTemperatureEntry(unittest.TestCase):
 
     @patch(
         'archey.entries.temperature.check_output',
-        side_effect=[
-            FileNotFoundError(),  # No temperature from `sensors` call.
-            FileNotFoundError()   # No temperature from `vcgencmd` call.
-        ]
+        side_effect=FileNotFoundError()  # No temperature from `vcgencmd` call.
     )
     @patch(
         'archey.entries.temperature.iglob',
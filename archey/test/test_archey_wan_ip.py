@@ -7,6 +7,7 @@ from socket import timeout as SocketTimeoutError
 from subprocess import TimeoutExpired
 from urllib.error import URLError
 
+from archey.command import deadline
 from archey.entries.wan_ip import WanIp
 
 
@@ -126,6 +127,40 @@ class TestWanIpEntry(unittest.TestCase):
         """Test when both `dig` timeouts and `URLOpen` raises `socket.timeout`..."""
         self.assertEqual(WanIp().value, 'No Address')
 
+    @patch(
+        'archey.entries.wan_ip.check_output',
+        side_effect=TimeoutExpired('dig', 1)  # `check_output` call will fail
+    )
+    @patch(
+        'archey.entries.wan_ip.urlopen',
+        side_effect=URLError('<urlopen error timed out>')
+    )
+    @patch(
+        'archey.entries.wan_ip.Configuration.get',
+        side_effect=[
+            {'wan_ip_v6_support': False},
+            {'ipv4_detection': 10},
+            {'ipv4_detection': 10},
+            {'no_address': 'No Address'},
+            {'wan_ip_v6_support': False},
+            {'ipv4_detection': 10},
+            {'ipv4_detection': 10}
+        ]
+    )
+    def test_urlopen_deadline(self, _, urlopen_mock, __):
+        """Check `urlopen` fall-back is bounded by the current deadline too"""
+        with patch('archey.command.time.monotonic', return_value=100):
+            with deadline(102):
+                WanIp()
+        self.assertEqual(urlopen_mock.call_args[1]['timeout'], 2)
+
+        # The deadline already passed, `urlopen` is not even called.
+        urlopen_mock.reset_mock()
+        with patch('archey.command.time.monotonic', return_value=100):
+            with deadline(100):
+                self.assertRaises(TimeoutExpired, WanIp)
+        urlopen_mock.assert_not_called()
+
     @patch(
         'archey.entries.wan_ip.check_output',
         return_value=''  # No address will be returned
@@ -0,0 +1,63 @@
+"""Test module for `archey.watch`"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from archey.entries import Entries
+from archey.watch import watch
+
+
+class TestWatchUtil(unittest.TestCase):
+    """
+    Test cases for the watch mode.
+    Time is simulated : `time.sleep` only advances a fake monotonic clock.
+    """
+    def setUp(self):
+        self.clock = 0.0
+
+    def _sleep(self, duration):
+        self.clock += duration
+
+    def _watch(self, output, entries, intervals):
+        """Run `watch` on the fake clock, entries values simply being their names"""
+        with patch('archey.watch.time.monotonic', side_effect=lambda: self.clock), \
+                patch('archey.watch.time.sleep', side_effect=self._sleep), \
+                patch('archey.watch.get_entry_value', side_effect=lambda entry: entry.name):
+            watch(output, entries, intervals)
+
+    def test_independent_schedules(self):
+        """Check each entry is refreshed according to its own interval"""
+        def _stream(_, __, ___):
+            # Let's interrupt the watch mode after two minutes.
+            if self.clock > 120:
+                raise KeyboardInterrupt
+
+        output_mock = MagicMock(**{'stream.side_effect': _stream})
+
+        self.assertRaises(
+            KeyboardInterrupt,
+            self._watch,
+            output_mock,
+            [Entries.GPU, Entries.Uptime, Entries.RAM],
+            {'default': 0, 'Uptime': 60, 'RAM': 1}
+        )
+
+        streamed_entries = [call[0][0] for call in output_mock.stream.call_args_list]
+        # `GPU` is never refreshed, `Uptime` was twice, and `RAM` every second.
+        self.assertNotIn(0, streamed_entries)
+        self.assertEqual(streamed_entries.count(1), 2)
+        self.assertEqual(streamed_entries.count(2), 121)
+
+        output_mock.stream.assert_any_call(1, 'Uptime', 'Uptime')
+
+    def test_nothing_to_watch(self):
+        """Check the watch mode returns right away when no entry has to be refreshed"""
+        output_mock = MagicMock()
+
+        self._watch(output_mock, [Entries.GPU], {'default': 0})
+
+        output_mock.stream.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,6 +12,12 @@ class TestWindowManagerEntry(unittest.TestCase):
       that the output is correct.
     We've to test the case where `wmctrl` is not installed too.
     """
+    def setUp(self):
+        # Each test case gets its own (fake) `Processes` singleton instance.
+        patcher = patch.dict('archey.singleton.Singleton._instances', clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     @patch(
         'archey.entries.window_manager.check_output',
         return_value="""\
@@ -29,14 +35,14 @@ Window manager's "showing the desktop" mode: OFF
         side_effect=FileNotFoundError()  # `wmctrl` call will fail
     )
     @patch(
-        'archey.entries.window_manager.Processes.get',
-        return_value=[  # Fake running processes list
+        'archey.entries.window_manager.Processes._scan',
+        return_value=iter([  # Fake running processes list
             'some',
             'awesome',  # Match !
             'programs',
             'running',
             'here'
-        ]
+        ])
     )
     def test_no_wmctrl_match(self, _, __):
         """Test basic detection based on a (fake) processes list"""
@@ -47,14 +53,14 @@ Window manager's "showing the desktop" mode: OFF
         side_effect=FileNotFoundError()  # `wmctrl` call will fail
     )
     @patch(
-        'archey.entries.window_manager.Processes.get',
-        return_value=[  # Fake running processes list
+        'archey.entries.window_manager.Processes._scan',
+        return_value=iter([  # Fake running processes list
             'some',
             'weird',  # Mismatch !
             'programs',
             'running',
             'here'
-        ]
+        ])
     )
     @patch(
         'archey.entries.window_manager.Configuration.get',
@@ -69,6 +75,23 @@ Window manager's "showing the desktop" mode: OFF
             'Not detected'
         )
 
+    @patch(
+        'archey.entries.window_manager.check_output',
+        side_effect=FileNotFoundError()  # `wmctrl` call will fail
+    )
+    @patch(
+        'archey.entries.window_manager.Processes._scan',
+        return_value=iter([  # Fake running processes list
+            'i3',
+            'xmonad',
+            'awesome',  # Comes first in `WM_DICT` !
+            'i3'
+        ])
+    )
+    def test_no_wmctrl_priority(self, _, __):
+        """Test that `WM_DICT` order prevails over processes order"""
+        self.assertEqual(WindowManager().value, 'Awesome')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,39 @@
+"""
+Watch mode.
+Entries are re-evaluated on their own schedule, and their rows updated in place.
+"""
+
+import heapq
+import time
+
+from archey.command import clear_cache
+from archey.entries import get_entry_value
+
+
+def watch(output, entries, intervals):
+    """
+    Periodically re-compute `entries` (already displayed by a streaming `output`) until interrupted.
+    Each entry is refreshed every `intervals[name]` seconds (or `intervals['default']`).
+    `0` means the entry is never refreshed.
+    Between two refreshes, we just sleep until the next one is due.
+    """
+    schedule = []
+    now = time.monotonic()
+    for index, entry in enumerate(entries):
+        interval = intervals.get(entry.name, intervals.get('default', 0))
+        if interval:
+            heapq.heappush(schedule, (now + interval, index, interval))
+
+    while schedule:
+        next_due, index, interval = heapq.heappop(schedule)
+        time.sleep(max(0, next_due - time.monotonic()))
+
+        # Commands outputs memoized during the previous refreshes are outdated by now.
+        clear_cache()
+        output.stream(index, entries[index].name, get_entry_value(entries[index]))
+
+        # Schedule from the previous due time to avoid drifting (unless we are late).
+        heapq.heappush(
+            schedule,
+            (max(next_due + interval, time.monotonic()), index, interval)
+        )
@@ -84,14 +84,13 @@ fpm \
 	"${FPM_COMMON_ARGS[@]}" \
 	--output-type deb \
 	--package "${DIST_OUTPUT}/${NAME}_${VERSION}-${REVISION}_all.deb" \
-	--depends 'procps' \
 	--depends 'python3 >= 3.4' \
 	--depends 'python3-distro' \
 	--depends 'python3-netifaces' \
 	--python-install-bin usr/bin \
 	--python-install-lib usr/lib/python3/dist-packages \
 	--deb-priority 'optional' \
-	--deb-field 'Suggests: dnsutils, lm-sensors, pciutils, wmctrl, virt-what, btrfs-progs' \
+	--deb-field 'Suggests: dnsutils, pciutils, wmctrl' \
 	--deb-no-default-config-files \
 	setup.py
 
@@ -112,7 +111,6 @@ for python_version in $SUPPORTED_PYTHON_VERSIONS; do
 		"${FPM_COMMON_ARGS[@]}" \
 		--output-type rpm \
 		--package "${DIST_OUTPUT}/${NAME}-${VERSION}-${REVISION}.py${python_version//.}.noarch.rpm" \
-		--depends 'procps' \
 		--depends "python3 >= ${python_version}" \
 		--depends 'python3-distro' \
 		--depends 'python3-netifaces' \
@@ -129,7 +127,6 @@ fpm \
 	"${FPM_COMMON_ARGS[@]}" \
 	--output-type pacman \
 	--package "${DIST_OUTPUT}/${NAME}-${VERSION}-${REVISION}-any.pkg.tar.xz" \
-	--depends 'procps-ng' \
 	--depends "python>=${ARCH_LINUX_PYTHON_VERSION}" \
 	--depends 'python-distro' \
 	--depends 'python-netifaces' \
@@ -140,11 +137,8 @@ fpm \
 	--python-install-bin usr/bin \
 	--python-install-lib "usr/lib/python${ARCH_LINUX_PYTHON_VERSION}/site-packages" \
 	--pacman-optional-depends 'bind-tools: WAN_IP would be detected faster' \
-	--pacman-optional-depends 'lm_sensors: Temperature would be more accurate' \
 	--pacman-optional-depends 'pciutils: GPU wouldn'"'"'t be detected without it' \
 	--pacman-optional-depends 'wmctrl: WindowManager would be more accurate' \
-	--pacman-optional-depends 'virt-what: Model would contain details about the hypervisor' \
-	--pacman-optional-depends 'btrfs-progs: Disk would support BTRFS in usage computations' \
 	setup.py
 
 
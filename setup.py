@@ -27,7 +27,8 @@ setup(
     ],
     entry_points={
         'console_scripts': [
-            'archey = archey.__main__:main'
+            'archey = archey.__main__:main',
+            'archeyd = archey.daemon:main'
         ]
     },
     long_description='Maintained fork of the original Archey Linux system tool'